@@ -0,0 +1,13 @@
+"""
+Benchmarks that measure the time and memory that fondat-aws adds to AWS service operations.
+
+Operations are answered in process by the fake backend in fondat.aws.testing, so results
+reflect library overhead rather than network and service latency. Where an equivalent raw
+aiobotocore operation exists, it is measured as a baseline.
+
+Run with: python -m benchmarks --help
+"""
+
+import benchmarks.cases  # register cases
+
+from benchmarks.harness import Benchmark, Result, Timing, case, cases, run, run_case
@@ -0,0 +1,92 @@
+"""Run benchmarks from the command line."""
+
+import argparse
+import dataclasses
+import fnmatch
+import json
+import platform
+import sys
+
+from benchmarks import cases, run
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+
+
+def _version() -> str | None:
+    try:
+        return version("fondat-aws")
+    except PackageNotFoundError:
+        return None
+
+
+def _format(result: dict, previous: dict | None) -> str:
+    timing = result["timing"]
+    line = (
+        f"{result['name']:<26}{timing['ops_per_sec']:>12,.1f}{timing['p50_us']:>12,.1f}"
+        f"{timing['p99_us']:>12,.1f}"
+    )
+    overhead = result["overhead_us"]
+    line += f"{overhead:>12,.1f}" if overhead is not None else f"{'-':>12}"
+    line += f"{result['peak_rss'] / 2**20:>10,.1f}"
+    if previous:
+        change = timing["ops_per_sec"] / previous["timing"]["ops_per_sec"] - 1
+        line += f"{change:>+10.1%}"
+    return line
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Measure fondat-aws operation overhead."
+    )
+    parser.add_argument("patterns", nargs="*", help="glob patterns of case names to run")
+    parser.add_argument("--list", action="store_true", help="list case names and exit")
+    parser.add_argument("--duration", type=float, default=1.0, help="seconds per operation")
+    parser.add_argument("--iterations", type=int, default=100_000, help="maximum iterations")
+    parser.add_argument("--warmup", type=int, default=3, help="iterations before measuring")
+    parser.add_argument("--no-isolate", action="store_true", help="run cases in one process")
+    parser.add_argument("--output", help="file to write JSON results to")
+    parser.add_argument("--compare", help="JSON results file to compare throughput with")
+    args = parser.parse_args(argv)
+    names = [
+        name
+        for name in cases
+        if not args.patterns or any(fnmatch.fnmatch(name, p) for p in args.patterns)
+    ]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        parser.error("no matching cases")
+    previous = {}
+    if args.compare:
+        with open(args.compare) as file:
+            previous = {r["name"]: r for r in json.load(file)["results"]}
+    header = f"{'case':<26}{'ops/s':>12}{'p50 µs':>12}{'p99 µs':>12}{'overhead µs':>12}"
+    header += f"{'RSS MiB':>10}" + (f"{'change':>10}" if previous else "")
+    print(header)
+    results = []
+    for result in run(
+        names,
+        isolate=not args.no_isolate,
+        duration=args.duration,
+        iterations=args.iterations,
+        warmup=args.warmup,
+    ):
+        result = dataclasses.asdict(result)
+        results.append(result)
+        print(_format(result, previous.get(result["name"])), flush=True)
+    if args.output:
+        report = {
+            "version": _version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+            "results": results,
+        }
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,473 @@
+"""Benchmark cases."""
+
+import asyncio
+import fondat.http
+import json
+import tempfile
+
+from benchmarks.harness import Benchmark, case
+from contextlib import AsyncExitStack
+from datetime import datetime, timedelta, timezone
+from fondat.aws.athena import QueryExecutionResource
+from fondat.aws.bedrock import agents_resource
+from fondat.aws.bedrock.utils import convert_dict_keys_to_snake_case
+from fondat.aws.cloudwatch import CloudWatchMonitor
+from fondat.aws.lambda_ import http_function
+from fondat.aws.s3 import BucketResource, ObjectCache, TransferConfig
+from fondat.aws.testing import Backend
+from fondat.aws.testing.s3 import Object
+from fondat.monitor import Measurement
+from fondat.stream import BytesStream, Reader, Stream
+from pathlib import Path
+
+
+BUCKET = "benchmark"
+
+SMALL = bytes(range(256)) * 4  # 1 KiB
+LARGE = bytes(range(256)) * 65536  # 16 MiB, uploaded in multiple parts
+PART_SIZE = 5 * 1024 * 1024
+
+
+async def _raw_client(stack: AsyncExitStack, backend: Backend, service_name: str):
+    return await stack.enter_async_context(backend.client(service_name))
+
+
+def _s3(backend: Backend, **objects: bytes) -> None:
+    backend.s3.buckets[BUCKET] = {key: Object(data) for key, data in objects.items()}
+
+
+@case("s3.bucket.list")
+async def s3_bucket_list(backend: Backend):
+    _s3(backend, **{f"key/{n:06d}": SMALL for n in range(1000)})
+    bucket = BucketResource(BUCKET, prefix="key/")
+    async with AsyncExitStack() as stack:
+        client = await _raw_client(stack, backend, "s3")
+
+        async def operation():
+            await bucket.get(limit=1000)
+
+        async def baseline():
+            await client.list_objects_v2(Bucket=BUCKET, Prefix="key/", MaxKeys=1000)
+
+        yield Benchmark(operation, baseline)
+
+
+@case("s3.bucket.get_many")
+async def s3_bucket_get_many(backend: Backend):
+    _s3(backend, **{f"key/{n:03d}": SMALL for n in range(100)})
+    bucket = BucketResource(BUCKET, prefix="key/")
+    keys = [f"{n:03d}" for n in range(100)]
+    async with AsyncExitStack() as stack:
+        client = await _raw_client(stack, backend, "s3")
+        limit = asyncio.Semaphore(16)
+
+        async def operation():
+            async for _ in bucket.get_many(keys):
+                pass
+
+        async def get(key: str):
+            async with limit:
+                response = await client.get_object(Bucket=BUCKET, Key=f"key/{key}")
+                async with response["Body"] as body:
+                    await body.read()
+
+        async def baseline():
+            await asyncio.gather(*(get(key) for key in keys))
+
+        yield Benchmark(operation, baseline)
+
+
+@case("s3.object.get.small")
+async def s3_object_get_small(backend: Backend):
+    _s3(backend, small=SMALL)
+    object = BucketResource(BUCKET)["small"]
+    async with AsyncExitStack() as stack:
+        client = await _raw_client(stack, backend, "s3")
+
+        async def operation():
+            await object.get()
+
+        async def baseline():
+            response = await client.get_object(Bucket=BUCKET, Key="small")
+            async with response["Body"] as body:
+                await body.read()
+
+        yield Benchmark(operation, baseline)
+
+
+@case("s3.object.get.revalidated")
+async def s3_object_get_revalidated(backend: Backend):
+    _s3(backend, small=SMALL)
+    object = BucketResource(BUCKET, cache=ObjectCache(ttl=0))["small"]
+    await object.get()  # populate cache
+    async with AsyncExitStack() as stack:
+        client = await _raw_client(stack, backend, "s3")
+
+        async def operation():
+            await object.get()
+
+        async def baseline():
+            response = await client.get_object(Bucket=BUCKET, Key="small")
+            async with response["Body"] as body:
+                await body.read()
+
+        yield Benchmark(operation, baseline)
+
+
+@case("s3.object.put.small")
+async def s3_object_put_small(backend: Backend):
+    _s3(backend)
+    object = BucketResource(BUCKET)["small"]
+    async with AsyncExitStack() as stack:
+        client = await _raw_client(stack, backend, "s3")
+
+        async def operation():
+            await object.put(SMALL)
+
+        async def baseline():
+            await client.put_object(Bucket=BUCKET, Key="small", Body=SMALL)
+
+        yield Benchmark(operation, baseline)
+
+
+@case("s3.object.put.compressed")
+async def s3_object_put_compressed(backend: Backend):
+    _s3(backend)
+    items = [{"id": n, "name": f"item {n}", "active": True} for n in range(1000)]
+    body = json.dumps({"items": items}).encode()  # 42 KiB, compresses about 10x
+    object = BucketResource(BUCKET, compress="gzip")["compressed"]
+    async with AsyncExitStack() as stack:
+        client = await _raw_client(stack, backend, "s3")
+
+        async def operation():
+            await object.put(body)
+
+        async def baseline():  # uncompressed
+            await client.put_object(Bucket=BUCKET, Key="compressed", Body=body)
+
+        yield Benchmark(operation, baseline)
+
+
+@case("s3.object.get.multipart")
+async def s3_object_get_multipart(backend: Backend):
+    _s3(backend, large=LARGE)
+    object = BucketResource(BUCKET, value_type=Stream)["large"]
+    async with AsyncExitStack() as stack:
+        client = await _raw_client(stack, backend, "s3")
+
+        async def operation():
+            async with await object.get() as stream:
+                await Reader(stream).read()
+
+        async def baseline():
+            response = await client.get_object(Bucket=BUCKET, Key="large")
+            async with response["Body"] as body:
+                while await body.read(PART_SIZE):
+                    pass
+
+        yield Benchmark(operation, baseline)
+
+
+@case("s3.object.get.ranged")
+async def s3_object_get_ranged(backend: Backend):
+    _s3(backend, large=LARGE)
+    transfer = TransferConfig(download_window=4, range_size=PART_SIZE)
+    object = BucketResource(BUCKET, value_type=Stream, transfer=transfer)["large"]
+    async with AsyncExitStack() as stack:
+        client = await _raw_client(stack, backend, "s3")
+
+        async def operation():
+            async with await object.get() as stream:
+                async for _ in stream:
+                    pass
+
+        async def baseline():
+            response = await client.get_object(Bucket=BUCKET, Key="large")
+            async with response["Body"] as body:
+                while await body.read(PART_SIZE):
+                    pass
+
+        yield Benchmark(operation, baseline)
+
+
+@case("s3.object.read_range")
+async def s3_object_read_range(backend: Backend):
+    _s3(backend, large=LARGE)
+    object = BucketResource(BUCKET)["large"]
+    async with AsyncExitStack() as stack:
+        client = await _raw_client(stack, backend, "s3")
+
+        async def operation():
+            async with await object.read_range(-16384) as stream:
+                await Reader(stream).read()
+
+        async def baseline():
+            response = await client.get_object(Bucket=BUCKET, Key="large", Range="bytes=-16384")
+            async with response["Body"] as body:
+                await body.read()
+
+        yield Benchmark(operation, baseline)
+
+
+@case("s3.object.put.multipart")
+async def s3_object_put_multipart(backend: Backend):
+    _s3(backend)
+    object = BucketResource(BUCKET, value_type=Stream)["large"]
+    async with AsyncExitStack() as stack:
+        client = await _raw_client(stack, backend, "s3")
+
+        async def operation():
+            await object.put(BytesStream(LARGE))
+
+        async def baseline():
+            upload = await client.create_multipart_upload(Bucket=BUCKET, Key="large")
+            parts = []
+            for offset in range(0, len(LARGE), PART_SIZE):
+                part = await client.upload_part(
+                    Bucket=BUCKET,
+                    Key="large",
+                    UploadId=upload["UploadId"],
+                    PartNumber=len(parts) + 1,
+                    Body=LARGE[offset : offset + PART_SIZE],
+                )
+                parts.append({"PartNumber": len(parts) + 1, "ETag": part["ETag"]})
+            await client.complete_multipart_upload(
+                Bucket=BUCKET,
+                Key="large",
+                UploadId=upload["UploadId"],
+                MultipartUpload={"Parts": parts},
+            )
+
+        yield Benchmark(operation, baseline)
+
+
+@case("s3.object.upload_file")
+async def s3_object_upload_file(backend: Backend):
+    _s3(backend)
+    object = BucketResource(BUCKET)["large"]
+    with tempfile.TemporaryDirectory() as directory:
+        (path := Path(directory, "large")).write_bytes(LARGE)
+
+        async def operation():
+            await object.upload_file(path)
+
+        yield Benchmark(operation)
+
+
+@case("s3.object.download_file")
+async def s3_object_download_file(backend: Backend):
+    _s3(backend, large=LARGE)
+    object = BucketResource(BUCKET)["large"]
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory, "large")
+
+        async def operation():
+            await object.download_file(path)
+
+        yield Benchmark(operation)
+
+
+@case("athena.results")
+async def athena_results(backend: Backend):
+    timestamp = datetime(2020, 1, 1)
+    backend.athena.respond(
+        "SELECT",
+        columns=[
+            ("id", "integer"),
+            ("name", "varchar"),
+            ("score", "double"),
+            ("active", "boolean"),
+            ("created", "timestamp"),
+        ],
+        rows=[
+            [n, f"name{n}", n / 7, "true", (timestamp + timedelta(seconds=n)).isoformat()]
+            for n in range(999)  # one page, with header row
+        ],
+    )
+    id = backend.athena.start_query_execution(QueryString="SELECT *")["QueryExecutionId"]
+    backend.athena.get_query_execution(QueryExecutionId=id)
+    resource = QueryExecutionResource(id)
+    async with AsyncExitStack() as stack:
+        client = await _raw_client(stack, backend, "athena")
+
+        async def operation():
+            await resource.results(limit=1000)
+
+        async def baseline():
+            await client.get_query_results(QueryExecutionId=id, MaxResults=1000)
+
+        yield Benchmark(operation, baseline)
+
+
+@case("cloudwatch.flush")
+async def cloudwatch_flush(backend: Backend):
+    monitor = CloudWatchMonitor("benchmark", cache_size=1_000_000)
+    timestamp = datetime.now(tz=timezone.utc)
+    measurements = [
+        Measurement(
+            name=f"metric_{n % 10}",
+            tags={"operation": f"operation_{n // 10 % 5}", "status": "ok"},
+            timestamp=timestamp,
+            type="gauge",
+            value=n,
+            unit="s",
+        )
+        for n in range(1000)  # aggregated into 50 metric data
+    ]
+    async with AsyncExitStack() as stack:
+        client = await _raw_client(stack, backend, "cloudwatch")
+        metric_data = [
+            {
+                "MetricName": f"metric_{n % 10}",
+                "Dimensions": [
+                    {"Name": "operation", "Value": f"operation_{n // 10}"},
+                    {"Name": "status", "Value": "ok"},
+                ],
+                "Timestamp": timestamp,
+                "StatisticValues": {
+                    "SampleCount": 20.0,
+                    "Sum": 1.0,
+                    "Minimum": 0.0,
+                    "Maximum": 1.0,
+                },
+                "Unit": "Seconds",
+                "StorageResolution": 60,
+            }
+            for n in range(50)
+        ]
+
+        async def operation():
+            monitor._measurements = list(measurements)
+            await monitor._flush()
+
+        async def baseline():
+            for n in range(0, len(metric_data), 20):
+                await client.put_metric_data(
+                    Namespace="benchmark", MetricData=metric_data[n : n + 20]
+                )
+
+        yield Benchmark(operation, baseline)
+
+
+@case("lambda.http")
+async def lambda_http(backend: Backend):
+    async def handler(request: fondat.http.Request) -> fondat.http.Response:
+        response = fondat.http.Response()
+        response.status = 200
+        response.headers["Content-Type"] = "application/json"
+        response.body = BytesStream(await Reader(request.body).read())
+        return response
+
+    function = http_function(handler)
+    event = {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": "/resource/id",
+        "rawQueryString": "a=1&b=2",
+        "cookies": ["session=abc123", "theme=dark"],
+        "headers": {
+            "accept": "application/json",
+            "content-type": "application/json",
+            "content-length": "27",
+            "host": "example.lambda-url.us-east-1.on.aws",
+            "user-agent": "benchmark",
+        },
+        "queryStringParameters": {"a": "1", "b": "2"},
+        "requestContext": {
+            "http": {
+                "method": "POST",
+                "path": "/resource/id",
+                "protocol": "HTTP/1.1",
+                "sourceIp": "127.0.0.1",
+                "userAgent": "benchmark",
+            },
+        },
+        "body": "eyJrZXkiOiAidmFsdWUiLCAibiI6IDF9",  # {"key": "value", "n": 1}
+        "isBase64Encoded": True,
+    }
+
+    def operation():  # invoked outside of event loop, as Lambda does
+        function(event, None)
+
+    yield Benchmark(operation)
+
+
+def _agent(agent_id: str) -> dict:
+    now = datetime.now(tz=timezone.utc)
+    return {
+        "agentId": agent_id,
+        "agentArn": f"arn:aws:bedrock:us-east-1:123456789012:agent/{agent_id}",
+        "agentName": "benchmark",
+        "agentStatus": "PREPARED",
+        "agentVersion": "DRAFT",
+        "agentResourceRoleArn": "arn:aws:iam::123456789012:role/benchmark",
+        "foundationModel": "anthropic.claude-v2",
+        "idleSessionTTLInSeconds": 600,
+        "instruction": "You are a benchmark agent. " * 10,
+        "createdAt": now,
+        "updatedAt": now,
+        "preparedAt": now,
+        "promptOverrideConfiguration": {
+            "promptConfigurations": [
+                {
+                    "promptType": prompt_type,
+                    "promptCreationMode": "DEFAULT",
+                    "promptState": "ENABLED",
+                    "inferenceConfiguration": {
+                        "maximumLength": 2048,
+                        "stopSequences": ["</answer>"],
+                        "temperature": 0.0,
+                        "topK": 250,
+                        "topP": 1.0,
+                    },
+                }
+                for prompt_type in ("PRE_PROCESSING", "ORCHESTRATION", "POST_PROCESSING")
+            ]
+        },
+    }
+
+
+@case("bedrock.agent.get")
+async def bedrock_agent_get(backend: Backend):
+    backend.bedrock_agent.add("agents", "agent", _agent("agent"))
+    resource = agents_resource()["agent"]
+    async with AsyncExitStack() as stack:
+        client = await _raw_client(stack, backend, "bedrock-agent")
+
+        async def operation():
+            await resource.get()
+
+        async def baseline():
+            await client.get_agent(agentId="agent")
+
+        yield Benchmark(operation, baseline)
+
+
+@case("bedrock.agent.invoke")
+async def bedrock_agent_invoke(backend: Backend):
+    resource = agents_resource()["agent"]
+    async with AsyncExitStack() as stack:
+        client = await _raw_client(stack, backend, "bedrock-agent-runtime")
+        params = {"inputText": "hello", "sessionId": "session", "agentAliasId": "alias"}
+
+        async def operation():
+            invocation = await resource.invoke_buffered(**params)
+            async for _ in invocation.completion:
+                pass
+
+        async def baseline():
+            response = await client.invoke_agent(agentId="agent", **params)
+            async for _ in response["completion"]:
+                pass
+
+        yield Benchmark(operation, baseline)
+
+
+@case("bedrock.snake_case")
+async def bedrock_snake_case(backend: Backend):
+    data = _agent("agent")
+
+    def operation():
+        convert_dict_keys_to_snake_case(data)
+
+    yield Benchmark(operation)
@@ -0,0 +1,202 @@
+"""Benchmark harness: case registry, measurement and results."""
+
+import asyncio
+import concurrent.futures
+import dataclasses
+import fondat.aws.client
+import gc
+import multiprocessing
+import resource
+import sys
+import time
+
+from collections.abc import AsyncIterator, Callable, Iterable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from fondat.aws.testing import Backend
+from typing import Any
+
+
+@dataclasses.dataclass
+class Benchmark:
+    """
+    Operations to measure in a benchmark case.
+
+    Attributes:
+    • operation: operation performed through fondat-aws
+    • baseline: equivalent operation performed with a raw aiobotocore client, if any
+
+    Operations are coroutine functions, or functions if they must run outside of an event
+    loop. Each takes no arguments.
+    """
+
+    operation: Callable[[], Any]
+    baseline: Callable[[], Any] | None = None
+
+
+CaseFactory = Callable[[Backend], AbstractAsyncContextManager[Benchmark]]
+
+cases: dict[str, CaseFactory] = {}  # registered cases, keyed by name
+
+
+def case(name: str) -> Callable[[Callable[[Backend], AsyncIterator[Benchmark]]], CaseFactory]:
+    """
+    Decorate an asynchronous generator function to register it as a benchmark case.
+
+    The function is passed a fake backend, which is installed while the case runs. It
+    prepares any state the operations require, yields a Benchmark, and cleans up when resumed.
+    """
+
+    def decorator(function: Callable[[Backend], AsyncIterator[Benchmark]]) -> CaseFactory:
+        cases[name] = asynccontextmanager(function)
+        return cases[name]
+
+    return decorator
+
+
+@dataclasses.dataclass
+class Timing:
+    """
+    Timing of repeated invocations of an operation.
+
+    Attributes:
+    • iterations: number of invocations measured
+    • ops_per_sec: invocations per second
+    • p50_us: median invocation latency, in microseconds
+    • p99_us: 99th percentile invocation latency, in microseconds
+    """
+
+    iterations: int
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+
+    @classmethod
+    def from_samples(cls, samples: list[int], elapsed: int) -> "Timing":
+        samples = sorted(samples)
+        return cls(
+            iterations=len(samples),
+            ops_per_sec=len(samples) * 1e9 / elapsed,
+            p50_us=_percentile(samples, 50) / 1e3,
+            p99_us=_percentile(samples, 99) / 1e3,
+        )
+
+
+@dataclasses.dataclass
+class Result:
+    """
+    Result of running a benchmark case.
+
+    Attributes:
+    • name: name of case
+    • timing: timing of operation performed through fondat-aws
+    • baseline: timing of equivalent raw aiobotocore operation, if any
+    • overhead_us: median latency added by fondat-aws, in microseconds, if baseline measured
+    • peak_rss: peak resident set size of process running the case, in bytes
+    """
+
+    name: str
+    timing: Timing
+    baseline: Timing | None
+    overhead_us: float | None
+    peak_rss: int
+
+
+def _percentile(samples: list[int], percent: int) -> int:
+    """Return nearest-rank percentile of sorted samples."""
+    return samples[max(0, -(-len(samples) * percent // 100) - 1)]
+
+
+def _peak_rss() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # macOS bytes, others KiB
+
+
+def _done(begin: int, count: int, duration: float, iterations: int) -> bool:
+    return count >= iterations or time.perf_counter_ns() - begin >= duration * 1e9
+
+
+async def _measure_async(operation, duration: float, iterations: int, warmup: int) -> Timing:
+    for _ in range(warmup):
+        await operation()
+    samples = []
+    begin = time.perf_counter_ns()
+    while not _done(begin, len(samples), duration, iterations):
+        start = time.perf_counter_ns()
+        await operation()
+        samples.append(time.perf_counter_ns() - start)
+    return Timing.from_samples(samples, time.perf_counter_ns() - begin)
+
+
+def _measure_sync(operation, duration: float, iterations: int, warmup: int) -> Timing:
+    for _ in range(warmup):
+        operation()
+    samples = []
+    begin = time.perf_counter_ns()
+    while not _done(begin, len(samples), duration, iterations):
+        start = time.perf_counter_ns()
+        operation()
+        samples.append(time.perf_counter_ns() - start)
+    return Timing.from_samples(samples, time.perf_counter_ns() - begin)
+
+
+def run_case(
+    name: str, *, duration: float = 1.0, iterations: int = 100_000, warmup: int = 3
+) -> Result:
+    """
+    Run a benchmark case in the current process.
+
+    Parameters:
+    • name: name of case to run
+    • duration: maximum time in seconds to measure each operation
+    • iterations: maximum number of invocations to measure of each operation
+    • warmup: number of invocations of each operation before measurement
+    """
+    backend = Backend()
+    with backend.install(), asyncio.Runner() as runner:
+        context = cases[name](backend)
+        benchmark = runner.run(context.__aenter__())
+        try:
+
+            def measure(operation):
+                gc.collect()
+                if asyncio.iscoroutinefunction(operation):
+                    return runner.run(_measure_async(operation, duration, iterations, warmup))
+                return _measure_sync(operation, duration, iterations, warmup)
+
+            timing = measure(benchmark.operation)
+            peak_rss = _peak_rss()  # before baseline, to attribute to operation
+            baseline = measure(benchmark.baseline) if benchmark.baseline else None
+        finally:
+            runner.run(context.__aexit__(None, None, None))
+            runner.run(fondat.aws.client.pool.close())
+    return Result(
+        name=name,
+        timing=timing,
+        baseline=baseline,
+        overhead_us=timing.p50_us - baseline.p50_us if baseline else None,
+        peak_rss=peak_rss,
+    )
+
+
+def run(
+    names: Iterable[str],
+    *,
+    isolate: bool = True,
+    **kwargs,
+) -> Iterable[Result]:
+    """
+    Run benchmark cases, yielding the result of each as it completes.
+
+    Parameters:
+    • names: names of cases to run
+    • isolate: run each case in a new process, so peak RSS is measured per case
+    • kwargs: keyword arguments to pass to run_case
+    """
+    for name in names:
+        if not isolate:
+            yield run_case(name, **kwargs)
+            continue
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            yield executor.submit(run_case, name, **kwargs).result()
@@ -14,7 +14,7 @@ from contextlib import asynccontextmanager, contextmanager, suppress
 from dataclasses import dataclass
 from datetime import date, datetime
 from decimal import Decimal
-from fondat.aws.client import create_client
+from fondat.aws.client import backoff, create_client, single_flight
 from fondat.codec import Codec, DecodeError, EncodeError
 from fondat.pagination import Page
 from fondat.resource import operation, query
@@ -363,9 +363,9 @@ class QueryExecutionsResource:
         if limit is not None:
             kwargs["MaxResults"] = limit
         if cursor is not None:
-            kwargs["NextToken"] = cursor.encode()
+            kwargs["NextToken"] = cursor.decode()
         async with create_client() as client:
-            response = client.list_query_executions()
+            response = await client.list_query_executions(**kwargs)
         next_token = response.get("NextToken")
         cursor = next_token.encode() if next_token else None
         return Page(items=response["QueryExecutionIds"], cursor=cursor)
@@ -513,7 +513,7 @@ class Database:
 
         while state in {"QUEUED", "RUNNING"}:
             await asyncio.sleep(sleep)
-            sleep = min((sleep * 2.0) or 0.1, 5.0)  # backout: 0.1 → 5 seconds
+            sleep = backoff(sleep, 0.1, 5.0)  # jittered backout: 0.1 → 5 seconds
             result = await query_execution_resource.get()
             state = result["Status"]["State"]
 
@@ -585,22 +585,31 @@ class Database:
 
         Parameters:
         • name: name of table
+
+        Concurrent requests for the same table are coalesced into a single query.
         """
         subst = {"real": "float", "varchar": "string", "varbinary": "binary"}
-        columns = [
-            Column(row["column_name"], subst.get(row["data_type"].lower(), row["data_type"]))
-            async for row in await self.execute(
-                Expression(
-                    "SELECT column_name, data_type FROM information_schema.columns ",
-                    "WHERE table_schema = ",
-                    Param(self.name),
-                    " AND table_name = ",
-                    Param(name),
-                    " ORDER BY ordinal_position",
-                ),
-            )
-        ]
-        return Table(database=self, name=name, columns=columns)
+
+        async def columns():
+            return [
+                Column(
+                    row["column_name"], subst.get(row["data_type"].lower(), row["data_type"])
+                )
+                async for row in await self.execute(
+                    Expression(
+                        "SELECT column_name, data_type FROM information_schema.columns ",
+                        "WHERE table_schema = ",
+                        Param(self.name),
+                        " AND table_name = ",
+                        Param(name),
+                        " ORDER BY ordinal_position",
+                    ),
+                )
+            ]
+
+        key = ("athena", "table", self.catalog, self.name, name, self.workgroup)
+        columns = await single_flight.call(key, columns)
+        return Table(database=self, name=name, columns=list(columns))
 
 
 _athena_type_pattern = re.compile(r"([a-z]+).*")
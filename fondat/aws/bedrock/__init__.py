@@ -68,16 +68,38 @@ FlowsResource                                               # /flows
 """
 
 from collections.abc import Iterable
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 from fondat.aws.client import Config
 from fondat.security import Policy
 
-from .resources.agents import AgentsResource
-from .resources.prompts import PromptsResource
-from .resources.flows import FlowsResource
+if TYPE_CHECKING:
+    from .resources.agents import AgentsResource
+    from .resources.prompts import PromptsResource
+    from .resources.flows import FlowsResource
 
 __all__ = ["agents_resource", "prompts_resource", "flows_resource"]
 
+# resource classes are imported on first access, to minimize cold start latency
+_lazy = {
+    "AgentsResource": ".resources.agents",
+    "PromptsResource": ".resources.prompts",
+    "FlowsResource": ".resources.flows",
+}
+
+
+def __getattr__(name: str):
+    if module := _lazy.get(name):
+        value = getattr(import_module(module, __name__), name)
+        globals()[name] = value  # avoid importing again
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *_lazy])
+
 
 def agents_resource(
     *,
@@ -86,7 +108,7 @@ def agents_resource(
     policies: Iterable[Policy] | None = None,
     cache_size: int = 100,
     cache_expire: int | float = 300,  # 5 minutes default
-) -> AgentsResource:
+) -> "AgentsResource":
     """
     Create and return the root AgentsResource bound to the supplied policies and botocore configs.
 
@@ -100,6 +122,8 @@ def agents_resource(
     Returns:
         The root AgentsResource
     """
+    from .resources.agents import AgentsResource
+
     return AgentsResource(
         config_agent=config_agent,
         config_runtime=config_runtime,
@@ -115,7 +139,7 @@ def prompts_resource(
     policies: Iterable[Policy] | None = None,
     cache_size: int = 100,
     cache_expire: int | float = 300,  # 5 minutes default
-) -> PromptsResource:
+) -> "PromptsResource":
     """
     Create and return a root PromptsResource.
 
@@ -128,6 +152,8 @@ def prompts_resource(
     Returns:
         A PromptsResource instance
     """
+    from .resources.prompts import PromptsResource
+
     return PromptsResource(
         config_agent=config_agent,
         policies=policies,
@@ -143,10 +169,12 @@ def flows_resource(
     policies: Iterable[Policy] | None = None,
     cache_size: int = 100,
     cache_expire: int | float = 300,
-) -> FlowsResource:
+) -> "FlowsResource":
     """
     Create and return a root FlowsResource.
     """
+    from .resources.flows import FlowsResource
+
     return FlowsResource(
         config_agent=config_agent,
         config_runtime=config_runtime,
@@ -5,21 +5,24 @@ import logging
 import fondat.aws.client
 
 from contextlib import asynccontextmanager
-from aiobotocore.client import AioBaseClient
 from fondat.aws.client import Config
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from aiobotocore.client import AioBaseClient
 
 _logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
-async def agent_client(config: Config | None = None) -> AioBaseClient:
+async def agent_client(config: Config | None = None) -> "AioBaseClient":
     cm = fondat.aws.client.create_client("bedrock-agent", config=config)
     async with cm as client:
         yield client
 
 
 @asynccontextmanager
-async def runtime_client(config: Config | None = None) -> AioBaseClient:
+async def runtime_client(config: Config | None = None) -> "AioBaseClient":
     cm = fondat.aws.client.create_client("bedrock-agent-runtime", config=config)
     async with cm as client:
         yield client
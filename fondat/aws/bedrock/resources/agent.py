@@ -4,7 +4,7 @@ from collections.abc import Iterable
 
 from fondat.aws.bedrock.domain import Agent, AgentInvocation
 from fondat.aws.bedrock.resources.aliases import AliasesResource
-from fondat.aws.client import Config, wrap_client_error
+from fondat.aws.client import Config, single_flight, wrap_client_error
 from fondat.resource import resource
 from fondat.security import Policy
 from fondat.aws.bedrock.utils import convert_dict_keys_to_snake_case
@@ -68,11 +68,18 @@ class AgentResource:
         Returns:
             Agent: Detailed information about the Bedrock agent
         """
-        async with agent_client(self.config_agent) as client:
-            with wrap_client_error():
-                response = await client.get_agent(agentId=self._id)
-                data = self._process_agent_response(response)
-                return Agent(**data)
+
+        async def get_agent():
+            async with agent_client(self.config_agent) as client:
+                with wrap_client_error():
+                    return await client.get_agent(agentId=self._id)
+
+        # coalesce concurrent gets of the same agent into one request
+        response = await single_flight.call(
+            ("bedrock-agent", "get_agent", self._id, self.config_agent), get_agent
+        )
+        data = self._process_agent_response(response)
+        return Agent(**data)
 
     @operation(method="post", policies=lambda self: self.policies)
     async def invoke_buffered(
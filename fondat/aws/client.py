@@ -1,17 +1,40 @@
 """
 Fondat AWS client module.
+
+To minimize cold start latency, aiobotocore and botocore are imported when the first client
+is created, rather than when this module is imported.
 """
 
-import botocore.config
+import asyncio
+import bisect
+import dataclasses
 import fondat.error
+import fondat.monitor
+import functools
 import logging
+import random
+import time
+import uuid
 
-from aiobotocore.client import AioBaseClient
-from aiobotocore.session import AioSession
-from botocore.exceptions import ClientError
-from contextlib import asynccontextmanager, contextmanager
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Mapping
+from contextlib import (
+    AbstractAsyncContextManager,
+    AsyncExitStack,
+    asynccontextmanager,
+    contextmanager,
+    suppress,
+)
+from contextvars import ContextVar
 from fondat.data import datacls
-from typing import Annotated
+from fondat.monitor import Measurement, Monitor
+from typing import TYPE_CHECKING, Annotated, Any, Literal
+
+
+if TYPE_CHECKING:
+    from aiobotocore.client import AioBaseClient
+    from aiobotocore.session import AioSession
+    from botocore.exceptions import ClientError
 
 
 _logger = logging.getLogger(__name__)
@@ -26,7 +49,851 @@ class Config:
     aws_access_key_id: Annotated[str | None, "access key ID"]
     aws_secret_access_key: Annotated[str | None, "secret access key"]
     aws_session_token: Annotated[str | None, "session token"]
-    config: Annotated[botocore.config.Config | None, "advanced configuration options"]
+    config: Annotated[Any | None, "advanced configuration options: botocore.config.Config"]
+
+
+def _config_key(config: Config | None) -> tuple:
+    """Return a hashable key that identifies a client configuration."""
+    if config is None:
+        return ()
+    return tuple(getattr(config, field.name) for field in dataclasses.fields(config))
+
+
+THROTTLING_CODES = frozenset(
+    {
+        "SlowDown",
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "TooManyRequestsException",
+        "RequestLimitExceeded",
+        "RequestThrottled",
+        "RequestThrottledException",
+        "ProvisionedThroughputExceededException",
+    }
+)
+
+
+def is_throttling(error: "ClientError") -> bool:
+    """Return True if a client error indicates that a request was throttled."""
+    if error.response.get("Error", {}).get("Code") in THROTTLING_CODES:
+        return True
+    return error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") in {429, 503}
+
+
+class AdaptiveLimiter:
+    """
+    Limits the number of requests in flight, adapting the limit to throttling responses.
+
+    Parameters and attributes:
+    • initial: initial limit of requests in flight
+    • minimum: minimum limit of requests in flight
+    • maximum: maximum limit of requests in flight
+    • increase: amount to increase limit for each limit's worth of successful requests
+    • decrease: factor to multiply limit by when a request is throttled
+
+    The limit is adjusted using additive increase, multiplicative decrease (AIMD). A burst of
+    throttled requests decreases the limit once: only a throttled request that was started
+    after the most recent decrease will decrease it again.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: int = 16,
+        minimum: int = 1,
+        maximum: int = 256,
+        increase: int | float = 1,
+        decrease: float = 0.5,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.limit = float(initial)
+        self.in_flight = 0
+        self._epoch = 0
+        self._waiters = deque()
+
+    async def acquire(self) -> int:
+        """
+        Wait until a request can be put in flight. Returns a token to be passed to the
+        `release` method when the request has completed.
+        """
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return self._epoch
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except:
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1  # slot granted, but abandoned
+                self._wake()
+            else:
+                with suppress(ValueError):
+                    self._waiters.remove(waiter)
+            raise
+        return self._epoch
+
+    def release(self, token: int, throttled: bool | None = False) -> None:
+        """
+        Release a request that is no longer in flight, adjusting the limit.
+
+        Parameters:
+        • token: value returned when request was acquired
+        • throttled: whether the request was throttled, or None to leave limit unadjusted
+        """
+        self.in_flight -= 1
+        if throttled:
+            if token == self._epoch:
+                self.limit = max(float(self.minimum), self.limit * self.decrease)
+                self._epoch += 1
+        elif throttled is not None:
+            self.limit = min(float(self.maximum), self.limit + self.increase / self.limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+limiters: dict[tuple[str, str | None], AdaptiveLimiter] = {}
+
+
+def limiter(service_name: str, region_name: str | None) -> AdaptiveLimiter:
+    """
+    Return the limiter that governs requests in flight to a service in a region, creating it
+    if it does not exist. To customize a limiter, add it to the `limiters` dictionary prior
+    to the service being accessed.
+    """
+    key = (service_name, region_name)
+    result = limiters.get(key)
+    if result is None:
+        result = limiters[key] = AdaptiveLimiter()
+    return result
+
+
+TRANSIENT_CODES = frozenset(
+    {
+        "BadGateway",
+        "InternalError",
+        "InternalFailure",
+        "InternalServerError",
+        "InternalServerException",
+        "PriorRequestNotComplete",
+        "RequestTimeout",
+        "RequestTimeoutException",
+        "ServiceUnavailable",
+        "ServiceUnavailableException",
+    }
+)
+
+
+def backoff(previous: float, base: float, cap: float) -> float:
+    """
+    Return the next delay between attempts, using decorrelated jitter.
+
+    Parameters:
+    • previous: previous delay in seconds, or zero if this is the first delay
+    • base: minimum delay in seconds
+    • cap: maximum delay in seconds
+    """
+    return min(cap, random.uniform(base, max(base, previous * 3)))
+
+
+class RetryBudget:
+    """
+    A token bucket that limits retries across the process, to prevent retries from
+    amplifying load on a service that is failing.
+
+    Parameters and attributes:
+    • capacity: maximum number of tokens in the bucket
+    • cost: tokens withdrawn to retry after an error response
+    • timeout_cost: tokens withdrawn to retry after a connection error or timeout
+    • refund: tokens deposited for each successful operation
+
+    A retry is only attempted if the bucket holds enough tokens to pay for it.
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: int = 500,
+        cost: int = 5,
+        timeout_cost: int = 10,
+        refund: int = 1,
+    ):
+        self.capacity = capacity
+        self.cost = cost
+        self.timeout_cost = timeout_cost
+        self.refund = refund
+        self.tokens = capacity
+
+    def withdraw(self, kind: str) -> bool:
+        """Withdraw tokens to pay for a retry; return False if there are insufficient tokens."""
+        cost = self.timeout_cost if kind == "connection" else self.cost
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        return True
+
+    def deposit(self) -> None:
+        """Deposit tokens for a successful operation."""
+        self.tokens = min(self.capacity, self.tokens + self.refund)
+
+
+budget = RetryBudget()
+
+
+class RetryPolicy:
+    """
+    Policy to retry failed service operations.
+
+    Parameters and attributes:
+    • attempts: maximum number of attempts for each operation
+    • base: minimum delay in seconds between attempts
+    • cap: maximum delay in seconds between attempts
+    • deadline: maximum time in seconds to complete an operation, including retries
+
+    Errors are classified by the `classify` method; only throttling, transient and connection
+    errors are retried. An operation is not retried if its request body is a stream that cannot
+    be rewound (with a `rewind` method), if the process retry budget is exhausted, or if the
+    retry could not complete before the deadline.
+    """
+
+    def __init__(
+        self,
+        *,
+        attempts: int = 4,
+        base: float = 0.05,
+        cap: float = 20.0,
+        deadline: int | float | None = None,
+    ):
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+        self.deadline = deadline
+
+    def classify(
+        self, error: Exception
+    ) -> Literal["throttling", "transient", "connection"] | None:
+        """Return the kind of a retryable error, or None if the error should not be retried."""
+        import botocore.exceptions
+
+        if isinstance(error, botocore.exceptions.ClientError):
+            if is_throttling(error):
+                return "throttling"
+            if error.response.get("Error", {}).get("Code") in TRANSIENT_CODES:
+                return "transient"
+            status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+            return "transient" if status in {500, 502, 504} else None
+        if isinstance(
+            error, (botocore.exceptions.ConnectionError, botocore.exceptions.HTTPClientError)
+        ):
+            return "connection"
+        return None
+
+
+retry_policies: dict[str, RetryPolicy] = {}
+
+default_retry_policy = RetryPolicy()
+
+
+def retry_policy(service_name: str) -> RetryPolicy:
+    """
+    Return the retry policy for a service. To customize the policy for a service, add it to
+    the `retry_policies` dictionary; otherwise, the default retry policy is returned.
+    """
+    return retry_policies.get(service_name, default_retry_policy)
+
+
+def _retryable_body(kwargs: dict[str, Any]) -> bool:
+    body = kwargs.get("Body", b"")
+    return isinstance(body, bytes | bytearray | memoryview | str) or hasattr(body, "rewind")
+
+
+_DURATION_BUCKETS = tuple(0.001 * 2**n for n in range(17))  # 1 ms → 65.5 s
+
+
+class _OperationStats:
+    """Aggregated statistics of a service operation."""
+
+    __slots__ = ("count", "retries", "sent", "received", "maximum", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.retries = 0
+        self.sent = 0
+        self.received = 0
+        self.maximum = 0.0
+        self.buckets = [0] * (len(_DURATION_BUCKETS) + 1)
+
+    def quantile(self, q: float) -> float:
+        """Return the estimated duration at the specified quantile."""
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(_DURATION_BUCKETS, self.buckets):
+            cumulative += count
+            if count and cumulative >= rank:
+                return min(bound, self.maximum)  # upper bound of bucket
+        return self.maximum
+
+
+class Instrumentation:
+    """
+    Aggregates statistics of service operations in process, and records them periodically
+    as measurements in a monitor.
+
+    Parameters and attributes:
+    • monitor: monitor to record measurements  [global monitors]
+    • interval: time in seconds between recording measurements
+
+    For each service, operation and error code, the following measurements are recorded:
+    • aws_operation_invocations: number of operations invoked
+    • aws_operation_retries: number of times operations were retried
+    • aws_operation_bytes_sent: number of bytes sent in requests
+    • aws_operation_bytes_received: number of bytes received in responses
+    • aws_operation_duration: duration of operations, with "statistic" tag of "p50", "p90",
+      "p99" or "max"
+
+    Measurements are tagged with "service", "operation" and, for failed operations, "error".
+    Durations are aggregated in a logarithmic histogram; quantiles are estimated from it.
+
+    Statistics are recorded when an operation completes after the interval has elapsed. To
+    record the statistics that remain on shutdown, await `flush()` in a shutdown hook;
+    the module `close` function does so.
+    """
+
+    def __init__(self, monitor: Monitor | None = None, interval: int | float = 60):
+        self.monitor = monitor
+        self.interval = interval
+        self._stats: dict[tuple[str, str, str | None], _OperationStats] = {}
+        self._flushed = time.monotonic()
+        self._task = None
+
+    def record(
+        self,
+        *,
+        service: str,
+        operation: str,
+        duration: float,
+        retries: int = 0,
+        sent: int = 0,
+        received: int = 0,
+        error: str | None = None,
+    ) -> None:
+        """Record the outcome of a service operation."""
+        key = (service, operation, error)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _OperationStats()
+        stats.count += 1
+        stats.retries += retries
+        stats.sent += sent
+        stats.received += received
+        stats.maximum = max(stats.maximum, duration)
+        stats.buckets[bisect.bisect_left(_DURATION_BUCKETS, duration)] += 1
+        if time.monotonic() - self._flushed >= self.interval:
+            if not self._task or self._task.done():
+                self._task = asyncio.create_task(self.flush())
+
+    def _measurements(self, stats: dict[tuple, _OperationStats]) -> Iterator[Measurement]:
+        for (service, operation, error), s in stats.items():
+            tags = {"service": service, "operation": operation}
+            if error:
+                tags["error"] = error
+            yield Measurement(
+                name="aws_operation_invocations", tags=tags, type="counter", value=s.count
+            )
+            yield Measurement(
+                name="aws_operation_retries", tags=tags, type="counter", value=s.retries
+            )
+            yield Measurement(
+                name="aws_operation_bytes_sent",
+                tags=tags,
+                type="counter",
+                value=s.sent,
+                unit="B",
+            )
+            yield Measurement(
+                name="aws_operation_bytes_received",
+                tags=tags,
+                type="counter",
+                value=s.received,
+                unit="B",
+            )
+            for statistic, value in (
+                ("p50", s.quantile(0.5)),
+                ("p90", s.quantile(0.9)),
+                ("p99", s.quantile(0.99)),
+                ("max", s.maximum),
+            ):
+                yield Measurement(
+                    name="aws_operation_duration",
+                    tags=tags | {"statistic": statistic},
+                    type="gauge",
+                    value=value,
+                    unit="s",
+                )
+
+    async def flush(self) -> None:
+        """Record all aggregated statistics as measurements, and reset them."""
+        stats = self._stats
+        self._stats = {}
+        self._flushed = time.monotonic()
+        for measurement in self._measurements(stats):
+            try:
+                await fondat.monitor.record(measurement, self.monitor)
+            except Exception:
+                _logger.exception("failure recording measurement")
+
+
+instrumentation = Instrumentation()
+
+
+class _Call:
+    """Statistics of a service operation in progress."""
+
+    __slots__ = ("attempts", "sent")
+
+    def __init__(self):
+        self.attempts = 0
+        self.sent = 0
+
+
+_call: ContextVar[_Call | None] = ContextVar("_call", default=None)
+
+
+def _count_sent(request: Any, **kwargs) -> None:
+    """Event handler to count the bytes sent in a request."""
+    if call := _call.get():
+        with suppress(Exception):
+            call.sent += int(request.headers.get("Content-Length") or 0)
+
+
+def _received(response: Mapping[str, Any]) -> int:
+    headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+    with suppress(Exception):
+        return int(headers.get("content-length") or 0)
+    return 0
+
+
+class _Client:
+    """
+    Proxy for an aiobotocore client, which governs the service operations it invokes.
+
+    Parameters:
+    • client: aiobotocore client to proxy
+    • service_name: the name of the service the client accesses
+    """
+
+    def __init__(self, client: "AioBaseClient", service_name: str):
+        self._client = client
+        self._service_name = service_name
+        self._operations = client.meta.method_to_api_mapping
+        self._limiter = limiter(service_name, client.meta.region_name)
+        self._retry_policy = retry_policy(service_name)
+        client.meta.events.register("before-send", _count_sent)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name in self._operations:
+            attr = self._operation(attr, self._operations[name])
+            setattr(self, name, attr)  # avoid proxying again
+        return attr
+
+    async def _attempts(self, call, method, args, kwargs):
+        policy = self._retry_policy
+        begin = time.monotonic()
+        attempt = 0
+        delay = 0.0
+        while True:
+            attempt = call.attempts = attempt + 1
+            token = await self._limiter.acquire()
+            throttled = None
+            try:
+                result = await method(*args, **kwargs)
+                throttled = False
+                budget.deposit()
+                return result
+            except Exception as e:
+                kind = policy.classify(e)
+                throttled = kind == "throttling"
+                if kind is None or attempt >= policy.attempts or not _retryable_body(kwargs):
+                    raise
+                delay = backoff(delay, policy.base, policy.cap)
+                if policy.deadline and time.monotonic() - begin + delay >= policy.deadline:
+                    raise
+                if not budget.withdraw(kind):
+                    raise
+                _logger.debug("retrying %s in %.3fs: %s", method.__name__, delay, e)
+            finally:
+                self._limiter.release(token, throttled)
+            await asyncio.sleep(delay)
+            if rewind := getattr(kwargs.get("Body"), "rewind", None):
+                rewind()
+
+    async def _invoke(self, call, method, args, kwargs):
+        if not self._retry_policy.deadline:
+            return await self._attempts(call, method, args, kwargs)
+        async with asyncio.timeout(self._retry_policy.deadline):
+            return await self._attempts(call, method, args, kwargs)
+
+    def _operation(self, method, operation_name: str):
+        operation_model = self._client.meta.service_model.operation_model(operation_name)
+        idempotent = operation_model.idempotent_members
+
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            for name in idempotent:  # share one token across attempts, so retries are safe
+                if kwargs.get(name) is None:
+                    kwargs[name] = str(uuid.uuid4())
+            call = _Call()
+            reset = _call.set(call)
+            begin = time.perf_counter()
+            error = None
+            received = 0
+            try:
+                result = await self._invoke(call, method, args, kwargs)
+                received = _received(result)
+                return result
+            except Exception as e:
+                from botocore.exceptions import ClientError
+
+                if isinstance(e, ClientError):
+                    error = e.response.get("Error", {}).get("Code")
+                    received = _received(e.response)
+                error = error or type(e).__name__
+                raise
+            finally:
+                _call.reset(reset)
+                if instrumentation is not None:
+                    instrumentation.record(
+                        service=self._service_name,
+                        operation=operation_name,
+                        duration=time.perf_counter() - begin,
+                        retries=max(call.attempts - 1, 0),
+                        sent=call.sent,
+                        received=received,
+                        error=error,
+                    )
+
+        return wrapper
+
+
+class _SessionEntry:
+    """A cached session and its resolved credentials."""
+
+    __slots__ = ("session", "credentials", "lock", "refresher")
+
+    def __init__(self, session: "AioSession"):
+        self.session = session
+        self.credentials = None
+        self.lock = asyncio.Lock()
+        self.refresher = None
+
+
+class SessionCache:
+    """
+    A cache of aiobotocore sessions and their resolved credentials.
+
+    Parameters and attributes:
+    • interval: time in seconds between checks to refresh expiring credentials
+
+    A session is cached for each distinct profile and explicit access key. A session caches
+    the service models it loads, and the credentials it resolves; a cached session walks the
+    credential provider chain (environment, ~/.aws/ files, container and instance metadata
+    endpoints) once, rather than for each client.
+
+    Temporary credentials are refreshed by a background task before they expire, so that
+    requests do not wait for credentials to be refreshed.
+    """
+
+    def __init__(self, interval: int | float = 60):
+        self.interval = interval
+        self._entries: dict[tuple, _SessionEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def _refresh(self, credentials: Any) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if credentials.refresh_needed():
+                try:
+                    await credentials.get_frozen_credentials()
+                except Exception:
+                    _logger.exception("failure refreshing credentials")
+
+    def _start_refresher(self, entry: _SessionEntry) -> None:
+        if not hasattr(entry.credentials, "refresh_needed"):
+            return  # static credentials
+        if entry.refresher and not entry.refresher.done():
+            if not entry.refresher.get_loop().is_closed():
+                return
+        entry.refresher = asyncio.create_task(self._refresh(entry.credentials))
+
+    async def session(self, config: Config | None = None) -> "AioSession":
+        """
+        Return a session for the specified configuration, resolving its credentials if they
+        are not explicitly provided in configuration.
+
+        Parameters:
+        • config: session and client configuration
+        """
+        profile = config.profile if config else None
+        access_key_id = config.aws_access_key_id if config else None
+        key = (
+            profile,
+            access_key_id,
+            config.aws_secret_access_key if config else None,
+            config.aws_session_token if config else None,
+        )
+        entry = self._entries.get(key)
+        if entry is None:
+            from aiobotocore.session import AioSession
+
+            entry = _SessionEntry(AioSession(profile=profile))
+            self._entries[key] = entry
+        if access_key_id is None:  # credentials not explicitly provided
+            if entry.credentials is None:
+                async with entry.lock:
+                    if entry.credentials is None:
+                        credentials = await entry.session.get_credentials()
+                        if credentials is not None:
+                            await credentials.get_frozen_credentials()  # fetch if deferred
+                        entry.credentials = credentials
+            self._start_refresher(entry)
+        return entry.session
+
+    def clear(self) -> None:
+        """Discard all cached sessions, and stop refreshing their credentials."""
+        for entry in self._entries.values():
+            if entry.refresher and not entry.refresher.get_loop().is_closed():
+                entry.refresher.cancel()
+        self._entries.clear()
+
+
+sessions = SessionCache()
+
+
+# Maximum number of connections a client keeps to its endpoint. A pooled client carries all
+# requests of its service, including streamed responses that hold a connection until read,
+# so this is well above botocore's default of 10 and the default adaptive limiter maximum.
+MAX_POOL_CONNECTIONS = 1024
+
+
+@functools.cache
+def _defaults() -> Any:
+    """
+    Return default advanced configuration options, which disable botocore retries and raise
+    the connection limit.
+    """
+    import botocore.config
+
+    return botocore.config.Config(
+        retries={"total_max_attempts": 1}, max_pool_connections=MAX_POOL_CONNECTIONS
+    )
+
+
+# Alternative factory to open aiobotocore clients (e.g. fake clients for testing). It is
+# called with service name, API version and configuration, and returns an asynchronous
+# context manager that yields an open client.
+client_factory: Callable[
+    [str, str | None, Config | None], AbstractAsyncContextManager["AioBaseClient"]
+] | None = None
+
+
+@asynccontextmanager
+async def _open_client(service_name: str, api_version: str | None, config: Config | None):
+    """Open a new aiobotocore client."""
+    if client_factory is not None:
+        async with client_factory(service_name, api_version, config) as client:
+            yield _Client(client, service_name)
+        return
+    session = await sessions.session(config)
+    defaults = _defaults()
+    async with session.create_client(
+        service_name=service_name,
+        region_name=config.region_name if config else None,
+        api_version=api_version,
+        use_ssl=True,
+        verify=config.verify if config else True,
+        endpoint_url=config.endpoint_url if config else None,
+        aws_access_key_id=config.aws_access_key_id if config else None,
+        aws_secret_access_key=config.aws_secret_access_key if config else None,
+        aws_session_token=config.aws_session_token if config else None,
+        config=defaults.merge(config.config) if config and config.config else defaults,
+    ) as client:
+        yield _Client(client, service_name)
+
+
+class _PoolEntry:
+    """An open client in a client pool."""
+
+    __slots__ = ("loop", "client", "stack", "ready", "opener", "users", "used", "expired")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.client = None
+        self.opener = None
+        self.stack = AsyncExitStack()
+        self.ready = loop.create_future()
+        self.users = 0
+        self.used = time.monotonic()
+        self.expired = False
+
+
+class ClientPool:
+    """
+    A pool of open aiobotocore clients, shared by all operations that use them.
+
+    Parameters and attributes:
+    • size: maximum number of clients to keep open
+    • idle: time in seconds to keep an unused client open
+
+    Opening a client loads the service model, resolves the endpoint and credentials, and
+    establishes new connections; a pooled client pays these costs once. A client is safe for
+    concurrent use, so one open client is shared by all borrowers with the same service name,
+    API version and configuration.
+
+    Clients are bound to the event loop in which they are opened. A client is never shared
+    between event loops; clients of a closed event loop are discarded.
+    """
+
+    def __init__(self, size: int = 32, idle: int | float = 300):
+        self.size = size
+        self.idle = idle
+        self._entries: OrderedDict[tuple, _PoolEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def _acquire(
+        self,
+        service_name: str,
+        api_version: str | None,
+        config: Config | None,
+    ) -> _PoolEntry:
+        loop = asyncio.get_running_loop()
+        key = (loop, service_name, api_version, _config_key(config))
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _PoolEntry(loop)
+            # opened in its own task, so cancelling a borrower does not cancel the others
+            entry.opener = loop.create_task(
+                self._open(key, entry, service_name, api_version, config)
+            )
+        else:
+            self._entries.move_to_end(key)
+        entry.users += 1
+        try:
+            await asyncio.shield(entry.ready)
+        except:
+            entry.users -= 1
+            raise
+        return entry
+
+    async def _open(
+        self,
+        key: tuple,
+        entry: _PoolEntry,
+        service_name: str,
+        api_version: str | None,
+        config: Config | None,
+    ) -> None:
+        try:
+            entry.client = await entry.stack.enter_async_context(
+                _open_client(service_name, api_version, config)
+            )
+        except BaseException as e:
+            self._entries.pop(key, None)
+            if isinstance(e, asyncio.CancelledError):
+                entry.ready.cancel()
+            else:
+                entry.ready.set_exception(e)
+                entry.ready.exception()  # mark retrieved if no borrowers remain
+            if not isinstance(e, Exception):
+                raise
+        else:
+            entry.ready.set_result(None)
+        finally:
+            entry.opener = None
+
+    async def _release(self, entry: _PoolEntry) -> None:
+        entry.users -= 1
+        entry.used = time.monotonic()
+        if entry.expired and not entry.users:
+            await self._close_entry(entry)
+        await self._evict()
+
+    async def _close_entry(self, entry: _PoolEntry) -> None:
+        with suppress(Exception):
+            await entry.stack.aclose()
+
+    async def _evict(self) -> None:
+        """Close clients that are idle, belong to closed loops, or exceed the pool size."""
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        excess = len(self._entries) - self.size
+        for key, entry in list(self._entries.items()):  # least recently used first
+            if entry.loop.is_closed():
+                del self._entries[key]  # cannot be closed outside of its loop
+                excess -= 1
+                continue
+            if entry.users or entry.loop is not loop or not entry.ready.done():
+                continue
+            if excess > 0 or now - entry.used > self.idle:
+                del self._entries[key]
+                excess -= 1
+                await self._close_entry(entry)
+
+    @asynccontextmanager
+    async def client(
+        self,
+        service_name: str,
+        *,
+        api_version: str | None = None,
+        config: Config | None = None,
+    ) -> "AioBaseClient":
+        """
+        Borrow a client from the pool, opening a new client if required.
+
+        Parameters:
+        • service_name: the name of the service to access
+        • api_version: the API version to use  [latest]
+        • config: session and client configuration
+        """
+        entry = await self._acquire(service_name, api_version, config)
+        try:
+            yield entry.client
+        finally:
+            await self._release(entry)
+
+    async def close(self) -> None:
+        """
+        Close all pooled clients that belong to the running event loop, and discard clients
+        of closed event loops. Clients that are borrowed when the pool is closed remain open
+        until they are returned.
+        """
+        loop = asyncio.get_running_loop()
+        for key, entry in list(self._entries.items()):
+            if entry.loop.is_closed():
+                del self._entries[key]
+            elif entry.loop is loop and entry.ready.done():
+                del self._entries[key]
+                if entry.users:
+                    entry.expired = True  # close when released
+                else:
+                    await self._close_entry(entry)
+
+
+pool = ClientPool()
 
 
 @asynccontextmanager
@@ -35,7 +902,8 @@ async def create_client(
     *,
     api_version: str | None = None,
     config: Config | None = None,
-) -> AioBaseClient:
+    pooled: bool = True,
+) -> "AioBaseClient":
     """
     Create an aiobotocore client.
 
@@ -43,35 +911,145 @@ async def create_client(
     • service_name: the name of the service to access
     • api_version: the API version to use  [latest]
     • config: session and client configuration
+    • pooled: borrow an open client from the client pool
 
     If no configuration is provided, or configuration parameters are omitted, then
     aiobotocore will revert to searching environment variables and files in ~/.aws/.
+
+    Service operations invoked through the client are governed by the adaptive limiter for
+    the service and region, and are retried according to the retry policy for the service;
+    see the `limiter` and `retry_policy` functions. Retries performed by botocore itself are
+    disabled, unless explicitly configured in advanced configuration options. A client keeps
+    up to MAX_POOL_CONNECTIONS connections, unless max_pool_connections is configured there;
+    a streamed response body holds its connection until it is read or closed. Statistics of
+    each operation are aggregated by `instrumentation`; set it to None to disable.
+
+    A pooled client remains open after exiting the context, to be reused by subsequent
+    operations; to close all pooled clients, call `close()` (e.g. on application shutdown).
+    A client that is not pooled is closed upon exiting the context.
     """
+    if pooled:
+        async with pool.client(service_name, api_version=api_version, config=config) as client:
+            yield client
+    else:
+        async with _open_client(service_name, api_version, config) as client:
+            yield client
 
-    session = AioSession(profile=config.profile if config else None)
-    async with session.create_client(
-        service_name=service_name,
-        region_name=config.region_name if config else None,
-        api_version=api_version,
-        use_ssl=True,
-        verify=config.verify if config else True,
-        endpoint_url=config.endpoint_url if config else None,
-        aws_access_key_id=config.aws_access_key_id if config else None,
-        aws_secret_access_key=config.aws_secret_access_key if config else None,
-        aws_session_token=config.aws_session_token if config else None,
-        config=config.config if config else None,
-    ) as client:
-        yield client
+
+async def close() -> None:
+    """
+    Record remaining instrumentation statistics, close all pooled clients and discard all
+    cached sessions.
+    """
+    if instrumentation is not None:
+        await instrumentation.flush()
+    await pool.close()
+    sessions.clear()
+
+
+async def _connect(client: "AioBaseClient") -> None:
+    """Open a keep-alive connection to the endpoint of a client."""
+    from botocore.awsrequest import AWSPreparedRequest
+
+    request = AWSPreparedRequest(
+        method="HEAD",
+        url=client.meta.endpoint_url,
+        headers={},
+        body=None,
+        stream_output=False,
+    )
+    try:
+        await client._endpoint.http_session.send(request)  # unsigned; response is ignored
+    except Exception as e:
+        _logger.warning("failure connecting to %s: %s", client.meta.endpoint_url, e)
+
+
+async def warmup(
+    services: Iterable[str],
+    config: Config | None = None,
+    *,
+    connect: bool = True,
+) -> None:
+    """
+    Prepare pooled clients for the specified services, so that subsequent operations do not
+    pay the cost of doing so. For each service, this loads and parses its botocore service
+    model, resolves its endpoint and credentials, and optionally opens a keep-alive
+    connection to its endpoint.
+
+    Parameters:
+    • services: names of services to prepare clients for
+    • config: session and client configuration
+    • connect: open a keep-alive connection to each service endpoint
+
+    This coroutine function is intended to be invoked during the AWS Lambda initialization
+    phase; for example:
+
+        function = async_function(handler, init=lambda: warmup(["s3"]), eager=True)
+    """
+
+    async def prepare(service_name: str) -> None:
+        async with create_client(service_name, config=config) as client:
+            if connect:
+                await _connect(client._client)
+
+    await asyncio.gather(*(prepare(service_name) for service_name in services))
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent invocations of identical idempotent operations, such that only one
+    invocation is in flight at a time for a given key; concurrent callers with the same key
+    await its shared result, or raised exception.
+
+    Keys are tuples of hashable values; client configurations may also be included. The
+    result is shared by reference, so callers must not mutate it. If a caller is cancelled,
+    the shared invocation continues for the remaining callers.
+    """
+
+    def __init__(self):
+        self._calls: dict[tuple, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def call(self, key: tuple, function: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Invoke a function, or await the result of an identical invocation in flight.
+
+        Parameters:
+        • key: key that identifies the invocation
+        • function: coroutine function to invoke, with no arguments
+        """
+        key = (
+            asyncio.get_running_loop(),
+            *(_config_key(k) if isinstance(k, Config) else k for k in key),
+        )
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.create_task(function())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
+
+
+single_flight = SingleFlight()
 
 
 @contextmanager
 def wrap_client_error():
-    """Catch any raised ClientError and reraise as a Fondat resource error."""
+    """
+    Catch any raised ClientError and reraise as a Fondat resource error. An error that
+    indicates a request was throttled is raised as a too many requests error.
+    """
+    from botocore.exceptions import ClientError
+
     try:
         yield
     except ClientError as ce:
-        if ce.response["Error"]["Code"] == "ResourceNotFoundException":
+        code = ce.response["Error"]["Code"]
+        if code == "ResourceNotFoundException":
             status = 404
+        elif code in THROTTLING_CODES:
+            status = 429
         else:
             status = ce.response["ResponseMetadata"]["HTTPStatusCode"]
         raise fondat.error.errors[status] from ce
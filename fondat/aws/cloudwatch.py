@@ -56,7 +56,7 @@ unit_conversions = {
     "s": "Seconds",
     "μs": "Microseconds",
     "ms": "Milliseconds",
-    "B": "bytes",
+    "B": "Bytes",
     "kB": "Kilobytes",
     "MB": "Megabytes",
     "GB": "Gigabytes",
@@ -76,7 +76,7 @@ unit_conversions = {
     "kb/s": "Kilobits/Second",
     "Mb/s": "Megabits/Second",
     "Gb/s": "Gigabits/Second",
-    "TB/s": "Terabits/Second",
+    "Tb/s": "Terabits/Second",
 }
 
 
@@ -213,7 +213,9 @@ class CloudWatchMonitor(Monitor):
             m1 = measurements.popleft()
             datum = MetricDatum(
                 metric_name=_ascii(m1.name),
-                dimensions={_ascii(k): _ascii(v) for k, v in m1.tags.items()},
+                dimensions=[
+                    Dimension(name=_ascii(k), value=_ascii(v)) for k, v in m1.tags.items()
+                ],
                 timestamp=m1.timestamp,
                 statistic_values=StatisticSet(
                     sample_count=1.0,
@@ -221,9 +223,8 @@ class CloudWatchMonitor(Monitor):
                     minimum=m1.value,
                     maximum=m1.value,
                 ),
-                unit=unit_conversions.get(m1.unit) or "Counter"
-                if m1.type == "counter"
-                else None,
+                unit=unit_conversions.get(m1.unit)
+                or ("Count" if m1.type == "counter" else None),
                 storage_resolution=self.storage_resolution,
             )
             n = 0
@@ -14,6 +14,8 @@ def async_function(
     handler: Callable[[dict[str, Any], Any], Coroutine[Any, Any, Any]],
     init: Callable[[], Coroutine[Any, Any, None]] | None = None,
     loop: asyncio.AbstractEventLoop | None = None,
+    *,
+    eager: bool = False,
 ):
     """
     Return an AWS Lambda function that invokes an asynchronous coroutine function with event
@@ -23,8 +25,19 @@ def async_function(
     • coroutine: coroutine function to invoke for each call
     • init: initialization coroutine function to invoke prior to first coroutine invocation
     • loop: event loop to run function in; None creates a new one
+    • eager: invoke initialization coroutine function when the Lambda function is created
+
+    If the Lambda function is created when the handler module is imported, eager
+    initialization is performed in the Lambda initialization phase, rather than in the first
+    invocation.
     """
 
+    if eager and init:
+        if not loop:
+            loop = asyncio.new_event_loop()
+        loop.run_until_complete(init())
+        init = None
+
     def function(event: dict[str, Any], context: Any) -> dict[str, Any]:
         nonlocal loop
         nonlocal init
@@ -41,6 +54,8 @@ def async_function(
 def http_function(
     handler: Callable[[fondat.http.Request], Coroutine[Any, Any, fondat.http.Response]],
     init: Callable[[], Coroutine[Any, Any, None]] | None = None,
+    *,
+    eager: bool = False,
 ) -> Callable[[Any, Any], Coroutine[Any, Any, dict[str, Any]]]:
     """
     Return an AWS Lambda function to invoke an HTTP request handler.
@@ -48,6 +63,7 @@ def http_function(
     Parameters:
     • handler: HTTP request handler coroutine function to invoke for each call
     • init: coroutine function to invoke prior to first request handler invocation
+    • eager: invoke initialization coroutine function when the Lambda function is created
     """
 
     async def http_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
@@ -93,4 +109,4 @@ def http_function(
                 ),
             }
 
-    return async_function(http_handler, init)
+    return async_function(http_handler, init, eager=eager)
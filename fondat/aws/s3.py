@@ -1,20 +1,42 @@
 """Fondat module for Amazon Simple Storage Service (S3)."""
 
+import asyncio
+import csv
 import fondat.aws.client
 import fondat.codec
 import fondat.error
+import hashlib
+import io
+import json
 import logging
+import mmap
+import os
+import time
+import uuid
+import zlib
 
+from collections import OrderedDict, deque
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+)
 from contextlib import asynccontextmanager, contextmanager, suppress
+from dataclasses import dataclass
+from datetime import datetime
 from fondat.codec import BinaryCodec, DecodeError, StringCodec
 from fondat.error import InternalServerError, NotFoundError
 from fondat.pagination import Page
-from fondat.resource import operation, resource
-from fondat.stream import Reader, Stream
+from fondat.resource import operation, query, resource
+from fondat.stream import Stream
 from fondat.types import strip_annotations
 from fondat.validation import MinValue, validate_arguments
+from functools import partial
 from typing import Annotated, Any, Generic, TypeVar
-from urllib.parse import quote
+from urllib.parse import quote, unquote
 
 
 _logger = logging.getLogger(__name__)
@@ -39,6 +61,601 @@ def _log_wrap():
         raise InternalServerError from e
 
 
+MiB = 1024 * 1024
+
+CHUNK_SIZE = 5 * MiB
+
+MIN_PART_SIZE = 5 * MiB  # S3 limit, except for last part
+MAX_PART_SIZE = 5 * 1024 * MiB  # S3 limit
+MAX_PARTS = 10_000  # S3 limit
+
+_PART_GROWTH = 1000  # parts to upload at each size when content length is unknown
+
+
+class TransferConfig:
+    """
+    Configuration of multipart transfers.
+
+    Parameters and attributes:
+    • concurrency: maximum number of parts to upload, or ranges to download to file, at once
+    • read_ahead: maximum number of parts to read from source while awaiting upload
+    • min_part_size: minimum size of a part; smaller content is uploaded in a single request
+    • max_part_size: maximum size of a part
+    • target_parts: number of parts to divide content of known length into
+    • download_window: maximum number of byte ranges to download concurrently
+    • range_size: size of byte ranges to download
+
+    Parts that are read ahead or being uploaded are held in memory; an upload buffers at most
+    (concurrency + read_ahead) parts. A download with a window greater than 1 fetches the
+    object in byte ranges, buffering at most download_window ranges; a window of 1 reads the
+    object in a single request.
+
+    If the length of content is known, its part size is chosen to upload it in about
+    target_parts parts, and in no more than the 10,000 parts that S3 allows. Otherwise, part
+    size starts at min_part_size and doubles after every 1,000 parts, up to max_part_size.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = 8,
+        read_ahead: int = 2,
+        min_part_size: int = MIN_PART_SIZE,
+        max_part_size: int = MAX_PART_SIZE,
+        target_parts: int = 1000,
+        download_window: int = 1,
+        range_size: int = 8 * MiB,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if read_ahead < 0:
+            raise ValueError("read_ahead must not be negative")
+        if not MIN_PART_SIZE <= min_part_size <= max_part_size <= MAX_PART_SIZE:
+            raise ValueError("part sizes must be from 5 MiB to 5 GiB, minimum to maximum")
+        if not 1 <= target_parts <= MAX_PARTS:
+            raise ValueError(f"target_parts must be from 1 to {MAX_PARTS}")
+        if download_window < 1:
+            raise ValueError("download_window must be at least 1")
+        if range_size < 1:
+            raise ValueError("range_size must be at least 1")
+        self.concurrency = concurrency
+        self.read_ahead = read_ahead
+        self.min_part_size = min_part_size
+        self.max_part_size = max_part_size
+        self.target_parts = target_parts
+        self.download_window = download_window
+        self.range_size = range_size
+
+    def part_size(self, content_length: int | None, part_number: int) -> int:
+        """
+        Return the size of a part to upload.
+
+        Parameters:
+        • content_length: length of content being uploaded, or None if unknown
+        • part_number: number of part, starting from 1
+        """
+        if content_length is None:
+            return min(
+                self.max_part_size, self.min_part_size << (part_number - 1) // _PART_GROWTH
+            )
+        size = -(-content_length // self.target_parts)
+        size = -(-size // MiB) * MiB  # whole MiB
+        size = min(max(size, self.min_part_size), self.max_part_size)
+        if content_length > size * MAX_PARTS:
+            raise ValueError(f"content length exceeds {MAX_PARTS} parts of maximum part size")
+        return size
+
+
+class _CacheEntry:
+    __slots__ = ("type", "value", "etag", "size", "expires")
+
+    def __init__(self, type: Any, value: Any, etag: str, size: int, expires: float):
+        self.type = type
+        self.value = value
+        self.etag = etag
+        self.size = size
+        self.expires = expires
+
+
+class ObjectCache:
+    """
+    Read-through cache of decoded object values, validated by entity tag.
+
+    Parameters and attributes:
+    • size: maximum total size of cached objects, in bytes of object content
+    • ttl: time in seconds to use a cached value before revalidating it
+
+    Least recently used values are evicted to keep within the size. Once its time-to-live
+    expires, a value is revalidated with a conditional request; if the object is unchanged,
+    its content is not transferred or decoded again.
+
+    Cached values are shared by all readers of an object, and must not be mutated.
+    """
+
+    def __init__(self, *, size: int = 64 * MiB, ttl: int | float = 60):
+        self.size = size
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, str], _CacheEntry] = OrderedDict()
+        self._total = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, bucket: str, key: str, type: Any) -> _CacheEntry | None:
+        entry = self._entries.get((bucket, key))
+        if entry is None or entry.type != type:
+            return None
+        self._entries.move_to_end((bucket, key))
+        return entry
+
+    def _put(self, bucket: str, key: str, entry: _CacheEntry) -> None:
+        self.invalidate(bucket, key)
+        if entry.size > self.size:
+            return  # too large to cache
+        self._entries[bucket, key] = entry
+        self._total += entry.size
+        while self._total > self.size:
+            _, evicted = self._entries.popitem(last=False)
+            self._total -= evicted.size
+
+    def invalidate(self, bucket: str, key: str) -> None:
+        """Remove the cached value of an object, if any."""
+        if entry := self._entries.pop((bucket, key), None):
+            self._total -= entry.size
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        self._entries.clear()
+        self._total = 0
+
+
+@dataclass
+class ObjectMetadata:
+    """
+    Metadata of an object.
+
+    Attributes:
+    • size: size of object content, in bytes
+    • etag: entity tag of object
+    • last_modified: time object was last modified
+    • content_type: content type of object, or None if not known
+    • content_encoding: content encoding of object, if any
+    • metadata: user-defined metadata, or None if not known
+    """
+
+    size: int
+    etag: str
+    last_modified: datetime
+    content_type: str | None = None
+    content_encoding: str | None = None
+    metadata: dict[str, str] | None = None
+
+
+class MetadataIndex:
+    """
+    In-memory index of object metadata, filled from bucket listings and object head requests.
+
+    Parameters and attributes:
+    • size: maximum number of objects to index
+    • ttl: time in seconds to use indexed metadata, or None to use until invalidated
+
+    Least recently used objects are evicted to keep within the size. Metadata indexed from a
+    listing has no content type, content encoding or user-defined metadata.
+    """
+
+    def __init__(self, *, size: int = 1_000_000, ttl: int | float | None = None):
+        self.size = size
+        self.ttl = ttl
+        self._entries: OrderedDict[
+            tuple[str, str], tuple[float, ObjectMetadata]
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, bucket: str, key: str) -> ObjectMetadata | None:
+        entry = self._entries.get((bucket, key))
+        if entry is None:
+            return None
+        if self.ttl is not None and time.monotonic() - entry[0] >= self.ttl:
+            del self._entries[bucket, key]
+            return None
+        self._entries.move_to_end((bucket, key))
+        return entry[1]
+
+    def _put(self, bucket: str, key: str, metadata: ObjectMetadata) -> None:
+        entry = self._entries.pop((bucket, key), None)
+        if entry and entry[1].etag == metadata.etag and metadata.content_type is None:
+            metadata = entry[1]  # retain metadata from head request
+        self._entries[bucket, key] = (time.monotonic(), metadata)
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def _put_listing(self, bucket: str, response: dict[str, Any]) -> None:
+        for content in response.get("Contents", ()):
+            self._put(
+                bucket,
+                content["Key"],
+                ObjectMetadata(
+                    size=content["Size"],
+                    etag=content["ETag"],
+                    last_modified=content["LastModified"],
+                ),
+            )
+
+    def invalidate(self, bucket: str, key: str) -> None:
+        """Remove the indexed metadata of an object, if any."""
+        self._entries.pop((bucket, key), None)
+
+    def clear(self) -> None:
+        """Remove all indexed metadata."""
+        self._entries.clear()
+
+
+@dataclass
+class UploadCheckpoint:
+    """
+    Checkpoint of a multipart upload, to resume the upload if it is interrupted.
+
+    Attributes:
+    • upload_id: identifier of multipart upload
+    • parts: entity tags of uploaded parts, keyed by part number
+    """
+
+    upload_id: str
+    parts: dict[int, str]
+
+
+def _etag(data: bytes | bytearray) -> str:
+    """Return the entity tag S3 assigns to an unencrypted object or part."""
+    return f'"{hashlib.md5(data, usedforsecurity=False).hexdigest()}"'
+
+
+_SELECT_INPUT = {
+    "csv": {"CSV": {"FileHeaderInfo": "USE"}},
+    "json": {"JSON": {"Type": "LINES"}},
+    "parquet": {"Parquet": {}},
+}
+
+
+class _CSVDecoder:
+    """Decode CSV records from lines, including records with quoted fields that span lines."""
+
+    def __init__(self):
+        self._lines = deque()
+        self._quotes = 0  # quote characters in lines of record not yet decoded
+        self._reader = csv.reader(self)  # reads lines as they are fed
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self._lines:
+            raise StopIteration
+        return self._lines.popleft()
+
+    def __call__(self, line: bytes) -> list[list[str]]:
+        """Feed a line without its terminator; return the records it completes."""
+        line = line.decode()
+        self._lines.append(line + "\n")
+        self._quotes += line.count('"')
+        if self._quotes % 2:  # within quoted field
+            return []
+        self._quotes = 0
+        record = next(self._reader)
+        return [record] if record else []
+
+
+def _json_decoder() -> Callable[[bytes], list[Any]]:
+    return lambda line: [json.loads(line)] if line else []
+
+
+_SELECT_OUTPUT = {
+    "csv": ({"CSV": {}}, _CSVDecoder),
+    "json": ({"JSON": {}}, _json_decoder),
+}
+
+
+MAX_DELETE_KEYS = 1000  # S3 limit
+
+
+COMPRESSION = ("gzip", "zstd")  # supported compression algorithms
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd compression requires the zstandard package") from None
+    return zstandard
+
+
+def _compressor(algorithm: str) -> Any:
+    """Return an object to incrementally compress content with the specified algorithm."""
+    if algorithm == "gzip":
+        return zlib.compressobj(wbits=31)
+    if algorithm == "zstd":
+        return _zstandard().ZstdCompressor().compressobj()
+    raise ValueError(f"unsupported compression algorithm: {algorithm}")
+
+
+def _decompressor(encoding: str | None) -> Any:
+    """Return an object to incrementally decompress content, or None if not compressed."""
+    if encoding == "gzip":
+        return zlib.decompressobj(wbits=31)
+    if encoding == "zstd":
+        return _zstandard().ZstdDecompressor().decompressobj()
+    return None
+
+
+def _compress(algorithm: str, data: bytes) -> bytes:
+    compressor = _compressor(algorithm)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _decompress(encoding: str | None, data: bytes) -> bytes:
+    if (decompressor := _decompressor(encoding)) is None:
+        return data
+    return decompressor.decompress(data) + decompressor.flush()
+
+
+_THREAD_SIZE = 256 * 1024  # (de)compress larger chunks in a thread, to not block event loop
+
+
+async def _process(function: Any, chunk: bytes) -> bytes:
+    if len(chunk) < _THREAD_SIZE:
+        return function(chunk)
+    return await asyncio.to_thread(function, chunk)
+
+
+class _CompressedStream(Stream):
+    """Compress the content of a stream as it is read."""
+
+    def __init__(self, stream: Stream, algorithm: str):
+        super().__init__(content_type=stream.content_type)
+        self._stream = stream
+        self._compressor = _compressor(algorithm)
+
+    async def __anext__(self) -> bytes:
+        while self._compressor:
+            try:
+                chunk = await anext(self._stream)
+            except StopAsyncIteration:
+                chunk, self._compressor = self._compressor.flush(), None
+            else:
+                chunk = await _process(self._compressor.compress, chunk)
+            if chunk:
+                return chunk
+        raise StopAsyncIteration
+
+    async def close(self) -> None:
+        self._compressor = None
+        await self._stream.close()
+
+
+@dataclass
+class DeleteFailure:
+    """
+    An object that could not be deleted.
+
+    Attributes:
+    • key: key of object
+    • code: error code
+    • message: error message
+    """
+
+    key: Any
+    code: str | None
+    message: str | None
+
+
+async def _read(stream: Stream, preallocate: bool = True) -> bytes | bytearray:
+    """
+    Read all content of a stream, with minimal copying. Content in a single chunk is returned
+    as is; if content length is known and preallocate is true, chunks are read into a
+    preallocated bytearray. Otherwise, chunks are joined into bytes.
+    """
+    content = await anext(stream, b"")
+    length = stream.content_length
+    if preallocate and length is not None and len(content) < length:
+        buffer = bytearray(length)
+        buffer[: len(content)] = content
+        offset = len(content)
+        async for chunk in stream:
+            buffer[offset : offset + len(chunk)] = chunk  # in place, or extends past length
+            offset += len(chunk)
+        del buffer[offset:]  # if stream is shorter than its content length
+        return buffer
+    chunks = [content]
+    async for chunk in stream:
+        chunks.append(chunk)
+    return content if len(chunks) == 1 else b"".join(chunks)
+
+
+class _BufferReader:
+    """Read a stream into buffers, copying each byte once."""
+
+    def __init__(self, stream: Stream):
+        self._stream = stream
+        self._chunk = memoryview(b"")
+
+    async def readinto(self, buffer: bytearray) -> int:
+        """Fill buffer with bytes from the stream; return the number of bytes read."""
+        count = 0
+        while count < len(buffer):
+            if not self._chunk:
+                try:
+                    self._chunk = memoryview(await anext(self._stream))
+                except StopAsyncIteration:
+                    break
+            size = min(len(self._chunk), len(buffer) - count)
+            buffer[count : count + size] = self._chunk[:size]
+            self._chunk = self._chunk[size:]
+            count += size
+        return count
+
+
+class _BufferPool:
+    """Pool of reusable buffers."""
+
+    def __init__(self):
+        self._buffers: list[bytearray] = []
+
+    def get(self, size: int) -> bytearray:
+        """Return a buffer of the specified size."""
+        while self._buffers:
+            if len(buffer := self._buffers.pop()) == size:
+                return buffer
+        return bytearray(size)
+
+    def put(self, buffer: bytearray) -> None:
+        """Return a buffer to the pool, to be reused."""
+        self._buffers.append(buffer)
+
+
+@contextmanager
+def _mapped(path: str | os.PathLike) -> Iterator[memoryview]:
+    """Memory-map a file to be read, yielding a view of its content."""
+    with open(path, "rb") as file:
+        if not os.fstat(file.fileno()).st_size:  # empty file cannot be mapped
+            yield memoryview(b"")
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            with memoryview(mapping) as view:  # views must be released to close mapping
+                yield view
+
+
+class _MappedPart(io.RawIOBase):
+    """
+    Request body that reads a view of a memory-mapped file, without copying the view. The body
+    can be rewound to retry a request; closing it releases the view.
+    """
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else self._position + size
+        data = bytes(self._view[self._position : end])
+        self._position += len(data)
+        return data
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._view[self._position : self._position + len(buffer)]
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}
+        self._position = max(0, base[whence] + offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def rewind(self) -> None:
+        """Rewind the body to be sent again."""
+        self._position = 0
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def _pwrite(fd: int, offset: int, data: bytes) -> None:
+    """Write all data to a file descriptor at an offset."""
+    with memoryview(data) as view:
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view, offset = view[written:], offset + written
+
+
+async def _aiter(iterable: Iterable | AsyncIterable) -> AsyncIterator:
+    if isinstance(iterable, AsyncIterable):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
+
+
+async def _as_completed(
+    function: Callable[[Any], Awaitable[Any]],
+    items: Iterable | AsyncIterable,
+    concurrency: int,
+) -> AsyncIterator[tuple[Any, Any]]:
+    """
+    Apply a coroutine function to items concurrently, yielding each item with its result, or
+    the exception it raised, as it completes. Items are consumed only as concurrency allows.
+    """
+    items = _aiter(items)
+    pending = {}  # item of each task
+    try:
+        while True:
+            while items and len(pending) < concurrency:
+                try:
+                    item = await anext(items)
+                except StopAsyncIteration:
+                    items = None
+                    break
+                pending[asyncio.create_task(function(item))] = item
+            if not pending:
+                break
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item = pending.pop(task)
+                yield item, task.exception() or task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _run_concurrently(
+    function: Callable[..., Awaitable[Any]],
+    arguments: Iterable[tuple] | AsyncIterable[tuple],
+    concurrency: int,
+) -> list[Any]:
+    """
+    Apply a coroutine function to each tuple of arguments concurrently, returning the results
+    in order. Arguments are consumed only as concurrency allows. If any invocation fails, the
+    rest are cancelled, and the first failure is raised; any other failures are logged.
+    """
+    slots = asyncio.Semaphore(concurrency)
+
+    async def run(args: tuple) -> Any:
+        try:
+            return await function(*args)
+        finally:
+            slots.release()
+
+    arguments = _aiter(arguments)
+    tasks = []
+    try:
+        async with asyncio.TaskGroup() as group:  # failure of any invocation cancels the rest
+            while True:
+                await slots.acquire()
+                try:
+                    args = await anext(arguments)
+                except StopAsyncIteration:
+                    break
+                tasks.append(group.create_task(run(args)))
+    except ExceptionGroup as eg:
+        for e in eg.exceptions[1:]:
+            _logger.error(e)
+        raise eg.exceptions[0]  # first failure
+    return [task.result() for task in tasks]
+
+
 @resource
 class BucketResource(Generic[KT, VT]):
     """
@@ -50,8 +667,12 @@ class BucketResource(Generic[KT, VT]):
     • value_type: type of value stored in each object
     • prefix: prefix for all objects
     • suffix: suffix for all objects
-    • compress: algorithm to compress and decompress content
+    • compress: algorithm to compress and decompress content: "gzip" or "zstd"
     • encode_keys: URL encode and decode object keys
+    • transfer: configuration of multipart transfers
+    • cache: cache of decoded object values
+    • index: index of object metadata, filled as objects are listed
+    • checkpoints: resource to store checkpoints of multipart uploads
     """
 
     def __init__(
@@ -62,13 +683,23 @@ class BucketResource(Generic[KT, VT]):
         value_type: Any = bytes,
         prefix: str = "",
         suffix: str = "",
+        compress: str | None = None,
         encode_keys: bool = False,
+        transfer: TransferConfig | None = None,
+        cache: ObjectCache | None = None,
+        index: MetadataIndex | None = None,
+        checkpoints: Any = None,
     ):
         self.name = name
         self.value_type = value_type
         self.prefix = prefix
         self.suffix = suffix
+        self.compress = compress
         self.encode_keys = encode_keys
+        self.transfer = transfer
+        self.cache = cache
+        self.index = index
+        self.checkpoints = checkpoints
         self.key_codec = StringCodec.get(key_type)
 
     @operation
@@ -87,33 +718,212 @@ class BucketResource(Generic[KT, VT]):
         async with create_client() as client:
             with _log_wrap():
                 response = await client.list_objects_v2(Bucket=self.name, **kwargs)
-            items = []
-            for content in response.get("Contents", ()):
-                key = content["Key"]
-                if not key.endswith(self.suffix):
-                    continue  # ignore non-matching object keys
-                key = key[len(self.prefix) : len(key) - len(self.suffix)]
-                try:
-                    key = self.key_codec.decode(key)
-                except DecodeError:
-                    continue  # ignore incompatible object keys
-                items.append(key)
-            next_token = response.get("NextContinuationToken")
-            cursor = next_token.encode() if next_token is not None else None
-            return Page(items=items, cursor=cursor)
+        next_token = response.get("NextContinuationToken")
+        cursor = next_token.encode() if next_token is not None else None
+        return Page(items=self._decode_keys(response), cursor=cursor)
+
+    def _decode_keys(self, response: dict[str, Any]) -> list[KT]:
+        """Return the keys of objects in a list_objects_v2 response."""
+        if self.index is not None:
+            self.index._put_listing(self.name, response)
+        items = []
+        for content in response.get("Contents", ()):
+            key = content["Key"]
+            if not key.endswith(self.suffix):
+                continue  # ignore non-matching object keys
+            key = key[len(self.prefix) : len(key) - len(self.suffix)]
+            if self.encode_keys:
+                key = unquote(key)
+            try:
+                key = self.key_codec.decode(key)
+            except DecodeError:
+                continue  # ignore incompatible object keys
+            items.append(key)
+        return items
+
+    async def keys(
+        self, *, start_after: KT | None = None, max_keys: int | None = None
+    ) -> AsyncIterator[KT]:
+        """
+        Iterate over the keys of all objects in the bucket, in ascending object key order.
+
+        Parameters:
+        • start_after: key after which to start
+        • max_keys: maximum number of keys to iterate over
+
+        The next page of keys is requested while keys of the current page are iterated.
+        """
+        kwargs = {"Bucket": self.name}
+        if self.prefix:
+            kwargs["Prefix"] = self.prefix
+        if start_after is not None:
+            kwargs["StartAfter"] = self[start_after].key
+        remaining = max_keys
+        async with create_client() as client:
+
+            async def list_objects(token: str | None) -> dict[str, Any]:
+                with _log_wrap():
+                    if token is None:
+                        return await client.list_objects_v2(**kwargs)
+                    return await client.list_objects_v2(**kwargs, ContinuationToken=token)
+
+            task = asyncio.create_task(list_objects(None))
+            try:
+                while task:
+                    response = await task
+                    task = None
+                    items = self._decode_keys(response)
+                    if remaining is not None:
+                        items = items[:remaining]
+                        remaining -= len(items)
+                    token = response.get("NextContinuationToken")
+                    if token and remaining != 0:
+                        task = asyncio.create_task(list_objects(token))  # prefetch
+                    for item in items:
+                        yield item
+            finally:
+                if task:
+                    task.cancel()
+                    with suppress(asyncio.CancelledError, Exception):
+                        await task
+
+    async def delete_many(
+        self, keys: Iterable[KT] | AsyncIterable[KT], *, concurrency: int = 4
+    ) -> list[DeleteFailure]:
+        """
+        Delete objects in batches, returning objects that could not be deleted.
+
+        Parameters:
+        • keys: keys of objects to delete
+        • concurrency: maximum number of batches to delete concurrently
+
+        Keys are deleted in batches of up to 1,000 keys per request. Failure to delete an
+        individual object is returned, rather than raised.
+        """
+        failures = []
+
+        async def delete(client: Any, batch: dict[str, KT]) -> None:
+            with _log_wrap():
+                response = await client.delete_objects(
+                    Bucket=self.name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+            for key in batch:
+                if self.cache is not None:
+                    self.cache.invalidate(self.name, key)
+                if self.index is not None:
+                    self.index.invalidate(self.name, key)
+            for error in response.get("Errors", ()):
+                failures.append(
+                    DeleteFailure(
+                        key=batch[error["Key"]],
+                        code=error.get("Code"),
+                        message=error.get("Message"),
+                    )
+                )
+
+        async def batches(client: Any) -> AsyncIterator[tuple[Any, dict[str, KT]]]:
+            batch = {}
+            async for key in _aiter(keys):
+                batch[self[key].key] = key
+                if len(batch) == MAX_DELETE_KEYS:
+                    yield client, batch
+                    batch = {}
+            if batch:
+                yield client, batch
+
+        async with create_client() as client:
+            await _run_concurrently(delete, batches(client), concurrency)
+        return failures
+
+    async def delete_prefix(self, *, concurrency: int = 4) -> list[DeleteFailure]:
+        """
+        Delete all objects in the bucket that have the prefix and suffix of this resource,
+        returning objects that could not be deleted.
+
+        Parameters:
+        • concurrency: maximum number of batches to delete concurrently
+        """
+        return await self.delete_many(self.keys(), concurrency=concurrency)
+
+    async def get_many(
+        self, keys: Iterable[KT] | AsyncIterable[KT], *, concurrency: int = 16
+    ) -> AsyncIterator[tuple[KT, VT | Exception]]:
+        """
+        Get the values of objects concurrently, yielding each key with its value, or the
+        exception raised getting it, as it completes.
+
+        Parameters:
+        • keys: keys of objects to get
+        • concurrency: maximum number of objects to get concurrently
+
+        Keys are consumed, and values held, only as concurrency allows.
+        """
+
+        async def get(key: KT) -> VT:
+            return await self[key].get()
+
+        async for key, result in _as_completed(get, keys, concurrency):
+            yield key, result
+
+    async def put_many(
+        self,
+        items: Iterable[tuple[KT, VT]] | AsyncIterable[tuple[KT, VT]],
+        *,
+        concurrency: int = 16,
+    ) -> AsyncIterator[tuple[KT, Exception | None]]:
+        """
+        Put the values of objects concurrently, yielding each key with None, or the exception
+        raised putting it, as it completes.
+
+        Parameters:
+        • items: keys and values of objects to put
+        • concurrency: maximum number of objects to put concurrently
+
+        Items are consumed only as concurrency allows.
+        """
+
+        async def put(item: tuple[KT, VT]) -> None:
+            await self[item[0]].put(item[1])
+
+        async for item, result in _as_completed(put, items, concurrency):
+            yield item[0], result
+
+    async def copy_prefix(self, destination: "BucketResource", *, concurrency: int = 8) -> None:
+        """
+        Copy all objects in the bucket that have the prefix and suffix of this resource to
+        another bucket resource, without transferring their content through this process.
+
+        Parameters:
+        • destination: bucket resource to copy objects to, with the same key
+        • concurrency: maximum number of objects to copy concurrently
+
+        Each object is copied as with ObjectResource.copy_to, to the key that the destination
+        resource maps the same object key to.
+        """
+
+        async def copy(key: KT) -> None:
+            target = destination[key]
+            await self[key].copy_to(target.bucket, target.key)
+
+        await _run_concurrently(copy, ((key,) async for key in self.keys()), concurrency)
 
     def __getitem__(self, key: KT) -> "ObjectResource[VT]":
         key = self.key_codec.encode(key)
         if self.encode_keys:
             key = quote(key, safe="")
         return ObjectResource(
-            bucket=self.name, key=f"{self.prefix}{key}{self.suffix}", type=self.value_type
+            bucket=self.name,
+            key=f"{self.prefix}{key}{self.suffix}",
+            type=self.value_type,
+            compress=self.compress,
+            transfer=self.transfer,
+            cache=self.cache,
+            index=self.index,
+            checkpoints=self.checkpoints,
         )
 
 
-CHUNK_SIZE = 5 * 1024 * 1024  # 5 MiB
-
-
 @resource
 class ObjectResource(Generic[VT]):
     """
@@ -122,6 +932,23 @@ class ObjectResource(Generic[VT]):
     Parameters and attributes:
     • bucket: name of bucket where object resides
     • key: object key
+    • type: type of value stored in object
+    • compress: algorithm to compress and decompress content: "gzip" or "zstd"
+    • transfer: configuration of multipart transfers
+    • cache: cache of decoded object values; not used if type is Stream
+    • index: index of object metadata
+    • checkpoints: resource to store checkpoints of multipart uploads
+
+    If compress is specified, content is compressed as it is stored, with its content
+    encoding set accordingly. Content is decompressed as it is read if its content encoding
+    is a supported algorithm.
+
+    If checkpoints is specified, the progress of a multipart upload is stored as an
+    UploadCheckpoint, keyed by "{bucket}/{key}"; a failed upload is not aborted once its
+    checkpoint is stored. Putting the same content again resumes the upload: content is read
+    again, but parts already uploaded with the same content are skipped. The checkpoints
+    resource can be any resource of items that get, put and delete UploadCheckpoint values,
+    such as a BucketResource or DirectoryResource.
     """
 
     def __init__(
@@ -129,76 +956,360 @@ class ObjectResource(Generic[VT]):
         bucket: str,
         key: str,
         type: Any,
+        *,
+        compress: str | None = None,
+        transfer: TransferConfig | None = None,
+        cache: ObjectCache | None = None,
+        index: MetadataIndex | None = None,
+        checkpoints: Any = None,
     ):
+        if compress is not None:
+            _compressor(compress)  # raise if unsupported
         self.bucket = bucket
         self.key = key
         self.type = strip_annotations(type)
+        self.compress = compress
+        self.transfer = transfer or TransferConfig()
         self.codec = BinaryCodec.get(type) if self.type is not Stream else None
+        self.cache = cache if self.type is not Stream else None
+        self.index = index
+        self.checkpoints = checkpoints
+
+    def _invalidate(self, bucket: str, key: str) -> None:
+        """Invalidate cached value and indexed metadata of an object that has changed."""
+        if self.cache is not None:
+            self.cache.invalidate(bucket, key)
+        if self.index is not None:
+            self.index.invalidate(bucket, key)
+
+    async def _head_object(self, client: Any) -> dict[str, Any]:
+        import botocore.exceptions
+
+        try:
+            return await client.head_object(Bucket=self.bucket, Key=self.key)
+        except botocore.exceptions.ClientError as ce:
+            if ce.response["ResponseMetadata"]["HTTPStatusCode"] == 404:
+                raise NotFoundError
+            raise
+
+    async def _get_cached(self) -> VT:
+        entry = self.cache._get(self.bucket, self.key, self.type)
+        if entry and time.monotonic() < entry.expires:
+            return entry.value
+
+        async def fetch():
+            import botocore.exceptions
+
+            entry = self.cache._get(self.bucket, self.key, self.type)
+            kwargs = {"IfNoneMatch": entry.etag} if entry else {}
+            async with create_client() as client:
+                try:
+                    response = await client.get_object(
+                        Bucket=self.bucket, Key=self.key, **kwargs
+                    )
+                except client.exceptions.NoSuchKey:
+                    self.cache.invalidate(self.bucket, self.key)
+                    raise NotFoundError
+                except botocore.exceptions.ClientError as ce:
+                    if entry and ce.response["ResponseMetadata"]["HTTPStatusCode"] == 304:
+                        entry.expires = time.monotonic() + self.cache.ttl  # not modified
+                        return entry.value
+                    raise
+                async with response["Body"] as body:
+                    content = await body.read()
+            if self.compress:
+                decompress = partial(_decompress, response.get("ContentEncoding"))
+                content = await _process(decompress, content)
+            value = self.codec.decode(content)
+            entry = _CacheEntry(
+                self.type,
+                value,
+                response["ETag"],
+                len(content),
+                time.monotonic() + self.cache.ttl,
+            )
+            self.cache._put(self.bucket, self.key, entry)
+            return value
+
+        # coalesce concurrent reads of the same object
+        return await fondat.aws.client.single_flight.call(
+            ("s3", "get", self.bucket, self.key, self.type), fetch
+        )
 
     @operation
     async def get(self) -> VT:
         try:
-            stream = await ObjectStream.new(self.bucket, self.key)
+            if self.cache is not None:
+                return await self._get_cached()
+            stream = await ObjectStream.new(
+                self.bucket,
+                self.key,
+                transfer=self.transfer,
+                decompress=self.compress is not None,
+            )
             if self.type is Stream:
                 return stream
             async with stream:
-                return self.codec.decode(await Reader(stream).read())
+                # bytes values are not decoded, so must not be read into a bytearray
+                return self.codec.decode(
+                    await _read(stream, preallocate=self.type is not bytes)
+                )
         except fondat.error.Error:
             raise
         except Exception as e:
             _logger.error(e)
             raise InternalServerError from e
 
+    @query
+    async def read_range(
+        self,
+        start: Annotated[int, "position of first byte; if negative, bytes to read from end"],
+        end: Annotated[int | None, "position after last byte to read"] = None,
+    ) -> Stream:
+        """Read a range of bytes from the object as a stream, without decompression."""
+        _range(start, end)  # raise if invalid
+        try:
+            return await ObjectStream.new(
+                self.bucket, self.key, transfer=self.transfer, start=start, end=end
+            )
+        except fondat.error.Error:
+            raise
+        except Exception as e:
+            _logger.error(e)
+            raise InternalServerError from e
+
+    async def select(
+        self,
+        expression: str,
+        input_format: str | dict[str, Any] = "json",
+        output_format: str = "json",
+    ) -> AsyncIterator[Any]:
+        """
+        Filter the content of the object with an S3 Select SQL expression, yielding each
+        record returned as it arrives.
+
+        Parameters:
+        • expression: SQL expression to evaluate
+        • input_format: "csv" (with header row), "json" (JSON lines), "parquet", or input
+          serialization parameters
+        • output_format: "csv" to yield records as lists of strings, or "json" to yield
+          records as decoded JSON values
+
+        Records are decoded as they are received; they are never buffered in full. If the
+        resource compresses content with gzip, the object is decompressed by S3.
+        """
+        if isinstance(input_format, dict):
+            input_serialization = input_format
+        else:
+            try:
+                input_serialization = dict(_SELECT_INPUT[input_format])
+            except KeyError:
+                raise ValueError(f"unsupported input format: {input_format}")
+            if self.compress and input_format != "parquet":
+                if self.compress != "gzip":
+                    raise ValueError(f"S3 Select does not support {self.compress} compression")
+                input_serialization["CompressionType"] = "GZIP"
+        try:
+            output_serialization, decoder = _SELECT_OUTPUT[output_format]
+        except KeyError:
+            raise ValueError(f"unsupported output format: {output_format}")
+        async with create_client() as client:
+            try:
+                response = await client.select_object_content(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    Expression=expression,
+                    ExpressionType="SQL",
+                    InputSerialization=input_serialization,
+                    OutputSerialization=output_serialization,
+                )
+            except client.exceptions.NoSuchKey:
+                raise NotFoundError
+            except Exception as e:
+                _logger.error(e)
+                raise InternalServerError from e
+            payload = response["Payload"]
+            try:
+                with _log_wrap():
+                    decode = decoder()
+                    pending = b""  # line split across events
+                    ended = False
+                    async for event in payload:
+                        if records := event.get("Records"):
+                            *lines, pending = (pending + records["Payload"]).split(b"\n")
+                            for line in lines:
+                                for record in decode(line):
+                                    yield record
+                        elif "End" in event:
+                            ended = True
+                    if pending:
+                        for record in decode(pending):
+                            yield record
+                    if not ended:
+                        raise RuntimeError("select response ended prematurely")
+            finally:
+                payload.close()
+
     async def _basic_upload(self, value: VT) -> bool:
         with _log_wrap():
             if self.type is Stream:
-                if not value.content_length or value.content_length > CHUNK_SIZE:
+                if (
+                    not value.content_length
+                    or value.content_length > self.transfer.min_part_size
+                ):
                     return False
                 async with value as stream:  # automatically close
-                    body = await Reader(stream).read()
+                    body = await _read(stream)
             else:
                 body = self.codec.encode(value)
+            kwargs = {}
+            if self.compress:
+                body = await _process(partial(_compress, self.compress), body)
+                kwargs["ContentEncoding"] = self.compress
             async with create_client() as client:
-                await client.put_object(Bucket=self.bucket, Key=self.key, Body=body)
+                await client.put_object(Bucket=self.bucket, Key=self.key, Body=body, **kwargs)
         return True
 
-    async def _multipart_upload(self, value: VT):
-        upload_id = None
+    async def _save(self, checkpoint: UploadCheckpoint) -> None:
+        await self.checkpoints[f"{self.bucket}/{self.key}"].put(
+            UploadCheckpoint(checkpoint.upload_id, dict(checkpoint.parts))
+        )
+
+    async def _resume(self, client: Any) -> UploadCheckpoint | None:
+        """Return checkpoint of upload to resume, with parts listed as uploaded."""
         try:
-            async with create_client() as client:
-                async with Reader(value) as reader:  # automatically close
-                    mpu = await client.create_multipart_upload(
+            checkpoint = await self.checkpoints[f"{self.bucket}/{self.key}"].get()
+        except NotFoundError:
+            return None
+        uploaded = {}
+        kwargs = {}
+        try:
+            while True:
+                response = await client.list_parts(
+                    Bucket=self.bucket, Key=self.key, UploadId=checkpoint.upload_id, **kwargs
+                )
+                for part in response.get("Parts", ()):
+                    uploaded[part["PartNumber"]] = part["ETag"]
+                if not response.get("IsTruncated"):
+                    break
+                kwargs["PartNumberMarker"] = response["NextPartNumberMarker"]
+        except client.exceptions.NoSuchUpload:
+            return None  # completed or aborted
+        checkpoint.parts = uploaded  # includes any uploaded after last checkpoint saved
+        return checkpoint
+
+    async def _uploaded(
+        self, checkpoint: UploadCheckpoint, number: int, etag: str, saving: asyncio.Lock
+    ) -> None:
+        """Record an uploaded part in the checkpoint, saving it if checkpoints are stored."""
+        checkpoint.parts[number] = etag
+        if self.checkpoints is not None:
+            async with saving:  # latest parts are always saved last
+                await self._save(checkpoint)
+
+    async def _upload_parts(
+        self,
+        client: Any,
+        checkpoint: UploadCheckpoint,
+        stream: Stream,
+        content_length: int | None,
+    ) -> list[str]:
+        """Upload parts concurrently as they are read; return the ETag of each part."""
+        in_flight = asyncio.Semaphore(self.transfer.concurrency)
+        reader = _BufferReader(stream)
+        pool = _BufferPool()  # part buffers are reused once uploaded
+        saving = asyncio.Lock()
+
+        async def upload_part(number: int, chunk: bytearray) -> str:
+            try:
+                etag = checkpoint.parts.get(number)
+                if etag is not None and etag == await _process(_etag, chunk):
+                    return etag  # same content uploaded before upload was interrupted
+                async with in_flight:
+                    part = await client.upload_part(  # each part is retried individually
                         Bucket=self.bucket,
                         Key=self.key,
+                        UploadId=checkpoint.upload_id,
+                        PartNumber=number,
+                        Body=chunk,
+                        ContentLength=len(chunk),
                     )
-                    upload_id = mpu["UploadId"]
-                    etags = []
-                    while chunk := await reader.read(CHUNK_SIZE):
-                        part = await client.upload_part(
-                            Bucket=self.bucket,
-                            Key=self.key,
-                            UploadId=upload_id,
-                            PartNumber=len(etags) + 1,
-                            Body=chunk,
-                            ContentLength=len(chunk),
-                        )
-                        etags.append(part["ETag"])
-                    await client.complete_multipart_upload(
+                await self._uploaded(checkpoint, number, part["ETag"], saving)
+                return part["ETag"]
+            finally:
+                pool.put(chunk)
+
+        async def parts() -> AsyncIterator[tuple[int, bytearray]]:
+            number = 1
+            while True:
+                chunk = pool.get(self.transfer.part_size(content_length, number))
+                if (count := await reader.readinto(chunk)) < len(chunk):
+                    del chunk[count:]  # last part
+                if not chunk:
+                    break
+                yield number, chunk
+                number += 1
+
+        # parts are read only as buffers are available, to bound read-ahead
+        buffers = self.transfer.concurrency + self.transfer.read_ahead
+        return await _run_concurrently(upload_part, parts(), buffers)
+
+    async def _multipart(
+        self,
+        upload_parts: Callable[[Any, UploadCheckpoint], Awaitable[list[str]]],
+        content_length: int | None,
+        **kwargs,
+    ) -> None:
+        """
+        Perform a multipart upload, resuming it from a stored checkpoint if possible.
+
+        Parameters:
+        • upload_parts: coroutine function to upload parts and return the ETag of each
+        • content_length: length of content being uploaded, or None if unknown
+        • kwargs: keyword arguments to create the multipart upload
+        """
+        upload_id = None
+        saved = False  # checkpoint stored, so upload can be resumed rather than aborted
+        try:
+            if content_length is not None:
+                self.transfer.part_size(content_length, 1)  # raise if too large
+            async with create_client() as client:
+                checkpoint = None
+                if self.checkpoints is not None:
+                    checkpoint = await self._resume(client)
+                    saved = checkpoint is not None
+                if checkpoint is None:
+                    mpu = await client.create_multipart_upload(
                         Bucket=self.bucket,
                         Key=self.key,
-                        UploadId=upload_id,
-                        MultipartUpload={
-                            "Parts": [
-                                {
-                                    "PartNumber": n + 1,
-                                    "ETag": etags[n],
-                                }
-                                for n in range(len(etags))
-                            ]
-                        },
+                        **kwargs,
                     )
+                    checkpoint = UploadCheckpoint(upload_id=mpu["UploadId"], parts={})
+                    upload_id = checkpoint.upload_id
+                    if self.checkpoints is not None:
+                        await self._save(checkpoint)
+                        saved = True
+                upload_id = checkpoint.upload_id
+                etags = await upload_parts(client, checkpoint)
+                await client.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=upload_id,
+                    MultipartUpload={
+                        "Parts": [
+                            {
+                                "PartNumber": n + 1,
+                                "ETag": etags[n],
+                            }
+                            for n in range(len(etags))
+                        ]
+                    },
+                )
+            if self.checkpoints is not None:
+                with suppress(Exception):  # a stale checkpoint is ignored when resuming
+                    await self.checkpoints[f"{self.bucket}/{self.key}"].delete()
         except Exception as e:
-            if upload_id:  # attempt to about upload if created
+            if upload_id and not saved:  # attempt to abort upload if created
                 with suppress(Exception):
                     await client.abort_multipart_upload(
                         Bucket=self.bucket,
@@ -208,16 +1319,316 @@ class ObjectResource(Generic[VT]):
             _logger.error(e)
             raise InternalServerError from e
 
+    async def _multipart_upload(self, value: VT):
+        kwargs = {}
+        if self.compress:  # compressed length is unknown until read
+            value = _CompressedStream(value, self.compress)
+            kwargs["ContentEncoding"] = self.compress
+        content_length = value.content_length
+
+        async def upload_parts(client: Any, checkpoint: UploadCheckpoint) -> list[str]:
+            return await self._upload_parts(client, checkpoint, value, content_length)
+
+        async with value:  # automatically close
+            await self._multipart(upload_parts, content_length, **kwargs)
+
+    async def _upload_mapped(
+        self, client: Any, checkpoint: UploadCheckpoint, view: memoryview
+    ) -> list[str]:
+        """Upload parts of a memory-mapped file concurrently; return the ETag of each part."""
+        saving = asyncio.Lock()
+
+        async def upload_part(number: int, first: int, last: int) -> str:
+            with _MappedPart(view[first:last]) as body:  # released once uploaded
+                etag = checkpoint.parts.get(number)
+                if etag is not None and etag == await _process(_etag, body._view):
+                    return etag  # same content uploaded before upload was interrupted
+                part = await client.upload_part(  # retried by rewinding body
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=checkpoint.upload_id,
+                    PartNumber=number,
+                    Body=body,
+                    ContentLength=last - first,
+                )
+            await self._uploaded(checkpoint, number, part["ETag"], saving)
+            return part["ETag"]
+
+        size = self.transfer.part_size(len(view), 1)
+        parts = (
+            (number, offset, min(offset + size, len(view)))
+            for number, offset in enumerate(range(0, len(view), size), 1)
+        )
+        return await _run_concurrently(upload_part, parts, self.transfer.concurrency)
+
     @operation
     async def put(self, value: VT) -> None:
-        if not await self._basic_upload(value):
-            await self._multipart_upload(value)
+        try:
+            if not await self._basic_upload(value):
+                await self._multipart_upload(value)
+        finally:
+            self._invalidate(self.bucket, self.key)
 
     @operation
     async def delete(self) -> None:
-        async with create_client() as client:
-            with _log_wrap():
-                await client.delete_object(Bucket=self.bucket, Key=self.key)
+        try:
+            async with create_client() as client:
+                with _log_wrap():
+                    await client.delete_object(Bucket=self.bucket, Key=self.key)
+        finally:
+            self._invalidate(self.bucket, self.key)
+
+    @query
+    async def head(self) -> ObjectMetadata:
+        """
+        Return metadata of the object, without reading its content. If the object is in the
+        metadata index, no request is made.
+        """
+        if self.index is not None and (metadata := self.index._get(self.bucket, self.key)):
+            return metadata
+        try:
+            async with create_client() as client:
+                response = await self._head_object(client)
+        except fondat.error.Error:
+            raise
+        except Exception as e:
+            _logger.error(e)
+            raise InternalServerError from e
+        metadata = ObjectMetadata(
+            size=response["ContentLength"],
+            etag=response["ETag"],
+            last_modified=response["LastModified"],
+            content_type=response.get("ContentType"),
+            content_encoding=response.get("ContentEncoding"),
+            metadata=response.get("Metadata", {}),
+        )
+        if self.index is not None:
+            self.index._put(self.bucket, self.key, metadata)
+        return metadata
+
+    async def copy_to(self, bucket: str, key: str) -> None:
+        """
+        Copy the object to another location, without transferring its content through this
+        process.
+
+        Parameters:
+        • bucket: name of bucket to copy object to
+        • key: key of object to copy to
+
+        An object up to the minimum part size is copied in a single request; a larger object is
+        copied in byte ranges, concurrently. Content type, content encoding and metadata are
+        copied with the object. The copy fails if the object changes while being copied.
+        """
+        try:
+            async with create_client() as client:
+                source = await self._head_object(client)
+                copy_source = {"Bucket": self.bucket, "Key": self.key}
+                if source["ContentLength"] <= self.transfer.min_part_size:
+                    await client.copy_object(
+                        Bucket=bucket,
+                        Key=key,
+                        CopySource=copy_source,
+                        CopySourceIfMatch=source["ETag"],
+                    )
+                else:
+                    await self._multipart_copy(client, source, bucket, key)
+        except fondat.error.Error:
+            raise
+        except Exception as e:
+            _logger.error(e)
+            raise InternalServerError from e
+        finally:
+            self._invalidate(bucket, key)
+
+    async def _multipart_copy(
+        self, client: Any, source: dict[str, Any], bucket: str, key: str
+    ) -> None:
+        size = source["ContentLength"]
+        kwargs = {"ContentType": source["ContentType"], "Metadata": source.get("Metadata", {})}
+        if encoding := source.get("ContentEncoding"):
+            kwargs["ContentEncoding"] = encoding
+        mpu = await client.create_multipart_upload(Bucket=bucket, Key=key, **kwargs)
+        upload_id = mpu["UploadId"]
+
+        async def copy_part(number: int, first: int, last: int) -> str:
+            part = await client.upload_part_copy(  # each part is retried individually
+                Bucket=bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=number,
+                CopySource={"Bucket": self.bucket, "Key": self.key},
+                CopySourceRange=f"bytes={first}-{last}",
+                CopySourceIfMatch=source["ETag"],  # fail if object changes during copy
+            )
+            return part["CopyPartResult"]["ETag"]
+
+        try:
+            part_size = self.transfer.part_size(size, 1)
+            parts = (
+                (number, first, min(first + part_size, size) - 1)
+                for number, first in enumerate(range(0, size, part_size), 1)
+            )
+            etags = await _run_concurrently(copy_part, parts, self.transfer.concurrency)
+            await client.complete_multipart_upload(
+                Bucket=bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"PartNumber": number, "ETag": etag}
+                        for number, etag in enumerate(etags, 1)
+                    ]
+                },
+            )
+        except:
+            with suppress(Exception):
+                await client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+            raise
+
+    async def upload_file(self, path: str | os.PathLike) -> None:
+        """
+        Upload the content of a file to the object.
+
+        Parameters:
+        • path: path of file to upload
+
+        The file is memory-mapped, and its parts are sent directly from the mapping; no part is
+        read into a buffer. A part that fails transiently is retried by sending it again from
+        the mapping. A file up to the minimum part size is uploaded in a single request. If
+        compress is specified, a larger file is compressed as it is read instead.
+
+        The file must not change while it is being uploaded.
+        """
+        try:
+            if (
+                self.compress is not None
+                and os.stat(path).st_size > self.transfer.min_part_size
+            ):
+                from fondat.file import FileStream
+                from pathlib import Path
+
+                await self._multipart_upload(
+                    FileStream(Path(path))
+                )  # compressed length unknown
+                return
+            with _mapped(path) as view:
+                if len(view) > self.transfer.min_part_size:
+                    await self._multipart(partial(self._upload_mapped, view=view), len(view))
+                    return
+                kwargs = {}
+                if self.compress:
+                    body = await _process(partial(_compress, self.compress), view)
+                    kwargs["ContentEncoding"] = self.compress
+                else:
+                    body = _MappedPart(view[:])
+                try:
+                    async with create_client() as client:
+                        await client.put_object(
+                            Bucket=self.bucket, Key=self.key, Body=body, **kwargs
+                        )
+                finally:
+                    if isinstance(body, _MappedPart):
+                        body.close()
+        except fondat.error.Error:
+            raise
+        except Exception as e:
+            _logger.error(e)
+            raise InternalServerError from e
+        finally:
+            self._invalidate(self.bucket, self.key)
+
+    async def download_file(self, path: str | os.PathLike) -> None:
+        """
+        Download the content of the object to a file.
+
+        Parameters:
+        • path: path of file to write content to
+
+        The file is preallocated, and the object is fetched in byte ranges of the transfer
+        range size, with up to the transfer concurrency of ranges requested concurrently; each
+        range is written into place as it is received. If compress is specified and content is
+        compressed with a supported algorithm, it is fetched in a single request and
+        decompressed as it is written.
+
+        Content is written to a temporary file in the same directory, which replaces the file
+        once the download completes. The download fails if the object changes while being
+        downloaded.
+        """
+        directory, name = os.path.split(os.fspath(path))
+        temp = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}")
+        try:
+            fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            try:
+                try:
+                    async with create_client() as client:
+                        source = await self._head_object(client)
+                        encoding = source.get("ContentEncoding")
+                        if self.compress is not None and _decompressor(encoding):
+                            await self._download_decompressed(client, fd, source)
+                        else:
+                            await self._download_ranges(client, fd, source)
+                finally:
+                    os.close(fd)
+                os.replace(temp, path)
+            except:
+                with suppress(OSError):
+                    os.unlink(temp)
+                raise
+        except fondat.error.Error:
+            raise
+        except Exception as e:
+            _logger.error(e)
+            raise InternalServerError from e
+
+    async def _download_ranges(self, client: Any, fd: int, source: dict[str, Any]) -> None:
+        size = source["ContentLength"]
+        os.ftruncate(fd, size)  # preallocate
+
+        async def download_range(first: int, last: int) -> None:
+            response = await client.get_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                Range=f"bytes={first}-{last}",
+                IfMatch=source["ETag"],  # fail if object changes during download
+            )
+            async with response["Body"] as body:
+                while chunk := await body.read(CHUNK_SIZE):
+                    await _process(partial(_pwrite, fd, first), chunk)
+                    first += len(chunk)
+
+        range_size = self.transfer.range_size
+        ranges = (
+            (first, min(first + range_size, size) - 1) for first in range(0, size, range_size)
+        )
+        await _run_concurrently(download_range, ranges, self.transfer.concurrency)
+
+    async def _download_decompressed(
+        self, client: Any, fd: int, source: dict[str, Any]
+    ) -> None:
+        decompressor = _decompressor(source["ContentEncoding"])
+        response = await client.get_object(
+            Bucket=self.bucket, Key=self.key, IfMatch=source["ETag"]
+        )
+        offset = 0
+        async with response["Body"] as body:
+            while chunk := await body.read(CHUNK_SIZE):
+                chunk = await _process(decompressor.decompress, chunk)
+                await _process(partial(_pwrite, fd, offset), chunk)
+                offset += len(chunk)
+        _pwrite(fd, offset, decompressor.flush())
+
+
+def _range(start: int, end: int | None) -> str | None:
+    """Return the HTTP range specification to read bytes, or None to read all bytes."""
+    if start < 0:
+        if end is not None:
+            raise ValueError("end cannot be specified with negative start")
+        return f"bytes={start}"
+    if end is not None:
+        if end <= start:
+            raise ValueError("end must be greater than start")
+        return f"bytes={start}-{end - 1}"
+    return f"bytes={start}-" if start else None
 
 
 class ObjectStream(Stream):
@@ -227,42 +1638,159 @@ class ObjectStream(Stream):
         raise TypeError("create using 'new' asynchronous class method")
 
     @classmethod
-    async def new(cls, bucket: str, key: str) -> "ObjectStream":
+    async def new(
+        cls,
+        bucket: str,
+        key: str,
+        *,
+        transfer: TransferConfig | None = None,
+        start: int = 0,
+        end: int | None = None,
+        decompress: bool = False,
+    ) -> "ObjectStream":
         """
         Create a new object stream object.
 
         Parameters:
         • bucket: name of bucket where object resides
         • key: object key
+        • transfer: configuration of ranged transfers
+        • start: position of first byte to read; if negative, number of bytes to read from end
+        • end: position after last byte to read, or None to read to end of object
+        • decompress: decompress content if its content encoding is a supported algorithm
+
+        If the transfer configuration has a download window greater than 1, the object is
+        fetched in byte ranges, with up to that many ranges requested concurrently. A read
+        from the end of the object is fetched in a single request.
+
+        The stream holds a connection of the pooled S3 client until it is read or closed;
+        see fondat.aws.client.MAX_POOL_CONNECTIONS.
         """
+        range = _range(start, end)
+        transfer = transfer or TransferConfig()
+        ranged = transfer.download_window > 1 and start >= 0
         self = ObjectStream.__new__(ObjectStream)
+        self._bucket = bucket
+        self._key = key
+        self._transfer = transfer
+        self._body = None
+        self._ranges = None
+        self._decompressor = None
         self._context = create_client()
-        client = await self._context.__aenter__()
+        self._client = await self._context.__aenter__()
         try:
-            try:
-                response = await client.get_object(Bucket=bucket, Key=key)
-            except client.exceptions.NoSuchKey:
-                raise NotFoundError
-            except Exception as e:
-                _logger.error(e)
-                raise InternalServerError from e
+            with self._wrap():
+                if ranged:
+                    last = start + transfer.range_size - 1
+                    range = f"bytes={start}-{last if end is None else min(last, end - 1)}"
+                response = await self._get_object(range)
+                content_length = response["ContentLength"]
+                if response["Body"] is None:  # range not satisfiable
+                    self._ranges = deque()
+                elif ranged and (content_range := response.get("ContentRange")):
+                    size = int(content_range.rsplit("/", 1)[1])
+                    self._etag = response["ETag"]
+                    self._ranges = deque([asyncio.create_task(self._read(response))])
+                    self._offset = start + content_length
+                    self._end = size if end is None else min(end, size)
+                    content_length = self._end - start
+                    self._schedule()
+                else:
+                    self._body = response["Body"]
+                if decompress and response["Body"] is not None:
+                    self._decompressor = _decompressor(response.get("ContentEncoding"))
+                    if self._decompressor:
+                        content_length = None  # unknown until decompressed
         except:
             with suppress(Exception):
                 await self.close()
             raise
         Stream.__init__(
-            self, content_type=response["ContentType"], content_length=response["ContentLength"]
+            self, content_type=response["ContentType"], content_length=content_length
         )
-        self._body = response["Body"]
         return self
 
+    @contextmanager
+    def _wrap(self):
+        try:
+            yield
+        except self._client.exceptions.NoSuchKey:
+            raise NotFoundError
+        except fondat.error.Error:
+            raise
+        except Exception as e:
+            _logger.error(e)
+            raise InternalServerError from e
+
+    async def _get_object(self, range: str | None) -> dict[str, Any]:
+        """Get object, or describe it with no body if range is not satisfiable."""
+        import botocore.exceptions
+
+        kwargs = {"Range": range} if range else {}
+        try:
+            return await self._client.get_object(Bucket=self._bucket, Key=self._key, **kwargs)
+        except botocore.exceptions.ClientError as ce:
+            if not range or ce.response.get("Error", {}).get("Code") != "InvalidRange":
+                raise
+        response = await self._client.head_object(Bucket=self._bucket, Key=self._key)
+        return response | {"ContentLength": 0, "Body": None}  # empty, or start beyond end
+
+    @staticmethod
+    async def _read(response: dict[str, Any]) -> bytes:
+        async with response["Body"] as body:
+            return await body.read()
+
+    async def _get_range(self, first: int, last: int) -> bytes:
+        response = await self._client.get_object(
+            Bucket=self._bucket,
+            Key=self._key,
+            Range=f"bytes={first}-{last}",
+            IfMatch=self._etag,  # fail if object changes during read
+        )
+        return await self._read(response)
+
+    def _schedule(self) -> None:
+        """Request ranges until the download window is full."""
+        while len(self._ranges) < self._transfer.download_window and self._offset < self._end:
+            last = min(self._offset + self._transfer.range_size, self._end) - 1
+            self._ranges.append(asyncio.create_task(self._get_range(self._offset, last)))
+            self._offset = last + 1
+
     async def __anext__(self) -> bytes:
+        while self._decompressor:
+            try:
+                chunk = await self._next()
+            except StopAsyncIteration:
+                chunk, self._decompressor = self._decompressor.flush(), None
+            else:
+                with self._wrap():
+                    chunk = await _process(self._decompressor.decompress, chunk)
+            if chunk:
+                return chunk
+        return await self._next()
+
+    async def _next(self) -> bytes:
         if self._context:
-            if chunk := await self._body.read(CHUNK_SIZE):
+            if self._ranges is not None:
+                if self._ranges:
+                    with self._wrap():
+                        chunk = await self._ranges.popleft()
+                    self._schedule()
+                    return chunk
+            elif chunk := await self._body.read(CHUNK_SIZE):
                 return chunk
         raise StopAsyncIteration
 
     async def close(self):
+        self._decompressor = None
+        if self._ranges:
+            for task in self._ranges:
+                task.cancel()
+            await asyncio.gather(*self._ranges, return_exceptions=True)
+            self._ranges.clear()
+        if self._body is not None:
+            self._body.close()
+            self._body = None
         if self._context:
             await self._context.__aexit__(None, None, None)
             self._context = None
@@ -5,7 +5,7 @@ import logging
 
 from collections.abc import Iterable
 from contextlib import asynccontextmanager, suppress
-from fondat.aws.client import Config, wrap_client_error
+from fondat.aws.client import Config, SingleFlight, wrap_client_error
 from fondat.data import datacls
 from fondat.error import NotFoundError
 from fondat.http import AsBody, InBody
@@ -36,6 +36,8 @@ def secrets_resource(
     • cache: time in seconds to cache secrets
     • config: client configuration
     • policies: security policies to apply to all operations
+
+    Concurrent gets of the same secret are coalesced into a single request.
     """
 
     @asynccontextmanager
@@ -43,6 +45,8 @@ def secrets_resource(
         async with fondat.aws.client.create_client("secretsmanager", config=config) as client:
             yield client
 
+    flight = SingleFlight()
+
     cache = (
         MemoryResource(
             key_type=str,
@@ -80,13 +84,20 @@ def secrets_resource(
                 kwargs["VersionId"] = version_id
             if version_stage is not None:
                 kwargs["VersionStage"] = version_stage
-            async with create_client() as client:
-                with wrap_client_error():
-                    value = await client.get_secret_value(**kwargs)
-                secret = Secret(value=value.get("SecretString") or value.get("SecretBinary"))
-                if cache:
-                    await cache[self.name].put(secret)
-                return secret
+
+            async def get_secret_value():
+                async with create_client() as client:
+                    with wrap_client_error():
+                        value = await client.get_secret_value(**kwargs)
+                    secret = Secret(
+                        value=value.get("SecretString") or value.get("SecretBinary")
+                    )
+                    if cache:
+                        await cache[self.name].put(secret)
+                    return secret
+
+            # coalesce concurrent gets of the same secret into one request
+            return await flight.call((self.name, version_id, version_stage), get_secret_value)
 
         @operation(policies=policies)
         async def put(self, secret: Annotated[Secret, AsBody]):
@@ -0,0 +1,220 @@
+"""
+In-process fake AWS backend, for testing and benchmarking without access to AWS.
+
+The backend stands in for the service operations invoked by this library: S3 objects,
+listing and multipart uploads; the Athena query lifecycle and results; Secrets Manager;
+CloudWatch metric data; and the Bedrock Agents control plane and runtime, including event
+streams. Clients are genuine aiobotocore clients, so parameters are validated against the
+service model and errors are raised as botocore exceptions; operations are answered in
+process rather than sent over the network.
+
+Example:
+
+    backend = Backend(latency=0.01, throttle=0.05)
+    backend.s3.buckets["bucket"] = {}
+    with backend.install():
+        await BucketResource("bucket")["key"].put(b"value")
+"""
+
+import asyncio
+import fondat.aws.client
+import random
+
+from collections import Counter, deque
+from collections.abc import Callable
+from contextlib import asynccontextmanager, contextmanager
+from fondat.aws.client import ClientPool, Config
+from fondat.aws.testing.athena import Athena
+from fondat.aws.testing.bedrock import BedrockAgent, BedrockAgentRuntime
+from fondat.aws.testing.cloudwatch import CloudWatch
+from fondat.aws.testing.s3 import S3
+from fondat.aws.testing.secretsmanager import SecretsManager
+from fondat.aws.testing.service import ServiceError
+from typing import Any
+
+
+__all__ = ["Backend", "ServiceError"]
+
+
+_PARAMS = "fondat.aws.testing.params"  # request context key of operation parameters
+
+_THROTTLING = {
+    "s3": ServiceError("SlowDown", "please reduce your request rate", 503),
+}
+
+
+class Backend:
+    """
+    In-process fake AWS backend.
+
+    Parameters and attributes:
+    • latency: time in seconds to delay each operation, or function of service and operation
+      names that returns it
+    • throttle: probability that an operation is throttled
+    • concurrency: maximum operations in flight per service before operations are throttled
+    • seed: seed for random number generator, to make throttling reproducible
+
+    Attributes:
+    • services: fake services, keyed by service name
+    • calls: number of operations invoked, keyed by service and operation names
+
+    Each fake service is also available as an attribute: s3, athena, secretsmanager,
+    cloudwatch, bedrock_agent and bedrock_agent_runtime.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float | Callable[[str, str], float] = 0.0,
+        throttle: float = 0.0,
+        concurrency: int | None = None,
+        seed: int | None = None,
+    ):
+        self.latency = latency
+        self.throttle = throttle
+        self.concurrency = concurrency
+        self.s3 = S3()
+        self.athena = Athena()
+        self.secretsmanager = SecretsManager()
+        self.cloudwatch = CloudWatch()
+        self.bedrock_agent = BedrockAgent()
+        self.bedrock_agent_runtime = BedrockAgentRuntime()
+        self.services: dict[str, Any] = {
+            "s3": self.s3,
+            "athena": self.athena,
+            "secretsmanager": self.secretsmanager,
+            "cloudwatch": self.cloudwatch,
+            "bedrock-agent": self.bedrock_agent,
+            "bedrock-agent-runtime": self.bedrock_agent_runtime,
+        }
+        self.calls: Counter[tuple[str, str]] = Counter()
+        self._random = random.Random(seed)
+        self._in_flight: Counter[str] = Counter()
+        self._errors: deque[tuple[str, str, ServiceError]] = deque()
+        self._session = None
+
+    def fail(
+        self,
+        service_name: str,
+        operation_name: str,
+        code: str,
+        status: int = 400,
+        message: str = "",
+        count: int = 1,
+    ) -> None:
+        """
+        Inject errors in responses to subsequent invocations of an operation.
+
+        Parameters:
+        • service_name: name of service, such as "s3"
+        • operation_name: name of operation, such as "GetObject"
+        • code: error code
+        • status: HTTP status code
+        • message: error message
+        • count: number of invocations to respond to with error
+        """
+        error = ServiceError(code, message, status)
+        self._errors.extend((service_name, operation_name, error) for _ in range(count))
+
+    def _injected_error(self, service_name: str, operation_name: str) -> ServiceError | None:
+        for n, (service, operation, error) in enumerate(self._errors):
+            if service == service_name and operation == operation_name:
+                del self._errors[n]
+                return error
+        if (self.throttle and self._random.random() < self.throttle) or (
+            self.concurrency and self._in_flight[service_name] > self.concurrency
+        ):
+            return _THROTTLING.get(service_name) or ServiceError(
+                "ThrottlingException", "rate exceeded", 400
+            )
+        return None
+
+    async def _invoke(
+        self, service_name: str, operation_name: str, method_name: str, params: dict[str, Any]
+    ) -> tuple[Any, dict[str, Any]]:
+        from aiobotocore.awsrequest import AioAWSResponse
+
+        self.calls[service_name, operation_name] += 1
+        self._in_flight[service_name] += 1
+        try:
+            if error := self._injected_error(service_name, operation_name):
+                raise error
+            latency = (
+                self.latency(service_name, operation_name)
+                if callable(self.latency)
+                else self.latency
+            )
+            if latency:
+                await asyncio.sleep(latency)
+            method = getattr(self.services.get(service_name), method_name, None)
+            if method is None:
+                raise ServiceError(
+                    "InvalidAction", f"{service_name} {operation_name} not supported"
+                )
+            response = method(**params)
+            if asyncio.iscoroutine(response):
+                response = await response
+            status = 200
+        except ServiceError as se:
+            response = {"Error": {"Code": se.code, "Message": se.message}}
+            status = se.status
+        finally:
+            self._in_flight[service_name] -= 1
+        response["ResponseMetadata"] = {"HTTPStatusCode": status, "HTTPHeaders": {}}
+        return AioAWSResponse(None, status, {}, None), response
+
+    def _register(self, client: Any, service_name: str) -> None:
+        method_names = {v: k for k, v in client.meta.method_to_api_mapping.items()}
+
+        def capture(params: dict[str, Any], context: dict[str, Any], **kwargs) -> None:
+            context[_PARAMS] = dict(params)
+
+        async def invoke(model: Any, context: dict[str, Any], **kwargs) -> tuple:
+            params = context.pop(_PARAMS, {})
+            return await self._invoke(
+                service_name, model.name, method_names[model.name], params
+            )
+
+        client.meta.events.register("before-parameter-build", capture)
+        client.meta.events.register("before-call", invoke)
+
+    @asynccontextmanager
+    async def client(
+        self, service_name: str, api_version: str | None = None, config: Config | None = None
+    ):
+        """
+        Open an aiobotocore client whose operations are answered by this backend.
+
+        Parameters:
+        • service_name: the name of the service to access
+        • api_version: the API version to use  [latest]
+        • config: session and client configuration
+        """
+        if self._session is None:
+            from aiobotocore.session import AioSession
+
+            self._session = AioSession()  # caches service models across clients
+        async with self._session.create_client(
+            service_name=service_name,
+            region_name=(config.region_name if config else None) or "us-east-1",
+            api_version=api_version,
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing",
+        ) as client:
+            self._register(client, service_name)
+            yield client
+
+    @contextmanager
+    def install(self):
+        """
+        Return a context manager that answers operations of all clients created with
+        fondat.aws.client.create_client by this backend, until the context is exited.
+        """
+        factory, pool = fondat.aws.client.client_factory, fondat.aws.client.pool
+        fondat.aws.client.client_factory = self.client
+        fondat.aws.client.pool = ClientPool()  # isolate clients of backend
+        try:
+            yield self
+        finally:
+            fondat.aws.client.client_factory = factory
+            fondat.aws.client.pool = pool
@@ -0,0 +1,175 @@
+"""Fake Amazon Athena."""
+
+import re
+import uuid
+
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from fondat.aws.testing.service import ServiceError, paginate
+from typing import Any
+
+
+class Response:
+    """
+    Response to queries that match a pattern.
+
+    Parameters and attributes:
+    • pattern: regular expression to search for in query string
+    • columns: name and Athena type of each result column
+    • rows: result rows; each value is converted to a string, or None for null
+    • error: error message to fail query with
+    """
+
+    def __init__(
+        self,
+        pattern: str,
+        columns: Iterable[tuple[str, str]] = (),
+        rows: Iterable[Iterable[Any]] = (),
+        error: str | None = None,
+    ):
+        self.pattern = re.compile(pattern, re.IGNORECASE | re.DOTALL)
+        self.columns = list(columns)
+        self.rows = [[None if v is None else str(v) for v in row] for row in rows]
+        self.error = error
+
+
+class Athena:
+    """
+    Fake Athena service.
+
+    Parameters and attributes:
+    • polls: number of times a query execution is reported as running before it completes
+
+    Attributes:
+    • executions: query executions, keyed by query execution ID
+
+    Queries succeed with an empty result, unless a matching response is registered with
+    the `respond` method.
+    """
+
+    def __init__(self, polls: int = 0):
+        self.polls = polls
+        self.executions: dict[str, dict[str, Any]] = {}
+        self.responses: list[Response] = []
+        self._pending: dict[str, int] = {}
+        self._results: dict[str, Response] = {}
+
+    def respond(
+        self,
+        pattern: str,
+        columns: Iterable[tuple[str, str]] = (),
+        rows: Iterable[Iterable[Any]] = (),
+        error: str | None = None,
+    ) -> None:
+        """
+        Register a response to queries that match a pattern. The most recently registered
+        matching response is used.
+
+        Parameters:
+        • pattern: regular expression to search for in query string
+        • columns: name and Athena type of each result column
+        • rows: result rows; each value is converted to a string, or None for null
+        • error: error message to fail query with
+        """
+        self.responses.insert(0, Response(pattern, columns, rows, error))
+
+    def _execution(self, id: str) -> dict[str, Any]:
+        try:
+            return self.executions[id]
+        except KeyError:
+            raise ServiceError("InvalidRequestException", f"query execution {id} not found")
+
+    def start_query_execution(
+        self,
+        QueryString: str,
+        QueryExecutionContext: dict[str, str] | None = None,
+        ResultConfiguration: dict[str, str] | None = None,
+        WorkGroup: str = "primary",
+        **kwargs,
+    ) -> dict[str, Any]:
+        id = str(uuid.uuid4())
+        response = next(
+            (r for r in self.responses if r.pattern.search(QueryString)), Response("")
+        )
+        self.executions[id] = {
+            "QueryExecutionId": id,
+            "Query": QueryString,
+            "StatementType": "DML",
+            "QueryExecutionContext": QueryExecutionContext or {},
+            "ResultConfiguration": ResultConfiguration or {},
+            "WorkGroup": WorkGroup,
+            "Status": {
+                "State": "QUEUED",
+                "SubmissionDateTime": datetime.now(tz=timezone.utc),
+            },
+        }
+        self._pending[id] = self.polls
+        self._results[id] = response
+        return {"QueryExecutionId": id}
+
+    def get_query_execution(self, QueryExecutionId: str, **kwargs) -> dict[str, Any]:
+        execution = self._execution(QueryExecutionId)
+        status = execution["Status"]
+        if status["State"] in {"QUEUED", "RUNNING"}:
+            if self._pending[QueryExecutionId] > 0:
+                self._pending[QueryExecutionId] -= 1
+                status["State"] = "RUNNING"
+            elif error := self._results[QueryExecutionId].error:
+                status["State"] = "FAILED"
+                status["AthenaError"] = {"ErrorCategory": 2, "ErrorMessage": error}
+            else:
+                status["State"] = "SUCCEEDED"
+            if status["State"] in {"SUCCEEDED", "FAILED"}:
+                status["CompletionDateTime"] = datetime.now(tz=timezone.utc)
+        return {"QueryExecution": execution}
+
+    def list_query_executions(
+        self,
+        WorkGroup: str | None = None,
+        MaxResults: int | None = None,
+        NextToken: str | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        ids = [
+            id
+            for id, execution in reversed(self.executions.items())
+            if WorkGroup is None or execution["WorkGroup"] == WorkGroup
+        ]
+        ids, token = paginate(ids, NextToken, MaxResults, 50)
+        response = {"QueryExecutionIds": ids}
+        if token:
+            response["NextToken"] = token
+        return response
+
+    def get_query_results(
+        self,
+        QueryExecutionId: str,
+        NextToken: str | None = None,
+        MaxResults: int | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        execution = self._execution(QueryExecutionId)
+        if execution["Status"]["State"] != "SUCCEEDED":
+            raise ServiceError("InvalidRequestException", "query has not yet finished")
+        result = self._results[QueryExecutionId]
+        names = [name for name, _ in result.columns]
+        rows = [names, *result.rows] if names else result.rows  # first row is header
+        rows, token = paginate(rows, NextToken, MaxResults)
+        response = {
+            "UpdateCount": 0,
+            "ResultSet": {
+                "Rows": [
+                    {"Data": [{} if v is None else {"VarCharValue": v} for v in row]}
+                    for row in rows
+                ],
+                "ResultSetMetadata": {
+                    "ColumnInfo": [
+                        {"CatalogName": "hive", "Name": name, "Label": name, "Type": type}
+                        for name, type in result.columns
+                    ]
+                },
+            },
+        }
+        if token:
+            response["NextToken"] = token
+        return response
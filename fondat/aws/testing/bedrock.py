@@ -0,0 +1,319 @@
+"""Fake Amazon Bedrock Agents control plane and runtime."""
+
+import uuid
+
+from collections.abc import Callable
+from datetime import datetime, timezone
+from fondat.aws.testing.service import EventStream, ServiceError, paginate
+from typing import Any
+
+
+# operation: (collection, identifying parameters, response key or None if not wrapped)
+_GET_OPERATIONS = {
+    "get_agent": ("agents", ("agentId",), "agent"),
+    "get_agent_version": ("agent_versions", ("agentId", "agentVersion"), "agentVersion"),
+    "get_agent_alias": ("agent_aliases", ("agentId", "agentAliasId"), "agentAlias"),
+    "get_agent_action_group": (
+        "action_groups",
+        ("agentId", "agentVersion", "actionGroupId"),
+        "agentActionGroup",
+    ),
+    "get_agent_collaborator": (
+        "collaborators",
+        ("agentId", "agentVersion", "collaboratorId"),
+        "agentCollaborator",
+    ),
+    "get_flow": ("flows", ("flowIdentifier",), None),
+    "get_flow_version": ("flow_versions", ("flowIdentifier", "flowVersion"), None),
+    "get_flow_alias": ("flow_aliases", ("flowIdentifier", "aliasIdentifier"), None),
+    "get_prompt": ("prompts", ("promptIdentifier",), None),
+}
+
+# operation: (collection, identifying parameters of parent, response items key)
+_LIST_OPERATIONS = {
+    "list_agents": ("agents", (), "agentSummaries"),
+    "list_agent_versions": ("agent_versions", ("agentId",), "agentVersionSummaries"),
+    "list_agent_aliases": ("agent_aliases", ("agentId",), "agentAliasSummaries"),
+    "list_agent_action_groups": (
+        "action_groups",
+        ("agentId", "agentVersion"),
+        "actionGroupSummaries",
+    ),
+    "list_agent_collaborators": (
+        "collaborators",
+        ("agentId", "agentVersion"),
+        "agentCollaboratorSummaries",
+    ),
+    "list_flows": ("flows", (), "flowSummaries"),
+    "list_flow_versions": ("flow_versions", ("flowIdentifier",), "flowVersionSummaries"),
+    "list_flow_aliases": ("flow_aliases", ("flowIdentifier",), "flowAliasSummaries"),
+    "list_prompts": ("prompts", (), "promptSummaries"),
+}
+
+
+def _now() -> datetime:
+    return datetime.now(tz=timezone.utc)
+
+
+class BedrockAgent:
+    """
+    Fake Bedrock Agents control plane service.
+
+    Attributes:
+    • collections: items in each collection, keyed by identifying parameter values
+
+    Items are returned as stored; they should have the shape of the corresponding API
+    response. Use the `add` method to store items.
+    """
+
+    def __init__(self):
+        self.collections: dict[str, dict[tuple[str, ...], dict[str, Any]]] = {
+            collection: {} for collection, _, _ in _GET_OPERATIONS.values()
+        }
+
+    def add(self, collection: str, key: str | tuple[str, ...], item: dict[str, Any]) -> None:
+        """
+        Store an item in a collection.
+
+        Parameters:
+        • collection: name of collection, such as "agents" or "flow_aliases"
+        • key: identifying parameter values of item, such as (agent_id, agent_version)
+        • item: item to store
+        """
+        key = (key,) if isinstance(key, str) else tuple(key)
+        self.collections[collection][key] = item
+
+    def _get(self, collection: str, names: tuple[str, ...], wrap: str | None, **kwargs):
+        key = tuple(kwargs.get(name) for name in names)
+        try:
+            item = self.collections[collection][key]
+        except KeyError:
+            raise ServiceError("ResourceNotFoundException", f"{key} not found", 404)
+        return {wrap: dict(item)} if wrap else dict(item)
+
+    def _list(self, collection: str, names: tuple[str, ...], items_key: str, **kwargs):
+        parent = tuple(kwargs.get(name) for name in names)
+        items = [
+            item
+            for key, item in self.collections[collection].items()
+            if key[: len(parent)] == parent
+        ]
+        items, token = paginate(items, kwargs.get("nextToken"), kwargs.get("maxResults"))
+        response = {items_key: [dict(item) for item in items]}
+        if token:
+            response["nextToken"] = token
+        return response
+
+    def __getattr__(self, name: str) -> Callable[..., dict[str, Any]]:
+        if spec := _GET_OPERATIONS.get(name):
+            return lambda **kwargs: self._get(*spec, **kwargs)
+        if spec := _LIST_OPERATIONS.get(name):
+            return lambda **kwargs: self._list(*spec, **kwargs)
+        raise AttributeError(name)
+
+
+def _echo_agent(params: dict[str, Any]) -> str:
+    return params.get("inputText", "")
+
+
+def _echo_flow(params: dict[str, Any]) -> Any:
+    return params["inputs"][0]["content"]["document"]
+
+
+class BedrockAgentRuntime:
+    """
+    Fake Bedrock Agents runtime service.
+
+    Parameters and attributes:
+    • agent_handler: function that returns agent completion text from invocation parameters
+    • flow_handler: function that returns flow output document from invocation parameters
+
+    Attributes:
+    • sessions: sessions, keyed by session ID
+    • invocations: invocations, keyed by session ID and invocation ID
+    • steps: invocation steps, keyed by session ID, invocation ID and step ID
+    • memory: memory contents, keyed by agent ID, agent alias ID and memory ID
+
+    By default, agents respond with the input text, and flows output their input document.
+    """
+
+    def __init__(
+        self,
+        agent_handler: Callable[[dict[str, Any]], str] = _echo_agent,
+        flow_handler: Callable[[dict[str, Any]], Any] = _echo_flow,
+    ):
+        self.agent_handler = agent_handler
+        self.flow_handler = flow_handler
+        self.sessions: dict[str, dict[str, Any]] = {}
+        self.invocations: dict[tuple[str, str], dict[str, Any]] = {}
+        self.steps: dict[tuple[str, str, str], dict[str, Any]] = {}
+        self.memory: dict[tuple[str, str, str], list[dict[str, Any]]] = {}
+
+    def invoke_agent(
+        self, agentId: str, agentAliasId: str, sessionId: str, **kwargs
+    ) -> dict[str, Any]:
+        text = self.agent_handler({"agentId": agentId, "sessionId": sessionId, **kwargs})
+        response = {
+            "completion": EventStream([{"chunk": {"bytes": text.encode()}}]),
+            "contentType": "application/json",
+            "sessionId": sessionId,
+        }
+        if memory_id := kwargs.get("memoryId"):
+            response["memoryId"] = memory_id
+        return response
+
+    def invoke_flow(
+        self, flowIdentifier: str, flowAliasIdentifier: str, inputs: list, **kwargs
+    ) -> dict[str, Any]:
+        params = {"flowIdentifier": flowIdentifier, "inputs": inputs, **kwargs}
+        document = self.flow_handler(params)
+        events = [
+            {
+                "flowOutputEvent": {
+                    "nodeName": "FlowOutputNode",
+                    "nodeType": "FlowOutputNode",
+                    "content": {"document": document},
+                }
+            },
+            {"flowCompletionEvent": {"completionReason": "SUCCESS"}},
+        ]
+        return {
+            "executionId": kwargs.get("executionId") or str(uuid.uuid4()),
+            "responseStream": EventStream(events),
+        }
+
+    def _session(self, id: str) -> dict[str, Any]:
+        try:
+            return self.sessions[id]
+        except KeyError:
+            raise ServiceError("ResourceNotFoundException", f"session {id} not found", 404)
+
+    def create_session(self, **kwargs) -> dict[str, Any]:
+        id = str(uuid.uuid4())
+        now = _now()
+        self.sessions[id] = session = {
+            "sessionId": id,
+            "sessionArn": f"arn:aws:bedrock:us-east-1:123456789012:session/{id}",
+            "sessionStatus": "ACTIVE",
+            "createdAt": now,
+            "lastUpdatedAt": now,
+            "sessionMetadata": kwargs.get("sessionMetadata", {}),
+        }
+        return {
+            k: session[k] for k in ("sessionId", "sessionArn", "sessionStatus", "createdAt")
+        }
+
+    def get_session(self, sessionIdentifier: str, **kwargs) -> dict[str, Any]:
+        return dict(self._session(sessionIdentifier))
+
+    def update_session(
+        self, sessionIdentifier: str, sessionMetadata: dict | None = None, **kwargs
+    ) -> dict[str, Any]:
+        session = self._session(sessionIdentifier)
+        if sessionMetadata is not None:
+            session["sessionMetadata"] = sessionMetadata
+        session["lastUpdatedAt"] = _now()
+        return {k: v for k, v in session.items() if k != "sessionMetadata"}
+
+    def end_session(self, sessionIdentifier: str, **kwargs) -> dict[str, Any]:
+        session = self._session(sessionIdentifier)
+        session["sessionStatus"] = "ENDED"
+        return {k: session[k] for k in ("sessionId", "sessionArn", "sessionStatus")}
+
+    def delete_session(self, sessionIdentifier: str, **kwargs) -> dict[str, Any]:
+        self._session(sessionIdentifier)
+        del self.sessions[sessionIdentifier]
+        return {}
+
+    def list_sessions(self, **kwargs) -> dict[str, Any]:
+        sessions, token = paginate(
+            list(self.sessions.values()), kwargs.get("nextToken"), kwargs.get("maxResults")
+        )
+        response = {
+            "sessionSummaries": [
+                {k: v for k, v in s.items() if k != "sessionMetadata"} for s in sessions
+            ]
+        }
+        if token:
+            response["nextToken"] = token
+        return response
+
+    def create_invocation(self, sessionIdentifier: str, **kwargs) -> dict[str, Any]:
+        self._session(sessionIdentifier)
+        id = kwargs.get("invocationId") or str(uuid.uuid4())
+        self.invocations[sessionIdentifier, id] = invocation = {
+            "sessionId": sessionIdentifier,
+            "invocationId": id,
+            "createdAt": _now(),
+        }
+        return dict(invocation)
+
+    def list_invocations(self, sessionIdentifier: str, **kwargs) -> dict[str, Any]:
+        self._session(sessionIdentifier)
+        invocations = [v for k, v in self.invocations.items() if k[0] == sessionIdentifier]
+        invocations, token = paginate(
+            invocations, kwargs.get("nextToken"), kwargs.get("maxResults")
+        )
+        response = {"invocationSummaries": [dict(i) for i in invocations]}
+        if token:
+            response["nextToken"] = token
+        return response
+
+    def put_invocation_step(
+        self,
+        sessionIdentifier: str,
+        invocationIdentifier: str,
+        invocationStepTime: datetime,
+        payload: dict[str, Any],
+        invocationStepId: str | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        self._session(sessionIdentifier)
+        id = invocationStepId or str(uuid.uuid4())
+        self.steps[sessionIdentifier, invocationIdentifier, id] = {
+            "sessionId": sessionIdentifier,
+            "invocationId": invocationIdentifier,
+            "invocationStepId": id,
+            "invocationStepTime": invocationStepTime,
+            "payload": payload,
+        }
+        return {"invocationStepId": id}
+
+    def get_invocation_step(
+        self, sessionIdentifier: str, invocationIdentifier: str, invocationStepId: str, **kwargs
+    ) -> dict[str, Any]:
+        try:
+            step = self.steps[sessionIdentifier, invocationIdentifier, invocationStepId]
+        except KeyError:
+            raise ServiceError("ResourceNotFoundException", "step not found", 404)
+        return {"invocationStep": dict(step)}
+
+    def list_invocation_steps(self, sessionIdentifier: str, **kwargs) -> dict[str, Any]:
+        invocation = kwargs.get("invocationIdentifier")
+        steps = [
+            {k: v for k, v in step.items() if k != "payload"}
+            for key, step in self.steps.items()
+            if key[0] == sessionIdentifier and invocation in {None, key[1]}
+        ]
+        steps, token = paginate(steps, kwargs.get("nextToken"), kwargs.get("maxResults"))
+        response = {"invocationStepSummaries": steps}
+        if token:
+            response["nextToken"] = token
+        return response
+
+    def get_agent_memory(
+        self, agentId: str, agentAliasId: str, memoryId: str, memoryType: str, **kwargs
+    ) -> dict[str, Any]:
+        contents = self.memory.get((agentId, agentAliasId, memoryId), [])
+        contents, token = paginate(contents, kwargs.get("nextToken"), kwargs.get("maxItems"))
+        response = {"memoryContents": list(contents)}
+        if token:
+            response["nextToken"] = token
+        return response
+
+    def delete_agent_memory(self, agentId: str, agentAliasId: str, **kwargs) -> dict[str, Any]:
+        memory_id = kwargs.get("memoryId")
+        for key in [k for k in self.memory if k[:2] == (agentId, agentAliasId)]:
+            if memory_id in {None, key[2]}:
+                del self.memory[key]
+        return {}
@@ -0,0 +1,24 @@
+"""Fake Amazon CloudWatch."""
+
+from fondat.aws.testing.service import ServiceError
+from typing import Any
+
+
+class CloudWatch:
+    """
+    Fake CloudWatch service.
+
+    Attributes:
+    • metric_data: metric data put in each namespace, in the order received
+    """
+
+    def __init__(self):
+        self.metric_data: dict[str, list[dict[str, Any]]] = {}
+
+    def put_metric_data(
+        self, Namespace: str, MetricData: list[dict[str, Any]], **kwargs
+    ) -> dict[str, Any]:
+        if len(MetricData) > 1000:
+            raise ServiceError("InvalidParameterValue", "too many metric data")
+        self.metric_data.setdefault(Namespace, []).extend(MetricData)
+        return {}
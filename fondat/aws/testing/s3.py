@@ -0,0 +1,449 @@
+"""Fake Amazon Simple Storage Service (S3)."""
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import re
+import uuid
+
+from collections.abc import Callable
+from datetime import datetime, timezone
+from fondat.aws.testing.service import (
+    EventStream,
+    ServiceError,
+    StreamingBody,
+    paginate,
+    read_body,
+)
+from typing import Any
+from urllib.parse import unquote
+
+
+MIN_PART_SIZE = 5 * 1024 * 1024  # 5 MiB
+
+
+class Object:
+    """
+    An object stored in a fake bucket.
+
+    Parameters and attributes:
+    • data: content of the object
+    • content_type: content type of the object
+    • metadata: user-defined metadata
+    • etag: entity tag of the object  [MD5 digest of data]
+    • locked: object is locked, and cannot be deleted
+    • content_encoding: content encoding of the object, if any
+    """
+
+    def __init__(
+        self,
+        data: bytes,
+        content_type: str = "binary/octet-stream",
+        metadata: dict[str, str] | None = None,
+        etag: str | None = None,
+        locked: bool = False,
+        content_encoding: str | None = None,
+    ):
+        self.data = data
+        self.content_type = content_type
+        self.metadata = metadata or {}
+        self.etag = etag or f'"{hashlib.md5(data).hexdigest()}"'
+        self.locked = locked
+        self.content_encoding = content_encoding
+        self.last_modified = datetime.now(tz=timezone.utc).replace(microsecond=0)
+
+
+class Upload:
+    """A multipart upload in progress."""
+
+    def __init__(
+        self,
+        bucket: str,
+        key: str,
+        content_type: str,
+        metadata: dict[str, str],
+        content_encoding: str | None = None,
+    ):
+        self.bucket = bucket
+        self.key = key
+        self.content_type = content_type
+        self.metadata = metadata
+        self.content_encoding = content_encoding
+        self.parts: dict[int, bytes] = {}
+
+
+def _range(spec: str, size: int) -> tuple[int, int]:
+    """Return the first and last byte positions of a byte range specification."""
+    try:
+        unit, spec = spec.split("=", 1)
+        first, last = spec.split("-", 1)
+        if unit != "bytes":
+            raise ValueError
+        if not first:  # suffix range
+            first, last = max(size - int(last), 0), size - 1
+        else:
+            first, last = int(first), min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        raise ServiceError("InvalidArgument", f"invalid range: {spec}")
+    if first >= size or first > last:
+        raise ServiceError("InvalidRange", "range not satisfiable", 416)
+    return first, last
+
+
+_SELECT_ALL = re.compile(r"select \* from s3object(?: \w+)?(?: limit (\d+))?", re.IGNORECASE)
+
+
+def select(records: list[dict[str, Any]], expression: str) -> list[dict[str, Any]]:
+    """
+    Evaluate an S3 Select expression over records. Only expressions that select all fields
+    of records are supported: SELECT * FROM S3Object [alias] [LIMIT n].
+    """
+    if not (match := _SELECT_ALL.fullmatch(expression.strip())):
+        raise ServiceError("UnsupportedSyntax", f"unsupported expression: {expression}")
+    return records[: int(match.group(1))] if match.group(1) else records
+
+
+def _read_records(data: bytes, serialization: dict[str, Any]) -> list[dict[str, Any]]:
+    if serialization.get("CompressionType", "NONE") == "GZIP":
+        data = gzip.decompress(data)
+    text = data.decode()
+    if (options := serialization.get("JSON")) is not None:
+        if options.get("Type") != "LINES":
+            raise ServiceError("UnsupportedSyntax", "only JSON lines input is supported")
+        return [json.loads(line) for line in text.splitlines() if line]
+    if (options := serialization.get("CSV")) is not None:
+        rows = list(csv.reader(io.StringIO(text)))
+        header = options.get("FileHeaderInfo", "NONE")
+        if header == "USE":
+            return [dict(zip(rows[0], row)) for row in rows[1:]]
+        rows = rows[1:] if header == "IGNORE" else rows
+        return [{f"_{n + 1}": value for n, value in enumerate(row)} for row in rows]
+    raise ServiceError("UnsupportedSyntax", "only CSV and JSON input is supported")
+
+
+def _write_records(records: list[dict[str, Any]], serialization: dict[str, Any]) -> bytes:
+    if "JSON" in serialization:
+        return "".join(json.dumps(record) + "\n" for record in records).encode()
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    for record in records:
+        writer.writerow(record.values())
+    return output.getvalue().encode()
+
+
+class S3:
+    """
+    Fake S3 service.
+
+    Attributes:
+    • buckets: objects stored in each bucket, keyed by bucket name and object key
+    • uploads: multipart uploads in progress, keyed by upload ID
+    • select: function that evaluates an S3 Select expression over records
+    • select_chunk_size: maximum size of each S3 Select records event payload
+    """
+
+    def __init__(self):
+        self.buckets: dict[str, dict[str, Object]] = {}
+        self.uploads: dict[str, Upload] = {}
+        self.select: Callable[[list[dict[str, Any]], str], list[dict[str, Any]]] = select
+        self.select_chunk_size = 65536
+
+    def _bucket(self, name: str) -> dict[str, Object]:
+        try:
+            return self.buckets[name]
+        except KeyError:
+            raise ServiceError("NoSuchBucket", "bucket does not exist", 404)
+
+    def _object(self, bucket: str, key: str) -> Object:
+        try:
+            return self._bucket(bucket)[key]
+        except KeyError:
+            raise ServiceError("NoSuchKey", "key does not exist", 404)
+
+    def _upload(self, bucket: str, key: str, upload_id: str) -> Upload:
+        upload = self.uploads.get(upload_id)
+        if not upload or upload.bucket != bucket or upload.key != key:
+            raise ServiceError("NoSuchUpload", "upload does not exist", 404)
+        return upload
+
+    def create_bucket(self, Bucket: str, **kwargs) -> dict[str, Any]:
+        if Bucket in self.buckets:
+            raise ServiceError("BucketAlreadyOwnedByYou", "bucket already exists", 409)
+        self.buckets[Bucket] = {}
+        return {"Location": f"/{Bucket}"}
+
+    def list_buckets(self, **kwargs) -> dict[str, Any]:
+        return {"Buckets": [{"Name": name} for name in sorted(self.buckets)]}
+
+    def delete_bucket(self, Bucket: str, **kwargs) -> dict[str, Any]:
+        if self._bucket(Bucket):
+            raise ServiceError("BucketNotEmpty", "bucket is not empty", 409)
+        del self.buckets[Bucket]
+        return {}
+
+    def list_objects_v2(
+        self,
+        Bucket: str,
+        Prefix: str = "",
+        MaxKeys: int | None = None,
+        ContinuationToken: str | None = None,
+        StartAfter: str = "",
+        **kwargs,
+    ) -> dict[str, Any]:
+        bucket = self._bucket(Bucket)
+        keys = sorted(k for k in bucket if k.startswith(Prefix) and k > StartAfter)
+        keys, token = paginate(keys, ContinuationToken, MaxKeys)
+        response = {
+            "Name": Bucket,
+            "Prefix": Prefix,
+            "KeyCount": len(keys),
+            "MaxKeys": MaxKeys or 1000,
+            "IsTruncated": token is not None,
+            "Contents": [
+                {
+                    "Key": key,
+                    "Size": len(bucket[key].data),
+                    "ETag": bucket[key].etag,
+                    "LastModified": bucket[key].last_modified,
+                    "StorageClass": "STANDARD",
+                }
+                for key in keys
+            ],
+        }
+        if not keys:
+            del response["Contents"]
+        if token:
+            response["NextContinuationToken"] = token
+        return response
+
+    def put_object(
+        self,
+        Bucket: str,
+        Key: str,
+        Body: Any = None,
+        ContentType: str = "binary/octet-stream",
+        Metadata: dict[str, str] | None = None,
+        ContentEncoding: str | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        bucket = self._bucket(Bucket)
+        bucket[Key] = Object(
+            read_body(Body), ContentType, Metadata, content_encoding=ContentEncoding
+        )
+        return {"ETag": bucket[Key].etag}
+
+    def _describe(self, obj: Object) -> dict[str, Any]:
+        response = {
+            "ContentType": obj.content_type,
+            "ContentLength": len(obj.data),
+            "ETag": obj.etag,
+            "LastModified": obj.last_modified,
+            "Metadata": obj.metadata,
+            "AcceptRanges": "bytes",
+        }
+        if obj.content_encoding:
+            response["ContentEncoding"] = obj.content_encoding
+        return response
+
+    def head_object(self, Bucket: str, Key: str, **kwargs) -> dict[str, Any]:
+        return self._describe(self._object(Bucket, Key))
+
+    def get_object(
+        self,
+        Bucket: str,
+        Key: str,
+        Range: str | None = None,
+        IfMatch: str | None = None,
+        IfNoneMatch: str | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        obj = self._object(Bucket, Key)
+        if IfMatch is not None and IfMatch != obj.etag:
+            raise ServiceError("PreconditionFailed", "precondition failed", 412)
+        if IfNoneMatch is not None and IfNoneMatch == obj.etag:
+            raise ServiceError("304", "Not Modified", 304)
+        response = self._describe(obj)
+        data = obj.data
+        if Range:
+            first, last = _range(Range, len(data))
+            data = data[first : last + 1]
+            response["ContentLength"] = len(data)
+            response["ContentRange"] = f"bytes {first}-{last}/{len(obj.data)}"
+        response["Body"] = StreamingBody(data)
+        return response
+
+    def _source(self, CopySource: str | dict[str, str], IfMatch: str | None) -> Object:
+        if isinstance(CopySource, str):
+            bucket, key = unquote(CopySource.split("?", 1)[0]).lstrip("/").split("/", 1)
+        else:
+            bucket, key = CopySource["Bucket"], CopySource["Key"]
+        obj = self._object(bucket, key)
+        if IfMatch is not None and IfMatch != obj.etag:
+            raise ServiceError("PreconditionFailed", "precondition failed", 412)
+        return obj
+
+    def copy_object(
+        self,
+        Bucket: str,
+        Key: str,
+        CopySource: str | dict[str, str],
+        CopySourceIfMatch: str | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        source = self._source(CopySource, CopySourceIfMatch)
+        bucket = self._bucket(Bucket)
+        bucket[Key] = Object(
+            source.data,
+            source.content_type,
+            dict(source.metadata),
+            source.etag,
+            content_encoding=source.content_encoding,
+        )
+        return {
+            "CopyObjectResult": {"ETag": source.etag, "LastModified": bucket[Key].last_modified}
+        }
+
+    def select_object_content(
+        self,
+        Bucket: str,
+        Key: str,
+        Expression: str,
+        ExpressionType: str,
+        InputSerialization: dict[str, Any],
+        OutputSerialization: dict[str, Any],
+        **kwargs,
+    ) -> dict[str, Any]:
+        obj = self._object(Bucket, Key)
+        records = self.select(_read_records(obj.data, InputSerialization), Expression)
+        output = _write_records(records, OutputSerialization)
+        size = self.select_chunk_size
+        events = [
+            {"Records": {"Payload": output[n : n + size]}} for n in range(0, len(output), size)
+        ]
+        stats = {"BytesScanned": len(obj.data), "BytesReturned": len(output)}
+        events.append({"Stats": {"Details": stats | {"BytesProcessed": len(obj.data)}}})
+        events.append({"End": {}})
+        return {"Payload": EventStream(events)}
+
+    def _delete(self, bucket: dict[str, Object], key: str) -> None:
+        if (obj := bucket.get(key)) and obj.locked:
+            raise ServiceError("AccessDenied", "object is locked", 403)
+        bucket.pop(key, None)
+
+    def delete_object(self, Bucket: str, Key: str, **kwargs) -> dict[str, Any]:
+        self._delete(self._bucket(Bucket), Key)
+        return {}
+
+    def delete_objects(self, Bucket: str, Delete: dict[str, Any], **kwargs) -> dict[str, Any]:
+        bucket = self._bucket(Bucket)
+        objects = Delete["Objects"]
+        if len(objects) > 1000:
+            raise ServiceError("MalformedXML", "too many objects to delete")
+        deleted, errors = [], []
+        for obj in objects:
+            try:
+                self._delete(bucket, obj["Key"])
+                deleted.append({"Key": obj["Key"]})
+            except ServiceError as se:
+                errors.append({"Key": obj["Key"], "Code": se.code, "Message": se.message})
+        response = {"Errors": errors} if errors else {}
+        if not Delete.get("Quiet"):
+            response["Deleted"] = deleted
+        return response
+
+    def create_multipart_upload(
+        self,
+        Bucket: str,
+        Key: str,
+        ContentType: str = "binary/octet-stream",
+        Metadata: dict[str, str] | None = None,
+        ContentEncoding: str | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        self._bucket(Bucket)
+        upload_id = uuid.uuid4().hex
+        self.uploads[upload_id] = Upload(
+            Bucket, Key, ContentType, Metadata or {}, ContentEncoding
+        )
+        return {"Bucket": Bucket, "Key": Key, "UploadId": upload_id}
+
+    def upload_part(
+        self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: Any = None, **kwargs
+    ) -> dict[str, Any]:
+        upload = self._upload(Bucket, Key, UploadId)
+        upload.parts[PartNumber] = data = read_body(Body)
+        return {"ETag": f'"{hashlib.md5(data).hexdigest()}"'}
+
+    def upload_part_copy(
+        self,
+        Bucket: str,
+        Key: str,
+        UploadId: str,
+        PartNumber: int,
+        CopySource: str | dict[str, str],
+        CopySourceRange: str | None = None,
+        CopySourceIfMatch: str | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        upload = self._upload(Bucket, Key, UploadId)
+        data = self._source(CopySource, CopySourceIfMatch).data
+        if CopySourceRange:
+            first, last = _range(CopySourceRange, len(data))
+            data = data[first : last + 1]
+        upload.parts[PartNumber] = data
+        return {"CopyPartResult": {"ETag": f'"{hashlib.md5(data).hexdigest()}"'}}
+
+    def list_parts(self, Bucket: str, Key: str, UploadId: str, **kwargs) -> dict[str, Any]:
+        upload = self._upload(Bucket, Key, UploadId)
+        return {
+            "Bucket": Bucket,
+            "Key": Key,
+            "UploadId": UploadId,
+            "IsTruncated": False,
+            "Parts": [
+                {
+                    "PartNumber": number,
+                    "ETag": f'"{hashlib.md5(data).hexdigest()}"',
+                    "Size": len(data),
+                }
+                for number, data in sorted(upload.parts.items())
+            ],
+        }
+
+    def complete_multipart_upload(
+        self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict, **kwargs
+    ) -> dict[str, Any]:
+        upload = self._upload(Bucket, Key, UploadId)
+        parts = MultipartUpload.get("Parts", [])
+        numbers = [part["PartNumber"] for part in parts]
+        if not parts or numbers != sorted(set(numbers)):
+            raise ServiceError("InvalidPartOrder", "parts must be in ascending order")
+        chunks = []
+        for n, part in enumerate(parts):
+            data = upload.parts.get(part["PartNumber"])
+            if data is None or part.get("ETag") != f'"{hashlib.md5(data).hexdigest()}"':
+                raise ServiceError("InvalidPart", f"invalid part {part['PartNumber']}")
+            if len(data) < MIN_PART_SIZE and n < len(parts) - 1:
+                raise ServiceError("EntityTooSmall", "part smaller than minimum size")
+            chunks.append(data)
+        digest = hashlib.md5(b"".join(hashlib.md5(c).digest() for c in chunks)).hexdigest()
+        etag = f'"{digest}-{len(chunks)}"'
+        obj = Object(
+            b"".join(chunks),
+            upload.content_type,
+            upload.metadata,
+            etag,
+            content_encoding=upload.content_encoding,
+        )
+        self._bucket(Bucket)[Key] = obj
+        del self.uploads[UploadId]
+        return {"Bucket": Bucket, "Key": Key, "ETag": obj.etag}
+
+    def abort_multipart_upload(
+        self, Bucket: str, Key: str, UploadId: str, **kwargs
+    ) -> dict[str, Any]:
+        self._upload(Bucket, Key, UploadId)
+        del self.uploads[UploadId]
+        return {}
@@ -0,0 +1,81 @@
+"""Fake AWS Secrets Manager."""
+
+import uuid
+
+from datetime import datetime, timezone
+from fondat.aws.testing.service import ServiceError
+from typing import Any
+
+
+class SecretsManager:
+    """
+    Fake Secrets Manager service.
+
+    Attributes:
+    • secrets: current version of each secret, keyed by secret name
+    """
+
+    def __init__(self):
+        self.secrets: dict[str, dict[str, Any]] = {}
+
+    def _secret(self, id: str) -> dict[str, Any]:
+        try:
+            return self.secrets[id]
+        except KeyError:
+            raise ServiceError("ResourceNotFoundException", f"secret {id} not found")
+
+    @staticmethod
+    def _version(
+        name: str, secret_string: str | None, secret_binary: bytes | None
+    ) -> dict[str, Any]:
+        version = {
+            "ARN": f"arn:aws:secretsmanager:us-east-1:123456789012:secret:{name}",
+            "Name": name,
+            "VersionId": str(uuid.uuid4()),
+            "VersionStages": ["AWSCURRENT"],
+            "CreatedDate": datetime.now(tz=timezone.utc),
+        }
+        if secret_string is not None:
+            version["SecretString"] = secret_string
+        if secret_binary is not None:
+            version["SecretBinary"] = secret_binary
+        return version
+
+    def create_secret(
+        self,
+        Name: str,
+        SecretString: str | None = None,
+        SecretBinary: bytes | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        if Name in self.secrets:
+            raise ServiceError("ResourceExistsException", f"secret {Name} already exists")
+        secret = self.secrets[Name] = self._version(Name, SecretString, SecretBinary)
+        return {k: secret[k] for k in ("ARN", "Name", "VersionId")}
+
+    def put_secret_value(
+        self,
+        SecretId: str,
+        SecretString: str | None = None,
+        SecretBinary: bytes | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        self._secret(SecretId)
+        secret = self.secrets[SecretId] = self._version(SecretId, SecretString, SecretBinary)
+        return {k: secret[k] for k in ("ARN", "Name", "VersionId", "VersionStages")}
+
+    def get_secret_value(
+        self, SecretId: str, VersionId: str | None = None, **kwargs
+    ) -> dict[str, Any]:
+        secret = self._secret(SecretId)
+        if VersionId is not None and VersionId != secret["VersionId"]:
+            raise ServiceError("ResourceNotFoundException", f"version {VersionId} not found")
+        return dict(secret)
+
+    def delete_secret(self, SecretId: str, **kwargs) -> dict[str, Any]:
+        secret = self.secrets.pop(SecretId, None) or self._secret(SecretId)
+        return {
+            "ARN": secret["ARN"],
+            "Name": secret["Name"],
+            "DeletionDate": datetime.now(tz=timezone.utc),
+        }
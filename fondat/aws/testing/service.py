@@ -0,0 +1,102 @@
+"""Common elements of fake AWS services."""
+
+import io
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+
+class ServiceError(Exception):
+    """
+    Raised by a fake service operation to respond with an error.
+
+    Parameters and attributes:
+    • code: error code
+    • message: error message
+    • status: HTTP status code
+    """
+
+    def __init__(self, code: str, message: str = "", status: int = 400):
+        super().__init__(code, message, status)
+        self.code = code
+        self.message = message
+        self.status = status
+
+
+def read_body(body: Any) -> bytes:
+    """Return the content of a request body as bytes."""
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode()
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        return bytes(body)
+    if isinstance(body, io.IOBase) or hasattr(body, "read"):
+        return body.read()
+    raise ServiceError("InvalidArgument", f"unsupported body type: {type(body)}")
+
+
+def paginate(
+    items: Sequence[Any], token: str | None, limit: int | None, default: int = 1000
+) -> tuple[Sequence[Any], str | None]:
+    """
+    Return a page of items, and the token to request the next page.
+
+    Parameters:
+    • items: all items to paginate
+    • token: token to request page, or None to request the first page
+    • limit: maximum number of items in page
+    • default: maximum number of items in page if limit is not specified
+    """
+    offset = int(token) if token else 0
+    end = offset + (limit or default)
+    return items[offset:end], str(end) if end < len(items) else None
+
+
+class StreamingBody:
+    """
+    Body of a streaming response, compatible with the aiobotocore streaming body.
+
+    Parameters:
+    • data: content of the body
+    """
+
+    def __init__(self, data: bytes):
+        self._stream = io.BytesIO(data)
+        self.content_length = len(data)
+
+    async def read(self, amt: int | None = None) -> bytes:
+        return self._stream.read(amt)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._stream.close()
+
+
+class EventStream:
+    """
+    Stream of events in a response, compatible with the aiobotocore event stream.
+
+    Parameters:
+    • events: events to stream
+    """
+
+    def __init__(self, events: Iterable[dict[str, Any]]):
+        self._events = iter(events)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict[str, Any]:
+        try:
+            return next(self._events)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    def close(self):
+        pass
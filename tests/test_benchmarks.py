@@ -0,0 +1,31 @@
+import benchmarks
+import json
+import pytest
+
+from benchmarks.__main__ import main
+
+
+@pytest.mark.parametrize("name", list(benchmarks.cases))
+def test_case(name):
+    (result,) = benchmarks.run([name], isolate=False, iterations=2, warmup=1)
+    assert result.name == name
+    assert result.timing.iterations == 2
+    assert result.timing.ops_per_sec > 0
+    assert result.timing.p50_us <= result.timing.p99_us
+    assert (result.baseline is None) == (result.overhead_us is None)
+    assert result.peak_rss > 0
+
+
+def test_main(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    args = ["lambda.*", "--no-isolate", "--iterations=2", f"--output={output}"]
+    assert main(args) == 0
+    report = json.loads(output.read_text())
+    assert [r["name"] for r in report["results"]] == ["lambda.http"]
+    assert main([*args[:-1], f"--compare={output}"]) == 0
+    assert "%" in capsys.readouterr().out.splitlines()[-1]
+
+
+def test_isolate():
+    (result,) = benchmarks.run(["bedrock.snake_case"], iterations=2)
+    assert result.name == "bedrock.snake_case"
@@ -0,0 +1,604 @@
+import asyncio
+import contextlib
+import fondat.aws.client
+import fondat.error
+import io
+import pytest
+
+from aiobotocore.session import AioSession
+from aiobotocore.stub import Stubber
+from botocore.exceptions import ClientError
+from fondat.aws.client import (
+    AdaptiveLimiter,
+    ClientPool,
+    Config,
+    Instrumentation,
+    RetryBudget,
+    RetryPolicy,
+    SessionCache,
+    SingleFlight,
+    backoff,
+    wrap_client_error,
+)
+from fondat.monitor import Monitor
+from pytest import fixture
+
+
+config = Config(
+    region_name="us-east-1",
+    aws_access_key_id="AKIDEXAMPLE",
+    aws_secret_access_key="secret",
+)
+
+
+async def test_pool_reuse():
+    pool = ClientPool()
+    async with pool.client("s3", config=config) as client1:
+        pass
+    async with pool.client("s3", config=config) as client2:
+        pass
+    assert client1 is client2
+    assert len(pool) == 1
+    await pool.close()
+    assert len(pool) == 0
+
+
+async def test_pool_distinct_keys():
+    pool = ClientPool()
+    async with pool.client("s3", config=config) as client1:
+        async with pool.client("s3", config=Config(region_name="us-west-2")) as client2:
+            async with pool.client("secretsmanager", config=config) as client3:
+                assert len({id(client1), id(client2), id(client3)}) == 3
+    assert len(pool) == 3
+    await pool.close()
+
+
+async def test_pool_concurrent_borrow():
+    pool = ClientPool()
+    async with pool.client("s3", config=config) as client1:
+        async with pool.client("s3", config=config) as client2:
+            assert client1 is client2
+    await pool.close()
+
+
+async def test_pool_size():
+    pool = ClientPool(size=1)
+    async with pool.client("s3", config=config):
+        pass
+    async with pool.client("secretsmanager", config=config):
+        pass
+    assert len(pool) == 1
+    await pool.close()
+
+
+async def test_pool_idle():
+    pool = ClientPool(idle=0)
+    async with pool.client("s3", config=config) as client1:
+        assert len(pool) == 1
+    assert len(pool) == 0
+    async with pool.client("s3", config=config) as client2:
+        pass
+    assert client1 is not client2
+
+
+async def test_pool_close_borrowed():
+    pool = ClientPool()
+    async with pool.client("s3", config=config) as client1:
+        await pool.close()
+        assert len(pool) == 0
+        async with pool.client("s3", config=config) as client2:
+            assert client1 is not client2
+    await pool.close()
+
+
+async def test_pool_open_error():
+    pool = ClientPool()
+    with pytest.raises(Exception):
+        async with pool.client("no-such-service", config=config):
+            pass
+    assert len(pool) == 0
+
+
+async def test_pool_open_cancel(monkeypatch):
+    pool = ClientPool()
+    opening = asyncio.Event()
+
+    open_client = fondat.aws.client._open_client
+
+    @contextlib.asynccontextmanager
+    async def slow_open_client(*args):
+        opening.set()
+        await asyncio.sleep(0.01)
+        async with open_client(*args) as client:
+            yield client
+
+    monkeypatch.setattr(fondat.aws.client, "_open_client", slow_open_client)
+
+    async def borrow():
+        async with pool.client("s3", config=config) as client:
+            return client
+
+    first = asyncio.create_task(borrow())
+    second = asyncio.create_task(borrow())
+    await opening.wait()
+    first.cancel()
+    assert await second  # unaffected by cancellation of first borrower
+    assert first.cancelled()
+    assert len(pool) == 1
+    await pool.close()
+
+
+async def test_create_client_pooled():
+    async with fondat.aws.client.create_client("s3", config=config) as client1:
+        pass
+    async with fondat.aws.client.create_client("s3", config=config) as client2:
+        pass
+    assert client1 is client2
+    async with fondat.aws.client.create_client("s3", config=config, pooled=False) as client3:
+        assert client3 is not client1
+    await fondat.aws.client.close()
+
+
+class _Credentials:
+    def __init__(self):
+        self.refreshes = 0
+
+    def refresh_needed(self):
+        return True
+
+    async def get_frozen_credentials(self):
+        self.refreshes += 1
+
+
+async def test_session_cache_key():
+    sessions = SessionCache()
+    session1 = await sessions.session(config)
+    session2 = await sessions.session(config)
+    session3 = await sessions.session(
+        Config(aws_access_key_id="other", aws_secret_access_key="x")
+    )
+    assert session1 is session2
+    assert session1 is not session3
+    assert len(sessions) == 2
+    sessions.clear()
+    assert len(sessions) == 0
+
+
+async def test_session_cache_resolves_once(monkeypatch):
+    credentials = _Credentials()
+    calls = 0
+
+    async def get_credentials(self):
+        nonlocal calls
+        calls += 1
+        return credentials
+
+    monkeypatch.setattr(AioSession, "get_credentials", get_credentials)
+    sessions = SessionCache(interval=3600)
+    await asyncio.gather(*(sessions.session(Config(profile="default")) for _ in range(10)))
+    assert calls == 1
+    assert credentials.refreshes == 1  # initial fetch
+    sessions.clear()
+
+
+async def test_session_cache_explicit_keys(monkeypatch):
+    async def get_credentials(self):
+        raise AssertionError("credential chain should not be walked")
+
+    monkeypatch.setattr(AioSession, "get_credentials", get_credentials)
+    sessions = SessionCache()
+    await sessions.session(config)
+
+
+async def test_session_cache_refresh(monkeypatch):
+    credentials = _Credentials()
+
+    async def get_credentials(self):
+        return credentials
+
+    monkeypatch.setattr(AioSession, "get_credentials", get_credentials)
+    sessions = SessionCache(interval=0)
+    await sessions.session(Config(profile="default"))
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert credentials.refreshes > 1  # refreshed in background
+    sessions.clear()
+
+
+async def test_limiter_aimd():
+    limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=5, increase=1, decrease=0.5)
+    token = await limiter.acquire()
+    limiter.release(token)
+    assert limiter.limit == 4.25
+    token = await limiter.acquire()
+    limiter.release(token, throttled=True)
+    assert limiter.limit == 2.125
+    token = await limiter.acquire()
+    limiter.release(token, throttled=None)
+    assert limiter.limit == 2.125
+    for _ in range(100):
+        limiter.release(await limiter.acquire())
+    assert limiter.limit == 5
+
+
+async def test_limiter_throttle_burst():
+    limiter = AdaptiveLimiter(initial=8)
+    tokens = [await limiter.acquire() for _ in range(8)]
+    for token in tokens:
+        limiter.release(token, throttled=True)
+    assert limiter.limit == 4  # decreased once for burst
+    limiter.release(await limiter.acquire(), throttled=True)
+    assert limiter.limit == 2
+
+
+async def test_limiter_waits():
+    limiter = AdaptiveLimiter(initial=2)
+    tokens = [await limiter.acquire(), await limiter.acquire()]
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    limiter.release(tokens[0])
+    await asyncio.sleep(0)
+    assert waiter.done()
+    assert limiter.in_flight == 2
+
+
+async def test_limiter_cancel():
+    limiter = AdaptiveLimiter(initial=1)
+    token = await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    limiter.release(token)
+    assert limiter.in_flight == 0
+
+
+@fixture
+def retry(monkeypatch):
+    monkeypatch.setattr(fondat.aws.client, "budget", RetryBudget())
+    policy = fondat.aws.client.retry_policies["s3"] = RetryPolicy(attempts=3, base=0, cap=0)
+    yield policy
+    del fondat.aws.client.retry_policies["s3"]
+
+
+@fixture
+async def s3(retry):
+    async with fondat.aws.client.create_client("s3", config=config, pooled=False) as client:
+        with Stubber(client._client) as stubber:
+            yield client, stubber
+
+
+async def test_client_throttling(retry):
+    fondat.aws.client.limiters[("s3", "us-east-1")] = limiter = AdaptiveLimiter(initial=8)
+    try:
+        async with fondat.aws.client.create_client("s3", config=config, pooled=False) as client:
+            with Stubber(client._client) as stubber:
+                stubber.add_client_error("list_buckets", "SlowDown", http_status_code=503)
+                stubber.add_response("list_buckets", {"Buckets": []})
+                await client.list_buckets()  # retried
+        assert limiter.limit == 4.25
+        assert limiter.in_flight == 0
+    finally:
+        del fondat.aws.client.limiters[("s3", "us-east-1")]
+
+
+async def test_retry_transient(s3):
+    client, stubber = s3
+    stubber.add_client_error("list_buckets", "InternalError", http_status_code=500)
+    stubber.add_client_error("list_buckets", "BadGateway", http_status_code=502)
+    stubber.add_response("list_buckets", {"Buckets": []})
+    assert (await client.list_buckets())["Buckets"] == []
+
+
+async def test_retry_attempts(s3):
+    client, stubber = s3
+    for _ in range(3):
+        stubber.add_client_error("list_buckets", "InternalError", http_status_code=500)
+    stubber.add_response("list_buckets", {"Buckets": []})
+    with pytest.raises(ClientError):
+        await client.list_buckets()
+
+
+async def test_retry_not_retryable(s3):
+    client, stubber = s3
+    stubber.add_client_error("list_buckets", "AccessDenied", http_status_code=403)
+    stubber.add_response("list_buckets", {"Buckets": []})
+    with pytest.raises(ClientError):
+        await client.list_buckets()
+
+
+async def test_retry_stream_body(s3):
+    client, stubber = s3
+    stubber.add_client_error("put_object", "InternalError", http_status_code=500)
+    stubber.add_response("put_object", {})
+    with pytest.raises(ClientError):
+        await client.put_object(Bucket="bucket", Key="key", Body=io.BytesIO(b"body"))
+
+
+async def test_retry_rewindable_body(s3):
+    client, stubber = s3
+    stubber.add_client_error("put_object", "InternalError", http_status_code=500)
+    stubber.add_response("put_object", {})
+
+    class Body(io.BytesIO):
+        rewinds = 0
+
+        def rewind(self):
+            self.rewinds += 1
+            self.seek(0)
+
+    body = Body(b"body")
+    await client.put_object(Bucket="bucket", Key="key", Body=body)
+    assert body.rewinds == 1
+
+
+async def test_retry_idempotency_token(retry, monkeypatch):
+    monkeypatch.setitem(fondat.aws.client.retry_policies, "secretsmanager", retry)
+    tokens = []
+
+    class Token:
+        def __eq__(self, other):
+            tokens.append(other)
+            return True
+
+    params = {"SecretId": "secret", "SecretString": "value", "ClientRequestToken": Token()}
+    async with fondat.aws.client.create_client(
+        "secretsmanager", config=config, pooled=False
+    ) as client:
+        with Stubber(client._client) as stubber:
+            stubber.add_client_error(
+                "put_secret_value", "InternalFailure", 500, expected_params=params
+            )
+            stubber.add_response("put_secret_value", {}, expected_params=params)
+            await client.put_secret_value(SecretId="secret", SecretString="value")
+    assert len(tokens) == 2
+    assert tokens[0] == tokens[1]
+
+
+async def test_retry_budget(s3, monkeypatch):
+    client, stubber = s3
+    monkeypatch.setattr(fondat.aws.client, "budget", RetryBudget(capacity=5, cost=5))
+    stubber.add_client_error("list_buckets", "InternalError", http_status_code=500)
+    stubber.add_response("list_buckets", {"Buckets": []})
+    await client.list_buckets()  # spends budget
+    stubber.add_client_error("list_buckets", "InternalError", http_status_code=500)
+    with pytest.raises(ClientError):
+        await client.list_buckets()  # budget exhausted
+
+
+async def test_retry_deadline(s3, retry):
+    client, stubber = s3
+    retry.deadline = 0.5
+    retry.base = retry.cap = 1.0
+    stubber.add_client_error("list_buckets", "InternalError", http_status_code=500)
+    stubber.add_response("list_buckets", {"Buckets": []})
+    with pytest.raises(ClientError):
+        await client.list_buckets()  # retry would exceed deadline
+
+
+def test_backoff():
+    delay = 0.0
+    for _ in range(100):
+        delay = backoff(delay, 0.1, 5.0)
+        assert 0.1 <= delay <= 5.0
+
+
+async def test_botocore_retries_disabled():
+    async with fondat.aws.client.create_client("s3", config=config, pooled=False) as client:
+        assert client.meta.config.retries["total_max_attempts"] == 1
+
+
+def test_wrap_client_error_throttling():
+    with pytest.raises(fondat.error.errors.TooManyRequestsError):
+        with wrap_client_error():
+            raise ClientError(
+                {
+                    "Error": {"Code": "ThrottlingException"},
+                    "ResponseMetadata": {"HTTPStatusCode": 400},
+                },
+                "TestOperation",
+            )
+
+
+class _Monitor(Monitor):
+    def __init__(self):
+        self.measurements = []
+
+    async def record(self, measurement):
+        self.measurements.append(measurement)
+
+
+@fixture
+def instrumentation(monkeypatch):
+    instrumentation = Instrumentation(monitor=_Monitor(), interval=3600)
+    monkeypatch.setattr(fondat.aws.client, "instrumentation", instrumentation)
+    return instrumentation
+
+
+async def test_instrumentation_close(s3, instrumentation):
+    client, stubber = s3
+    stubber.add_response("list_buckets", {"Buckets": []})
+    await client.list_buckets()
+    assert not instrumentation.monitor.measurements  # interval not elapsed
+    await fondat.aws.client.close()
+    names = {m.name for m in instrumentation.monitor.measurements}
+    assert "aws_operation_invocations" in names
+
+
+async def test_instrumentation(s3, instrumentation):
+    client, stubber = s3
+    stubber.add_client_error("list_buckets", "InternalError", http_status_code=500)
+    stubber.add_response("list_buckets", {"Buckets": []})
+    stubber.add_client_error("list_buckets", "AccessDenied", http_status_code=403)
+    await client.list_buckets()
+    with pytest.raises(ClientError):
+        await client.list_buckets()
+    await instrumentation.flush()
+    measurements = {
+        (m.name, m.tags.get("error"), m.tags.get("statistic")): m
+        for m in instrumentation.monitor.measurements
+    }
+    assert measurements[("aws_operation_invocations", None, None)].value == 1
+    assert measurements[("aws_operation_retries", None, None)].value == 1
+    assert measurements[("aws_operation_invocations", "AccessDenied", None)].value == 1
+    assert measurements[("aws_operation_retries", "AccessDenied", None)].value == 0
+    invocations = measurements[("aws_operation_invocations", None, None)]
+    assert invocations.tags == {"service": "s3", "operation": "ListBuckets"}
+    p99 = measurements[("aws_operation_duration", None, "p99")]
+    assert 0 < p99.value <= measurements[("aws_operation_duration", None, "max")].value
+    instrumentation.monitor.measurements.clear()
+    await instrumentation.flush()
+    assert instrumentation.monitor.measurements == []  # reset after flush
+
+
+async def test_instrumentation_interval(instrumentation):
+    instrumentation.interval = 0
+    instrumentation.record(service="s3", operation="ListBuckets", duration=0.01)
+    await instrumentation._task
+    assert len(instrumentation.monitor.measurements) == 8
+
+
+async def test_instrumentation_disabled(s3, monkeypatch):
+    client, stubber = s3
+    monkeypatch.setattr(fondat.aws.client, "instrumentation", None)
+    stubber.add_response("list_buckets", {"Buckets": []})
+    await client.list_buckets()
+
+
+async def test_single_flight_coalesces():
+    flight = SingleFlight()
+    calls = 0
+
+    async def function():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(flight.call(("key",), function) for _ in range(50)))
+    assert results == [1] * 50
+    assert calls == 1
+    assert len(flight) == 0
+    assert await flight.call(("key",), function) == 2  # not in flight; invoked again
+
+
+async def test_single_flight_keys():
+    flight = SingleFlight()
+
+    async def function():
+        await asyncio.sleep(0.01)
+        return object()
+
+    results = await asyncio.gather(
+        flight.call(("key", config), function),
+        flight.call(("key", Config(**config.__dict__)), function),
+        flight.call(("key", Config(region_name="us-west-2")), function),
+    )
+    assert results[0] is results[1]
+    assert results[0] is not results[2]
+
+
+async def test_single_flight_exception():
+    flight = SingleFlight()
+
+    async def function():
+        await asyncio.sleep(0.01)
+        raise ValueError
+
+    results = await asyncio.gather(
+        *(flight.call(("key",), function) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(r, ValueError) for r in results)
+    assert len(flight) == 0
+
+
+async def test_single_flight_cancel():
+    flight = SingleFlight()
+
+    async def function():
+        await asyncio.sleep(0.01)
+        return "result"
+
+    first = asyncio.create_task(flight.call(("key",), function))
+    second = asyncio.create_task(flight.call(("key",), function))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "result"  # unaffected by cancellation of first caller
+
+
+@pytest.mark.no_vcr  # connects to local server
+async def test_warmup(monkeypatch):
+    monkeypatch.setattr(fondat.aws.client, "pool", pool := ClientPool())
+    connections = 0
+
+    async def handle(reader, writer):
+        nonlocal connections
+        connections += 1
+        with contextlib.suppress(asyncio.IncompleteReadError, ConnectionError):
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    local = Config(**(config.__dict__ | {"endpoint_url": f"http://127.0.0.1:{port}"}))
+    try:
+        await fondat.aws.client.warmup(["s3", "secretsmanager"], local)
+        assert len(pool) == 2
+        assert connections == 2
+        async with fondat.aws.client.create_client("s3", config=local):
+            pass
+        assert len(pool) == 2  # warmed up client reused
+    finally:
+        await pool.close()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.no_vcr  # connects to local server
+async def test_pool_connections(monkeypatch):
+    monkeypatch.setattr(fondat.aws.client, "pool", pool := ClientPool())
+    release = asyncio.Event()
+
+    async def handle(reader, writer):  # sends headers, then holds body until released
+        with contextlib.suppress(asyncio.IncompleteReadError, ConnectionError):
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 4\r\n\r\n")
+            await writer.drain()
+            await release.wait()
+            writer.write(b"body")
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    local = Config(**(config.__dict__ | {"endpoint_url": f"http://127.0.0.1:{port}"}))
+
+    async def get(key: str):
+        async with fondat.aws.client.create_client("s3", config=local) as client:
+            return await client.get_object(Bucket="bucket", Key=key)
+
+    try:
+        responses = await asyncio.wait_for(
+            asyncio.gather(*(get(f"key{n}") for n in range(20))), 5
+        )  # more streams open at once than botocore's default of 10 connections
+        release.set()
+        for response in responses:
+            async with response["Body"] as body:
+                assert await body.read() == b"body"
+    finally:
+        release.set()
+        await pool.close()
+        server.close()
+        await server.wait_closed()
+
+
+async def test_warmup_no_connect(monkeypatch):
+    monkeypatch.setattr(fondat.aws.client, "pool", pool := ClientPool())
+    await fondat.aws.client.warmup(["s3"], config, connect=False)
+    assert len(pool) == 1
+    await pool.close()
@@ -0,0 +1,57 @@
+import pytest
+import subprocess
+import sys
+
+
+# modules imported on first use, not on import, to minimize cold start latency
+DEFERRED = ("aiobotocore", "botocore", "aiohttp", "fondat.aws.bedrock.resources")
+
+# time in seconds allowed to import a module, after fondat itself has been imported; about
+# three times the target of 50 ms, so that noise on a loaded machine does not fail the test
+BUDGET = 0.15
+
+SCRIPT = """
+import fondat.codec, fondat.data, fondat.error, fondat.http, fondat.monitor, fondat.resource
+import sys, time
+begin = time.perf_counter()
+import {module}
+print(time.perf_counter() - begin)
+print(",".join(sys.modules))
+"""
+
+
+def _import(module: str) -> tuple[float, set[str]]:
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(module=module)],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.splitlines()
+    return float(output[0]), set(output[1].split(","))
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "fondat.aws.athena",
+        "fondat.aws.bedrock",
+        "fondat.aws.client",
+        "fondat.aws.cloudwatch",
+        "fondat.aws.lambda_",
+        "fondat.aws.s3",
+        "fondat.aws.secretsmanager",
+    ],
+)
+def test_import_deferred(module):
+    elapsed, modules = _import(module)
+    assert not {m for m in modules if m.startswith(DEFERRED)}
+    elapsed = min(elapsed, *(_import(module)[0] for _ in range(2)))  # best of 3
+    assert elapsed < BUDGET
+
+
+def test_bedrock_lazy_attribute():
+    import fondat.aws.bedrock
+
+    assert fondat.aws.bedrock.AgentsResource.__name__ == "AgentsResource"
+    with pytest.raises(AttributeError):
+        fondat.aws.bedrock.NoSuchResource
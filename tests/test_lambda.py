@@ -137,3 +137,20 @@ def test_init():
     assert counter == 1
     fn({}, None)
     assert counter == 1
+
+
+def test_async_function_eager_init():
+    calls = []
+
+    async def init():
+        calls.append("init")
+
+    async def handler(event, context):
+        calls.append("handler")
+        return {}
+
+    function = async_function(handler, init, eager=True)
+    assert calls == ["init"]
+    function({}, None)
+    function({}, None)
+    assert calls == ["init", "handler", "handler"]
@@ -1,12 +1,26 @@
 import asyncio
+import contextlib
 import fondat.aws.client
 import fondat.aws.s3
+import gzip
+import json
 import pytest
 
 from dataclasses import dataclass
 from datetime import date, datetime
-from fondat.aws.s3 import BucketResource, ObjectResource
-from fondat.error import NotFoundError
+from fondat.aws.s3 import (
+    BucketResource,
+    MetadataIndex,
+    ObjectCache,
+    ObjectResource,
+    TransferConfig,
+    UploadCheckpoint,
+)
+from fondat.aws.testing import Backend
+from fondat.aws.testing.s3 import Object
+from fondat.aws.testing.service import ServiceError
+from fondat.error import BadRequestError, InternalServerError, NotFoundError
+from fondat.file import DirectoryResource
 from fondat.pagination import paginate
 from fondat.stream import BytesStream, Reader, Stream
 from pytest import fixture
@@ -29,10 +43,7 @@ async def client():
 
 
 async def _empty(bucket):
-    async with fondat.aws.client.create_client("s3") as client:
-        while "Contents" in (response := await client.list_objects_v2(Bucket=bucket)):
-            for item in response["Contents"]:
-                await client.delete_object(Bucket=bucket, Key=item["Key"])
+    assert not await BucketResource(bucket).delete_prefix()
 
 
 @fixture(scope="module")
@@ -171,3 +182,923 @@ async def test_stream_unknown_length(bucket):
     async with Reader(await object.get()) as reader:
         read = await reader.read()
     assert body == read
+
+
+@fixture
+def backend():
+    backend = Backend()
+    backend.s3.buckets["bucket"] = {}
+    with backend.install():
+        yield backend
+
+
+class _SlowUploadPart:
+    """Delays fake UploadPart operations, counting concurrent and completed parts."""
+
+    def __init__(self, backend, delay: float):
+        self.upload_part = backend.s3.upload_part
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        backend.s3.upload_part = self
+
+    async def __call__(self, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        self.completed += 1
+        return self.upload_part(**kwargs)
+
+
+async def test_multipart_concurrent(backend):
+    parts = _SlowUploadPart(backend, 0.05)
+    body = randbytes(5 * fondat.aws.s3.CHUNK_SIZE + 1)
+    object = ObjectResource("bucket", "key", Stream, transfer=TransferConfig(concurrency=4))
+    await object.put(BytesStream(body))
+    assert parts.completed == 6
+    assert parts.max_in_flight == 4
+    assert backend.s3.buckets["bucket"]["key"].data == body
+
+
+async def test_multipart_read_ahead(backend):
+    parts = _SlowUploadPart(backend, 0.01)
+    read = 0
+    buffered = 0
+
+    class Source(Stream):
+        async def __anext__(self):
+            nonlocal read, buffered
+            if read == 6:
+                raise StopAsyncIteration
+            read += 1
+            buffered = max(buffered, read - parts.completed)
+            return bytes(fondat.aws.s3.CHUNK_SIZE)
+
+        async def close(self):
+            pass
+
+    transfer = TransferConfig(concurrency=2, read_ahead=1)
+    await ObjectResource("bucket", "key", Stream, transfer=transfer).put(
+        Source("application/octet-stream")
+    )
+    assert parts.completed == 6
+    assert buffered == 3  # concurrency + read_ahead
+
+
+async def test_multipart_part_retry(backend):
+    backend.fail("s3", "UploadPart", "InternalError", 500)
+    body = randbytes(2 * fondat.aws.s3.CHUNK_SIZE + 1)
+    await ObjectResource("bucket", "key", Stream).put(BytesStream(body))
+    assert backend.calls["s3", "UploadPart"] == 4  # only failed part is retried
+    assert backend.s3.buckets["bucket"]["key"].data == body
+
+
+async def test_multipart_abort(backend):
+    backend.fail("s3", "UploadPart", "AccessDenied", 403)
+    body = randbytes(2 * fondat.aws.s3.CHUNK_SIZE + 1)
+    with pytest.raises(InternalServerError):
+        await ObjectResource("bucket", "key", Stream).put(BytesStream(body))
+    assert backend.calls["s3", "AbortMultipartUpload"] == 1
+    assert not backend.s3.uploads
+    assert "key" not in backend.s3.buckets["bucket"]
+
+
+def test_part_size_known_length():
+    MiB = fondat.aws.s3.MiB
+    transfer = TransferConfig()
+    assert transfer.part_size(20 * MiB, 1) == 5 * MiB  # minimum
+    assert transfer.part_size(100 * 1024 * MiB, 1) == 103 * MiB  # about 1000 parts
+    transfer = TransferConfig(max_part_size=8 * MiB)
+    assert transfer.part_size(60 * 1024 * MiB, 1) == 8 * MiB  # more than target parts
+    with pytest.raises(ValueError):
+        transfer.part_size(80 * 1024 * MiB + 1, 1)  # exceeds maximum parts
+
+
+def test_part_size_unknown_length():
+    MiB = fondat.aws.s3.MiB
+    transfer = TransferConfig(max_part_size=32 * MiB)
+    assert transfer.part_size(None, 1) == 5 * MiB
+    assert transfer.part_size(None, 1000) == 5 * MiB
+    assert transfer.part_size(None, 1001) == 10 * MiB
+    assert transfer.part_size(None, 3001) == 32 * MiB  # capped
+
+
+def test_transfer_config_invalid():
+    with pytest.raises(ValueError):
+        TransferConfig(min_part_size=1024)
+    with pytest.raises(ValueError):
+        TransferConfig(target_parts=10_001)
+
+
+async def test_multipart_part_size(backend):
+    body = randbytes(4 * fondat.aws.s3.CHUNK_SIZE)
+    transfer = TransferConfig(target_parts=2)
+    await BucketResource("bucket", value_type=Stream, transfer=transfer)["key"].put(
+        BytesStream(body)
+    )
+    assert backend.calls["s3", "UploadPart"] == 2
+    assert backend.s3.buckets["bucket"]["key"].data == body
+
+
+async def test_ranged_get(backend):
+    MiB = fondat.aws.s3.MiB
+    body = randbytes(20 * MiB + 1)
+    backend.s3.buckets["bucket"]["key"] = Object(body)
+    parts = []
+    get_object = backend.s3.get_object
+
+    async def slow_get_object(**kwargs):
+        parts.append(kwargs.get("Range"))
+        await asyncio.sleep(0.01)
+        return get_object(**kwargs)
+
+    backend.s3.get_object = slow_get_object
+    transfer = TransferConfig(download_window=3, range_size=4 * MiB)
+    object = ObjectResource("bucket", "key", Stream, transfer=transfer)
+    async with await object.get() as stream:
+        assert stream.content_length == len(body)
+        assert len(parts) == 3  # first range, and window filled
+        chunks = [chunk async for chunk in stream]
+    assert b"".join(chunks) == body
+    assert max(len(chunk) for chunk in chunks) == 4 * MiB
+    assert parts[0] == "bytes=0-4194303"
+    assert parts[-1] == "bytes=20971520-20971520"
+    assert len(parts) == 6
+
+
+async def test_ranged_get_small(backend):
+    backend.s3.buckets["bucket"]["empty"] = Object(b"")
+    backend.s3.buckets["bucket"]["small"] = Object(b"small")
+    transfer = TransferConfig(download_window=4)
+    bucket = BucketResource("bucket", transfer=transfer)
+    assert await bucket["empty"].get() == b""
+    assert await bucket["small"].get() == b"small"
+    assert backend.calls["s3", "GetObject"] == 2
+    assert backend.calls["s3", "HeadObject"] == 1  # empty object range not satisfiable
+    with pytest.raises(NotFoundError):
+        await bucket["missing"].get()
+
+
+async def test_ranged_get_changed(backend):
+    backend.s3.buckets["bucket"]["key"] = Object(bytes(10 * fondat.aws.s3.MiB))
+    transfer = TransferConfig(download_window=2, range_size=fondat.aws.s3.MiB)
+    async with await ObjectResource("bucket", "key", Stream, transfer=transfer).get() as stream:
+        backend.s3.buckets["bucket"]["key"] = Object(bytes(10 * fondat.aws.s3.MiB) + b"x")
+        with pytest.raises(InternalServerError):
+            async for _ in stream:
+                pass
+
+
+@pytest.mark.parametrize("download_window", [1, 3])
+async def test_read_range(backend, download_window):
+    MiB = fondat.aws.s3.MiB
+    body = randbytes(10 * MiB)
+    backend.s3.buckets["bucket"]["key"] = Object(body)
+    transfer = TransferConfig(download_window=download_window, range_size=MiB)
+    object = BucketResource("bucket", transfer=transfer)["key"]
+
+    async def read(start, end=None):
+        async with await object.read_range(start, end) as stream:
+            result = await Reader(stream).read()
+            assert stream.content_length == len(result)
+            return result
+
+    assert await read(100, 200) == body[100:200]
+    assert await read(MiB // 2, 4 * MiB) == body[MiB // 2 : 4 * MiB]
+    assert await read(9 * MiB) == body[9 * MiB :]
+    assert await read(-16384) == body[-16384:]  # footer
+    assert await read(len(body) - 1, len(body) + 100) == body[-1:]
+    assert await read(len(body) + 1) == b""
+    with pytest.raises(BadRequestError):
+        await object.read_range(200, 100)
+    with pytest.raises(BadRequestError):
+        await object.read_range(-100, 200)
+    with pytest.raises(NotFoundError):
+        await BucketResource("bucket")["missing"].read_range(0, 100)
+
+
+async def test_keys(backend):
+    objects = backend.s3.buckets["bucket"]
+    for n in range(2500):
+        objects[f"p/{n:04d}.json"] = Object(b"")
+    objects["p/ignored.txt"] = Object(b"")
+    objects["q/0000.json"] = Object(b"")
+    bucket = BucketResource("bucket", key_type=int, prefix="p/", suffix=".json")
+    keys = bucket.keys()
+    assert await anext(keys) == 0
+    await asyncio.sleep(0.05)
+    assert backend.calls["s3", "ListObjectsV2"] == 2  # next page prefetched
+    assert [key async for key in keys] == list(range(1, 2500))
+    assert backend.calls["s3", "ListObjectsV2"] == 3
+
+
+async def test_keys_bounds(backend):
+    objects = backend.s3.buckets["bucket"]
+    for n in range(2500):
+        objects[f"{n:04d}"] = Object(b"")
+    bucket = BucketResource("bucket")
+    assert [key async for key in bucket.keys(start_after="0997", max_keys=5)] == [
+        "0998",
+        "0999",
+        "1000",
+        "1001",
+        "1002",
+    ]
+    assert backend.calls["s3", "ListObjectsV2"] == 1
+    assert len([key async for key in bucket.keys(max_keys=1000)]) == 1000
+    assert backend.calls["s3", "ListObjectsV2"] == 2  # no prefetch beyond bound
+
+
+async def test_keys_encoded(backend):
+    bucket = BucketResource("bucket", encode_keys=True)
+    await bucket["a/b"].put(b"")
+    assert "a%2Fb" in backend.s3.buckets["bucket"]
+    assert [key async for key in bucket.keys()] == ["a/b"]
+    assert (await bucket.get()).items == ["a/b"]
+
+
+async def test_delete_many(backend):
+    objects = backend.s3.buckets["bucket"]
+    for n in range(2500):
+        objects[f"p/{n}"] = Object(b"")
+    objects["p/42"].locked = True
+    objects["q/0"] = Object(b"")
+    bucket = BucketResource("bucket", key_type=int, prefix="p/")
+    failures = await bucket.delete_many(range(2500), concurrency=2)
+    assert backend.calls["s3", "DeleteObjects"] == 3
+    assert [(f.key, f.code) for f in failures] == [(42, "AccessDenied")]
+    assert list(objects) == ["p/42", "q/0"]
+
+
+async def test_delete_prefix(backend):
+    objects = backend.s3.buckets["bucket"]
+    for n in range(1500):
+        objects[f"p/{n:04d}.json"] = Object(b"")
+    objects["p/other.txt"] = Object(b"")
+    objects["q/0000.json"] = Object(b"")
+    bucket = BucketResource("bucket", prefix="p/", suffix=".json")
+    assert await bucket.delete_prefix() == []
+    assert backend.calls["s3", "DeleteObjects"] == 2
+    assert sorted(objects) == ["p/other.txt", "q/0000.json"]
+
+
+async def test_cache_hit(backend):
+    cache = ObjectCache()
+    bucket = BucketResource("bucket", value_type=str, cache=cache)
+    await bucket["key"].put("value")
+    assert await bucket["key"].get() == "value"
+    assert await bucket["key"].get() == "value"
+    assert backend.calls["s3", "GetObject"] == 1
+    assert len(cache) == 1
+
+
+async def test_cache_revalidate(backend):
+    cache = ObjectCache(ttl=0)
+    object = BucketResource("bucket", value_type=dict, cache=cache)["key"]
+    await object.put({"a": 1})
+    value = await object.get()
+    assert await object.get() is value  # not modified
+    assert backend.calls["s3", "GetObject"] == 2
+    backend.s3.buckets["bucket"]["key"] = Object(b'{"a": 2}')  # changed elsewhere
+    assert await object.get() == {"a": 2}
+
+
+async def test_cache_coalesce(backend):
+    object = BucketResource("bucket", cache=ObjectCache())["key"]
+    await object.put(b"value")
+    assert await asyncio.gather(*(object.get() for _ in range(5))) == [b"value"] * 5
+    assert backend.calls["s3", "GetObject"] == 1
+
+
+async def test_cache_evict(backend):
+    cache = ObjectCache(size=10)
+    bucket = BucketResource("bucket", cache=cache)
+    for key in ("a", "b", "c"):
+        backend.s3.buckets["bucket"][key] = Object(b"value")  # 5 bytes
+    await bucket["a"].get()
+    await bucket["b"].get()
+    await bucket["a"].get()  # most recently used
+    await bucket["c"].get()  # evicts b
+    assert backend.calls["s3", "GetObject"] == 3
+    await bucket["a"].get()
+    assert backend.calls["s3", "GetObject"] == 3
+    await bucket["b"].get()
+    assert backend.calls["s3", "GetObject"] == 4
+    backend.s3.buckets["bucket"]["d"] = Object(b"too large to cache")
+    await bucket["d"].get()
+    assert len(cache) == 2
+
+
+async def test_cache_invalidate(backend):
+    cache = ObjectCache()
+    object = BucketResource("bucket", cache=cache)["key"]
+    await object.put(b"one")
+    assert await object.get() == b"one"
+    await object.put(b"two")
+    assert await object.get() == b"two"
+    await object.delete()
+    assert len(cache) == 0
+    with pytest.raises(NotFoundError):
+        await object.get()
+
+
+async def test_compress(backend):
+    bucket = BucketResource("bucket", value_type=dict, compress="gzip")
+    value = {"key": "value" * 1000}
+    await bucket["key"].put(value)
+    stored = backend.s3.buckets["bucket"]["key"]
+    assert stored.content_encoding == "gzip"
+    assert len(stored.data) < 100
+    assert json.loads(gzip.decompress(stored.data)) == value
+    assert await bucket["key"].get() == value
+
+
+@pytest.mark.parametrize("window", [1, 3])
+async def test_compress_multipart(backend, window):
+    value = randbytes(12 * 1024 * 1024)
+    transfer = TransferConfig(download_window=window)
+    bucket = BucketResource("bucket", value_type=Stream, compress="gzip", transfer=transfer)
+    await bucket["key"].put(BytesStream(value))
+    assert backend.calls["s3", "UploadPart"] == 3
+    stored = backend.s3.buckets["bucket"]["key"]
+    assert stored.content_encoding == "gzip"
+    assert gzip.decompress(stored.data) == value
+    async with await bucket["key"].get() as stream:
+        assert stream.content_length is None
+        assert await Reader(stream).read() == value
+
+
+async def test_compress_uncompressed(backend):
+    backend.s3.buckets["bucket"]["key"] = Object(b"value")
+    object = BucketResource("bucket", compress="gzip", cache=ObjectCache())["key"]
+    assert await object.get() == b"value"
+
+
+async def test_compress_cache(backend):
+    object = BucketResource("bucket", value_type=str, compress="gzip", cache=ObjectCache())[
+        "key"
+    ]
+    await object.put("value")
+    assert await object.get() == "value"
+    assert await object.get() == "value"
+    assert backend.calls["s3", "GetObject"] == 1
+
+
+async def test_compress_large_in_thread(backend, monkeypatch):
+    to_thread = asyncio.to_thread
+    functions = []
+
+    async def record(function, *args):
+        functions.append(function.func.__name__)
+        return await to_thread(function, *args)
+
+    monkeypatch.setattr(asyncio, "to_thread", record)
+    object = BucketResource("bucket", compress="gzip", cache=ObjectCache())["key"]
+    value = randbytes(fondat.aws.s3._THREAD_SIZE)
+    await object.put(value)
+    assert await object.get() == value
+    assert functions == ["_compress", "_decompress"]
+
+
+async def test_compress_zstd(backend):
+    zstandard = pytest.importorskip("zstandard")
+    object = BucketResource("bucket", compress="zstd")["key"]
+    await object.put(b"value" * 1000)
+    stored = backend.s3.buckets["bucket"]["key"]
+    assert stored.content_encoding == "zstd"
+    assert zstandard.ZstdDecompressor().decompress(stored.data) == b"value" * 1000
+    assert await object.get() == b"value" * 1000
+
+
+def test_compress_invalid():
+    with pytest.raises(ValueError):
+        BucketResource("bucket", compress="brotli")["key"]
+
+
+class _ChunkStream(Stream):
+    def __init__(self, chunks: list[bytes], content_length: int | None):
+        super().__init__("application/octet-stream", content_length)
+        self._chunks = list(chunks)
+
+    async def __anext__(self) -> bytes:
+        if not self._chunks:
+            raise StopAsyncIteration
+        return self._chunks.pop(0)
+
+    async def close(self):
+        self._chunks = []
+
+
+@pytest.mark.parametrize("content_length", [None, 9, 6, 12])
+async def test_read(content_length):
+    stream = _ChunkStream([b"abc", b"def", b"ghi"], content_length)
+    assert await fondat.aws.s3._read(stream) == b"abcdefghi"
+
+
+async def test_get_bytes_multiple_chunks(backend):
+    value = randbytes(fondat.aws.s3.CHUNK_SIZE + 1)
+    backend.s3.buckets["bucket"]["key"] = Object(value)
+    for transfer in (None, TransferConfig(download_window=2, range_size=1024 * 1024)):
+        result = await BucketResource("bucket", transfer=transfer)["key"].get()
+        assert type(result) is bytes
+        assert result == value
+
+
+async def test_read_single_chunk():
+    content = b"abcdefghi"
+    assert await fondat.aws.s3._read(_ChunkStream([content], 9)) is content
+    assert await fondat.aws.s3._read(_ChunkStream([], 0)) == b""
+
+
+async def test_run_concurrently(caplog):
+    in_flight = [0, 0]  # current, maximum
+
+    async def double(n):
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        await asyncio.sleep(0.001 * (5 - n % 5))
+        in_flight[0] -= 1
+        return n * 2
+
+    def arguments():
+        for n in range(20):
+            assert in_flight[0] < 4  # consumed only as concurrency allows
+            yield (n,)
+
+    results = await fondat.aws.s3._run_concurrently(double, arguments(), 4)
+    assert results == [n * 2 for n in range(20)]
+    assert in_flight[1] == 4
+
+    async def fail(n):
+        raise ValueError(n)
+
+    with pytest.raises(ValueError) as info:
+        await fondat.aws.s3._run_concurrently(fail, [(1,), (2,)], 2)
+    assert info.value.args == (1,)
+    assert "2" in caplog.text  # other failure logged
+
+
+async def test_multipart_buffer_reuse(backend, monkeypatch):
+    allocated = []
+    get = fondat.aws.s3._BufferPool.get
+
+    def track(self, size):
+        allocated.append(not self._buffers)  # all parts but last are equal size
+        return get(self, size)
+
+    monkeypatch.setattr(fondat.aws.s3._BufferPool, "get", track)
+    value = randbytes(32 * 1024 * 1024)
+    transfer = TransferConfig(concurrency=2, read_ahead=1)
+    object = BucketResource("bucket", value_type=Stream, transfer=transfer)["key"]
+    chunks = [value[n : n + 1000000] for n in range(0, len(value), 1000000)]
+    await object.put(_ChunkStream(chunks, None))
+    assert backend.calls["s3", "UploadPart"] == 7
+    assert len(allocated) == 8  # including read to detect end
+    assert sum(allocated) <= 3  # concurrency + read-ahead
+    assert backend.s3.buckets["bucket"]["key"].data == value
+
+
+async def test_copy_to(backend):
+    backend.s3.buckets["other"] = {}
+    objects = backend.s3.buckets["bucket"]
+    objects["key"] = Object(b"value", "text/plain", {"a": "b"}, content_encoding="identity")
+    await BucketResource("bucket")["key"].copy_to("other", "copy")
+    assert backend.calls["s3", "CopyObject"] == 1
+    assert backend.calls["s3", "GetObject"] == 0
+    copy = backend.s3.buckets["other"]["copy"]
+    assert copy.data == b"value"
+    assert copy.content_type == "text/plain"
+    assert copy.metadata == {"a": "b"}
+    assert copy.content_encoding == "identity"
+
+
+async def test_copy_to_multipart(backend):
+    value = randbytes(12 * 1024 * 1024)
+    objects = backend.s3.buckets["bucket"]
+    objects["key"] = Object(value, "text/plain", {"a": "b"}, content_encoding="gzip")
+    await BucketResource("bucket")["key"].copy_to("bucket", "copy")
+    assert backend.calls["s3", "UploadPartCopy"] == 3
+    assert backend.calls["s3", "GetObject"] == 0
+    copy = objects["copy"]
+    assert copy.data == value
+    assert copy.etag.endswith('-3"')
+    assert copy.content_type == "text/plain"
+    assert copy.metadata == {"a": "b"}
+    assert copy.content_encoding == "gzip"
+
+
+async def test_copy_to_changed(backend):
+    objects = backend.s3.buckets["bucket"]
+    objects["key"] = Object(randbytes(12 * 1024 * 1024))
+    upload_part_copy = backend.s3.upload_part_copy
+
+    def change(**kwargs):
+        objects["key"] = Object(b"changed")
+        return upload_part_copy(**kwargs)
+
+    backend.s3.upload_part_copy = change
+    with pytest.raises(InternalServerError):
+        await BucketResource("bucket")["key"].copy_to("bucket", "copy")
+    assert "copy" not in objects
+    assert backend.calls["s3", "AbortMultipartUpload"] == 1
+    assert not backend.s3.uploads
+
+
+async def test_copy_to_not_found(backend):
+    with pytest.raises(NotFoundError):
+        await BucketResource("bucket")["missing"].copy_to("bucket", "copy")
+
+
+async def test_copy_to_invalidates_cache(backend):
+    cache = ObjectCache()
+    bucket = BucketResource("bucket", cache=cache)
+    await bucket["a"].put(b"a")
+    await bucket["b"].put(b"b")
+    assert await bucket["b"].get() == b"b"
+    await bucket["a"].copy_to("bucket", "b")
+    assert await bucket["b"].get() == b"a"
+
+
+async def test_copy_prefix(backend):
+    objects = backend.s3.buckets["bucket"]
+    for n in range(20):
+        objects[f"src/{n:02d}.json"] = Object(f"{n}".encode())
+    objects["src/other.txt"] = Object(b"")
+    source = BucketResource("bucket", prefix="src/", suffix=".json")
+    await source.copy_prefix(BucketResource("bucket", prefix="dst/", suffix=".json"))
+    assert backend.calls["s3", "CopyObject"] == 20
+    copies = {k: o.data for k, o in objects.items() if k.startswith("dst/")}
+    assert copies == {f"dst/{n:02d}.json": f"{n}".encode() for n in range(20)}
+
+
+async def test_head(backend):
+    objects = backend.s3.buckets["bucket"]
+    objects["key"] = Object(b"value", "text/plain", {"a": "b"}, content_encoding="gzip")
+    metadata = await BucketResource("bucket")["key"].head()
+    assert metadata.size == 5
+    assert metadata.etag == objects["key"].etag
+    assert metadata.last_modified == objects["key"].last_modified
+    assert metadata.content_type == "text/plain"
+    assert metadata.content_encoding == "gzip"
+    assert metadata.metadata == {"a": "b"}
+    assert backend.calls["s3", "GetObject"] == 0
+    with pytest.raises(NotFoundError):
+        await BucketResource("bucket")["missing"].head()
+
+
+async def test_index_listing(backend):
+    objects = backend.s3.buckets["bucket"]
+    for n in range(10):
+        objects[f"{n}"] = Object(b"x" * n)
+    index = MetadataIndex()
+    bucket = BucketResource("bucket", key_type=int, index=index)
+    assert [key async for key in bucket.keys()] == list(range(10))
+    assert len(index) == 10
+    metadata = await bucket[3].head()
+    assert metadata.size == 3
+    assert metadata.etag == objects["3"].etag
+    assert metadata.content_type is None  # not in listing
+    assert backend.calls["s3", "HeadObject"] == 0
+
+
+async def test_index_head(backend):
+    backend.s3.buckets["bucket"]["key"] = Object(b"value", "text/plain")
+    index = MetadataIndex()
+    bucket = BucketResource("bucket", index=index)
+    assert (await bucket["key"].head()).content_type == "text/plain"
+    await bucket.get()  # same object listed
+    assert (await bucket["key"].head()).content_type == "text/plain"
+    assert backend.calls["s3", "HeadObject"] == 1
+
+
+async def test_index_invalidate(backend):
+    index = MetadataIndex()
+    bucket = BucketResource("bucket", index=index)
+    await bucket["a"].put(b"a")
+    await bucket["b"].put(b"b")
+    await bucket.get()
+    assert len(index) == 2
+    await bucket["a"].put(b"aa")
+    assert (await bucket["a"].head()).size == 2
+    await bucket["a"].copy_to("bucket", "b")
+    assert (await bucket["b"].head()).size == 2
+    await bucket.delete_many(["a"])
+    await bucket["b"].delete()
+    assert len(index) == 0
+
+
+async def test_index_limits(backend):
+    for key in "abc":
+        backend.s3.buckets["bucket"][key] = Object(b"")
+    index = MetadataIndex(size=2)
+    bucket = BucketResource("bucket", index=index)
+    await bucket.get()
+    assert len(index) == 2  # a evicted
+    await bucket["a"].head()
+    assert backend.calls["s3", "HeadObject"] == 1
+    index.ttl = 0
+    await bucket["a"].head()
+    assert backend.calls["s3", "HeadObject"] == 2
+
+
+def _fail_part(backend, number: int):
+    """Fail the first upload of the specified part number."""
+    upload_part = backend.s3.upload_part
+    failed = []
+
+    def fail(**kwargs):
+        if kwargs["PartNumber"] == number and not failed:
+            failed.append(number)
+            raise ServiceError("AccessDenied", "", 403)
+        return upload_part(**kwargs)
+
+    backend.s3.upload_part = fail
+
+
+async def test_resume(backend, tmp_path):
+    checkpoints = DirectoryResource(tmp_path, value_type=UploadCheckpoint, writable=True)
+    transfer = TransferConfig(concurrency=1)
+    bucket = BucketResource(
+        "bucket", value_type=Stream, transfer=transfer, checkpoints=checkpoints
+    )
+    value = randbytes(17 * 1024 * 1024)  # 4 parts
+    _fail_part(backend, 3)
+    with pytest.raises(InternalServerError):
+        await bucket["key"].put(BytesStream(value))
+    assert backend.calls["s3", "AbortMultipartUpload"] == 0
+    checkpoint = await checkpoints["bucket/key"].get()
+    assert checkpoint.upload_id in backend.s3.uploads
+    await bucket["key"].put(BytesStream(value))
+    assert backend.calls["s3", "CreateMultipartUpload"] == 1
+    assert backend.calls["s3", "UploadPart"] == 5  # 3 before failure, 2 on resume
+    assert backend.s3.buckets["bucket"]["key"].data == value
+    assert await checkpoints.get() == []
+
+
+async def test_resume_changed(backend):
+    checkpoints = BucketResource("bucket", prefix="checkpoints/", value_type=UploadCheckpoint)
+    transfer = TransferConfig(concurrency=1)
+    bucket = BucketResource(
+        "bucket", value_type=Stream, transfer=transfer, checkpoints=checkpoints
+    )
+    value = randbytes(12 * 1024 * 1024)  # 3 parts
+    _fail_part(backend, 3)
+    with pytest.raises(InternalServerError):
+        await bucket["key"].put(BytesStream(value))
+    value = b"changed" + value[7:]  # first part differs
+    await bucket["key"].put(BytesStream(value))
+    assert backend.calls["s3", "UploadPart"] == 5  # 3 before failure, 2 on resume
+    assert backend.s3.buckets["bucket"]["key"].data == value
+    assert sorted(backend.s3.buckets["bucket"]) == ["key"]  # checkpoint deleted
+
+
+async def test_resume_aborted(backend, tmp_path):
+    checkpoints = DirectoryResource(tmp_path, value_type=UploadCheckpoint, writable=True)
+    await checkpoints["bucket/key"].put(UploadCheckpoint(upload_id="aborted", parts={1: '"x"'}))
+    bucket = BucketResource("bucket", value_type=Stream, checkpoints=checkpoints)
+    value = randbytes(12 * 1024 * 1024)
+    await bucket["key"].put(BytesStream(value))
+    assert backend.calls["s3", "CreateMultipartUpload"] == 1
+    assert backend.s3.buckets["bucket"]["key"].data == value
+
+
+async def test_resume_checkpoint_rejected(backend):
+    class Checkpoints:  # rejects every checkpoint
+        def __getitem__(self, key):
+            return self
+
+        async def get(self):
+            raise NotFoundError
+
+        async def put(self, value):
+            raise RuntimeError("rejected")
+
+    bucket = BucketResource("bucket", value_type=Stream, checkpoints=Checkpoints())
+    with pytest.raises(InternalServerError):
+        await bucket["key"].put(BytesStream(randbytes(12 * 1024 * 1024)))
+    assert backend.calls["s3", "AbortMultipartUpload"] == 1  # cannot be resumed
+    assert not backend.s3.uploads
+
+
+async def test_get_many(backend):
+    bucket = BucketResource("bucket", key_type=int, value_type=dict)
+    for n in range(50):
+        await bucket[n].put({"n": n})
+    in_flight = [0, 0]  # current, maximum
+    get_object = backend.s3.get_object
+
+    async def slow(**kwargs):
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        return get_object(**kwargs)
+
+    backend.s3.get_object = slow
+    results = {key: value async for key, value in bucket.get_many(range(52), concurrency=8)}
+    assert in_flight[1] == 8
+    assert {k: v for k, v in results.items() if k < 50} == {n: {"n": n} for n in range(50)}
+    assert isinstance(results[50], NotFoundError)
+    assert isinstance(results[51], NotFoundError)
+
+
+async def test_get_many_break(backend):
+    bucket = BucketResource("bucket")
+    for n in range(10):
+        await bucket[f"{n}"].put(b"value")
+    requested = []
+
+    async def keys():
+        for n in range(10):
+            requested.append(n)
+            yield f"{n}"
+
+    async with contextlib.aclosing(bucket.get_many(keys(), concurrency=2)) as results:
+        async for key, value in results:
+            break
+    assert len(requested) <= 3  # 2 in flight, 1 replaced after first result
+
+
+async def test_put_many(backend):
+    bucket = BucketResource("bucket", key_type=int, value_type=str)
+    results = [r async for r in bucket.put_many(((n, f"{n}") for n in range(20)))]
+    assert sorted(results) == [(n, None) for n in range(20)]
+    assert {k: o.data for k, o in backend.s3.buckets["bucket"].items()} == {
+        f"{n}": f"{n}".encode() for n in range(20)
+    }
+    results = [r async for r in BucketResource("missing").put_many([("key", b"")])]
+    assert isinstance(results[0][1], InternalServerError)
+
+
+async def test_select_json(backend):
+    backend.s3.select_chunk_size = 7  # split records across events
+    records = [{"id": n, "name": f"name {n}"} for n in range(10)]
+    content = "".join(json.dumps(r) + "\n" for r in records).encode()
+    backend.s3.buckets["bucket"]["key"] = Object(content)
+    object = BucketResource("bucket")["key"]
+    selected = [r async for r in object.select("SELECT * FROM S3Object s LIMIT 5")]
+    assert selected == records[:5]
+
+
+async def test_select_csv(backend):
+    backend.s3.select_chunk_size = 5
+    backend.s3.buckets["bucket"]["key"] = Object(b"id,name\n1,a\n2,b\n3,c\n")
+    object = BucketResource("bucket")["key"]
+    selected = [r async for r in object.select("SELECT * FROM S3Object", "csv", "csv")]
+    assert selected == [["1", "a"], ["2", "b"], ["3", "c"]]
+    selected = [r async for r in object.select("SELECT * FROM S3Object", "csv", "json")]
+    assert selected == [
+        {"id": "1", "name": "a"},
+        {"id": "2", "name": "b"},
+        {"id": "3", "name": "c"},
+    ]
+
+
+async def test_select_csv_quoted_newline(backend):
+    backend.s3.select_chunk_size = 4
+    records = [{"id": 1, "text": 'a\n"b",\n\nc'}, {"id": 2, "text": "d"}]
+    backend.s3.buckets["bucket"]["key"] = Object(
+        "".join(json.dumps(r) + "\n" for r in records).encode()
+    )
+    object = BucketResource("bucket")["key"]
+    selected = [r async for r in object.select("SELECT * FROM S3Object", "json", "csv")]
+    assert selected == [["1", 'a\n"b",\n\nc'], ["2", "d"]]
+
+
+async def test_select_compressed(backend):
+    bucket = BucketResource("bucket", value_type=str, compress="gzip")
+    await bucket["key"].put('{"a": 1}\n{"a": 2}\n')
+    backend.s3.select = lambda records, expression: [r for r in records if r["a"] > 1]
+    selected = [r async for r in bucket["key"].select("SELECT * FROM S3Object s WHERE s.a > 1")]
+    assert selected == [{"a": 2}]
+
+
+async def test_select_errors(backend):
+    object = BucketResource("bucket")["key"]
+    with pytest.raises(NotFoundError):
+        [r async for r in object.select("SELECT * FROM S3Object")]
+    backend.s3.buckets["bucket"]["key"] = Object(b"{}\n")
+    with pytest.raises(InternalServerError):
+        [r async for r in object.select("SELECT s.a FROM S3Object s")]  # unsupported by fake
+    with pytest.raises(ValueError):
+        [r async for r in object.select("SELECT * FROM S3Object", "xml")]
+
+
+async def test_upload_file(backend, tmp_path):
+    value = randbytes(12 * 1024 * 1024 + 1)  # 3 parts
+    (path := tmp_path / "file").write_bytes(value)
+    await BucketResource("bucket")["key"].upload_file(path)
+    assert backend.calls["s3", "UploadPart"] == 3
+    assert backend.s3.buckets["bucket"]["key"].data == value
+
+
+async def test_upload_file_small(backend, tmp_path):
+    (path := tmp_path / "file").write_bytes(b"value")
+    await BucketResource("bucket")["key"].upload_file(str(path))
+    (path := tmp_path / "empty").write_bytes(b"")
+    await BucketResource("bucket")["empty"].upload_file(path)
+    assert backend.calls["s3", "PutObject"] == 2
+    assert backend.s3.buckets["bucket"]["key"].data == b"value"
+    assert backend.s3.buckets["bucket"]["empty"].data == b""
+
+
+async def test_upload_file_part_retry(backend, tmp_path):
+    value = randbytes(12 * 1024 * 1024)
+    (path := tmp_path / "file").write_bytes(value)
+    upload_part = backend.s3.upload_part
+    failed = []
+
+    def fail(**kwargs):
+        if kwargs["PartNumber"] == 2 and not failed:
+            failed.append(kwargs["Body"].read())  # consume body before failing
+            raise ServiceError("InternalError", "", 500)
+        return upload_part(**kwargs)
+
+    backend.s3.upload_part = fail
+    await BucketResource("bucket")["key"].upload_file(path)
+    assert len(failed[0]) == fondat.aws.s3.MIN_PART_SIZE
+    assert backend.s3.buckets["bucket"]["key"].data == value  # part resent from start
+
+
+async def test_upload_file_resume(backend, tmp_path):
+    (directory := tmp_path / "checkpoints").mkdir()
+    checkpoints = DirectoryResource(directory, value_type=UploadCheckpoint, writable=True)
+    bucket = BucketResource(
+        "bucket", transfer=TransferConfig(concurrency=1), checkpoints=checkpoints
+    )
+    value = randbytes(17 * 1024 * 1024)  # 4 parts
+    (path := tmp_path / "file").write_bytes(value)
+    _fail_part(backend, 3)
+    with pytest.raises(InternalServerError):
+        await bucket["key"].upload_file(path)
+    await bucket["key"].upload_file(path)
+    assert backend.calls["s3", "CreateMultipartUpload"] == 1
+    assert backend.calls["s3", "UploadPart"] == 5  # 3 before failure, 2 on resume
+    assert backend.s3.buckets["bucket"]["key"].data == value
+    assert await checkpoints.get() == []
+
+
+async def test_upload_file_compressed(backend, tmp_path):
+    bucket = BucketResource("bucket", compress="gzip")
+    value = bytes(12 * 1024 * 1024)
+    (path := tmp_path / "file").write_bytes(value)
+    await bucket["large"].upload_file(path)
+    (path := tmp_path / "small").write_bytes(b"value")
+    await bucket["small"].upload_file(path)
+    assert gzip.decompress(backend.s3.buckets["bucket"]["large"].data) == value
+    assert gzip.decompress(backend.s3.buckets["bucket"]["small"].data) == b"value"
+    assert backend.s3.buckets["bucket"]["small"].content_encoding == "gzip"
+
+
+async def test_download_file(backend, tmp_path):
+    value = randbytes(10 * 1024 * 1024 + 1)
+    backend.s3.buckets["bucket"]["key"] = Object(value)
+    transfer = TransferConfig(concurrency=2, range_size=1024 * 1024)
+    path = tmp_path / "file"
+    path.write_bytes(b"previous content")
+    await BucketResource("bucket", transfer=transfer)["key"].download_file(path)
+    assert path.read_bytes() == value
+    assert backend.calls["s3", "GetObject"] == 11
+    assert [p.name for p in tmp_path.iterdir()] == ["file"]
+
+
+async def test_download_file_empty(backend, tmp_path):
+    backend.s3.buckets["bucket"]["key"] = Object(b"")
+    await BucketResource("bucket")["key"].download_file(tmp_path / "file")
+    assert (tmp_path / "file").read_bytes() == b""
+
+
+async def test_download_file_compressed(backend, tmp_path):
+    bucket = BucketResource("bucket", compress="gzip")
+    value = randbytes(1024 * 1024) * 8
+    await bucket["key"].put(value)
+    await bucket["key"].download_file(tmp_path / "file")
+    assert (tmp_path / "file").read_bytes() == value
+    await BucketResource("bucket")["key"].download_file(tmp_path / "raw")
+    assert gzip.decompress((tmp_path / "raw").read_bytes()) == value
+
+
+async def test_download_file_not_found(backend, tmp_path):
+    with pytest.raises(NotFoundError):
+        await BucketResource("bucket")["missing"].download_file(tmp_path / "file")
+    assert not list(tmp_path.iterdir())
+
+
+async def test_download_file_changed(backend, tmp_path):
+    objects = backend.s3.buckets["bucket"]
+    objects["key"] = Object(randbytes(4 * 1024 * 1024))
+    get_object = backend.s3.get_object
+
+    def change(**kwargs):
+        objects["key"] = Object(b"changed")
+        return get_object(**kwargs)
+
+    backend.s3.get_object = change
+    transfer = TransferConfig(range_size=1024 * 1024)
+    with pytest.raises(InternalServerError):
+        await BucketResource("bucket", transfer=transfer)["key"].download_file(
+            tmp_path / "file"
+        )
+    assert not list(tmp_path.iterdir())
@@ -2,6 +2,7 @@ import asyncio
 import fondat.aws.client
 import pytest
 
+from contextlib import asynccontextmanager
 from fondat.aws.secretsmanager import Secret, secrets_resource
 from fondat.error import BadRequestError, NotFoundError
 from pytest import fixture
@@ -92,3 +93,25 @@ async def test_get_cache_evict():
         with pytest.raises(BadRequestError):
             await resource[name1].get()  # evicted and marked deleted
         assert await resource[name2].get() == secret2  # still cached
+
+
+async def test_get_coalesced(monkeypatch):
+    calls = 0
+
+    class Client:
+        async def get_secret_value(self, **kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"SecretString": "value"}
+
+    @asynccontextmanager
+    async def create_client(*args, **kwargs):
+        yield Client()
+
+    monkeypatch.setattr(fondat.aws.client, "create_client", create_client)
+    resource = secrets_resource()
+    name = str(uuid4())
+    results = await asyncio.gather(*(resource[name].get() for _ in range(50)))
+    assert all(secret.value == "value" for secret in results)
+    assert calls == 1
@@ -0,0 +1,194 @@
+import asyncio
+import fondat.aws.athena as athena
+import fondat.aws.client
+import pytest
+
+from botocore.exceptions import ClientError, ParamValidationError
+from datetime import datetime, timezone
+from fondat.aws.bedrock import agents_resource
+from fondat.aws.client import RetryBudget, RetryPolicy
+from fondat.aws.cloudwatch import CloudWatchMonitor
+from fondat.aws.s3 import BucketResource
+from fondat.aws.secretsmanager import Secret, secrets_resource
+from fondat.aws.testing import Backend
+from fondat.error import InternalServerError, NotFoundError
+from fondat.monitor import Measurement
+from fondat.stream import BytesStream, Reader, Stream
+from pytest import fixture
+
+
+@fixture
+def backend():
+    backend = Backend()
+    backend.s3.buckets["bucket"] = {}
+    with backend.install():
+        yield backend
+
+
+@fixture
+def retry(monkeypatch):
+    monkeypatch.setattr(fondat.aws.client, "budget", RetryBudget())
+    monkeypatch.setattr(fondat.aws.client, "limiters", {})
+    policy = RetryPolicy(attempts=5, base=0, cap=0)
+    monkeypatch.setattr(fondat.aws.client, "retry_policies", {"s3": policy})
+    return policy
+
+
+async def test_s3_put_get_list(backend):
+    bucket = BucketResource("bucket", prefix="p/")
+    for n in range(5):
+        await bucket[f"key{n}"].put(f"value{n}".encode())
+    assert await bucket["key3"].get() == b"value3"
+    page = await bucket.get(limit=3)
+    assert page.items == ["key0", "key1", "key2"]
+    page = await bucket.get(cursor=page.cursor)
+    assert page.items == ["key3", "key4"]
+    assert page.cursor is None
+    await bucket["key3"].delete()
+    with pytest.raises(NotFoundError):
+        await bucket["key3"].get()
+
+
+async def test_s3_multipart(backend):
+    value = bytes(range(256)) * 50000  # 12.8 MB
+    object = BucketResource("bucket", value_type=Stream)["key"]
+    await object.put(BytesStream(value))
+    assert backend.calls["s3", "UploadPart"] == 3
+    assert backend.s3.buckets["bucket"]["key"].etag.endswith('-3"')
+    async with await object.get() as stream:
+        assert await Reader(stream).read() == value
+
+
+async def test_s3_no_such_bucket(backend):
+    with pytest.raises(InternalServerError):
+        await BucketResource("missing")["key"].put(b"value")
+
+
+async def test_param_validation(backend):
+    async with fondat.aws.client.create_client("s3") as client:
+        with pytest.raises(ParamValidationError):
+            await client.get_object(Bucket="bucket")
+
+
+async def test_athena(backend):
+    backend.athena.polls = 2
+    backend.athena.respond(
+        "FROM information_schema.columns",
+        columns=[("column_name", "varchar"), ("data_type", "varchar")],
+        rows=[["a", "integer"], ["b", "varchar"]],
+    )
+    backend.athena.respond(
+        "SELECT a, b FROM t", columns=[("a", "integer"), ("b", "varchar")], rows=[[1, "x"]]
+    )
+    backend.athena.respond("FROM broken", error="table not found")
+    db = athena.Database(name="db")
+    table = await db.table("t")
+    assert [c.name for c in table.columns] == ["a", "b"]
+    rows = [row async for row in await db.execute("SELECT a, b FROM t", page_size=1)]
+    assert rows == [{"a": 1, "b": "x"}]
+    with pytest.raises(RuntimeError):
+        await db.execute("SELECT * FROM broken")
+    page = await athena.QueryExecutionsResource().get()
+    assert len(page.items) == 3
+
+
+async def test_secretsmanager(backend):
+    resource = secrets_resource()
+    await resource.post(name="secret", secret=Secret(value="string"))
+    assert (await resource["secret"].get()).value == "string"
+    await resource["secret"].put(Secret(value=b"binary"))
+    assert (await resource["secret"].get()).value == b"binary"
+    await resource["secret"].delete()
+    with pytest.raises(NotFoundError):
+        await resource["secret"].get()
+
+
+async def test_cloudwatch(backend):
+    monitor = CloudWatchMonitor("test")
+    timestamp = datetime.now(tz=timezone.utc)
+    for value in (1, 2, 3):
+        await monitor.record(
+            Measurement(
+                tags={"name": "value"},
+                timestamp=timestamp,
+                type="counter",
+                value=value,
+                name="count",
+            )
+        )
+    await monitor.flush()
+    (datum,) = backend.cloudwatch.metric_data["test"]
+    assert datum["MetricName"] == "count"
+    assert datum["StatisticValues"]["Sum"] == 6.0
+    assert datum["Unit"] == "Count"
+
+
+async def test_bedrock(backend):
+    now = datetime.now(tz=timezone.utc)
+    backend.bedrock_agent.add(
+        "agents",
+        "a1",
+        {
+            "agentId": "a1",
+            "agentName": "agent",
+            "agentStatus": "PREPARED",
+            "updatedAt": now,
+        },
+    )
+    agents = agents_resource()
+    assert (await agents["a1"].get()).agent_name == "agent"
+    page = await agents.get()
+    assert [a.agent_id for a in page.items] == ["a1"]
+    with pytest.raises(NotFoundError):
+        await agents["a2"].get()
+    invocation = await agents["a1"].invoke_buffered(
+        inputText="hello", sessionId="s1", agentAliasId="alias"
+    )
+    events = [event async for event in invocation.completion]
+    assert events == [{"chunk": {"bytes": b"hello"}}]
+
+
+async def test_inject_error(backend, retry):
+    backend.fail("s3", "GetObject", "InternalError", 500, count=2)
+    await BucketResource("bucket")["key"].put(b"value")
+    assert await BucketResource("bucket")["key"].get() == b"value"  # retried
+    assert backend.calls["s3", "GetObject"] == 3
+
+
+async def test_throttling(retry):
+    retry.attempts = 1
+    backend = Backend(throttle=1.0)
+    with backend.install():
+        async with fondat.aws.client.create_client("s3") as client:
+            with pytest.raises(ClientError) as info:
+                await client.list_buckets()
+    assert info.value.response["Error"]["Code"] == "SlowDown"
+
+
+async def test_concurrency(retry):
+    retry.attempts = 1
+    backend = Backend(latency=0.1, concurrency=2)
+    with backend.install():
+        async with fondat.aws.client.create_client("s3") as client:
+            results = await asyncio.gather(
+                *(client.list_buckets() for _ in range(5)), return_exceptions=True
+            )
+    throttled = [r for r in results if isinstance(r, ClientError)]
+    assert len(throttled) == 3
+    assert backend.calls["s3", "ListBuckets"] == 5
+
+
+async def test_latency(backend):
+    backend.latency = lambda service, operation: 0.05 if operation == "PutObject" else 0
+    loop = asyncio.get_running_loop()
+    begin = loop.time()
+    await BucketResource("bucket")["key"].put(b"value")
+    assert loop.time() - begin >= 0.05
+
+
+async def test_install_restores():
+    factory, pool = fondat.aws.client.client_factory, fondat.aws.client.pool
+    with Backend().install():
+        assert fondat.aws.client.client_factory is not factory
+    assert fondat.aws.client.client_factory is factory
+    assert fondat.aws.client.pool is pool